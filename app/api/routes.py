@@ -1,23 +1,51 @@
-from fastapi import APIRouter, Request, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import APIRouter, Request, File, UploadFile, HTTPException, Query
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from bson import ObjectId
+from bson.errors import InvalidId
 import os
 import shutil
 import uuid
 from pathlib import Path
-from services import Scraper, OCRProcessor, ResumeProcessor, NERProcessor
+from typing import List
+from services import Scraper, OCRProcessor, ResumeProcessor, HybridProcessor, NERProcessor, TextCache
+from services.PDFBackends import PDF_BACKENDS
+from services.FormatRegistry import UnsupportedFormatError
+from services.DocStore import DocStore
+from services.ResumeSearch import MAX_PAGE_SIZE, EXPORT_PROJECTION
+from services.ResumeExport import EXPORT_FORMATS, export
+from services.MongoJSON import MongoJSONResponse
 
 from ultra_logger import Logger  # Assuming you're using ultra_logger
 # Initialize logger
 logger = Logger(log_file="resume_processing.log", log_name="Resume processing")  # Example logger
-ner_processor = NERProcessor(logger)
+# Tokenize every resume once and only run the NER components of both models
+single_parse_ner = True
+# Entities of a resume text already seen with the same models and taxonomy are served from here
+ner_cache = TextCache(logger, db_path="cache/ner_cache.sqlite3")
+# Parsed docs are kept so a taxonomy change can be applied with ner_processor.rematch() instead of a full re-run
+doc_store = DocStore(logger, directory="cache/doc_store")
+# Analysed batches are deleted this many days after upload, None keeps them
+resume_ttl_days = None
+ner_processor = NERProcessor(
+    logger, single_parse=single_parse_ner, result_cache=ner_cache, doc_store=doc_store, resume_ttl_days=resume_ttl_days
+)
 
 ner = True
 ocr = False
+# Read the PDF text layer and only OCR the pages where it is missing or garbled
+hybrid = True
+parallel_extraction = True
 
-resume_processor = ResumeProcessor(logger) if not ocr else OCRProcessor(logger)  # Initialize the ResumeProcessor
+# Extracted text is cached by file hash, so re-uploaded resumes skip extraction
+text_cache = TextCache(logger, db_path="cache/text_cache.sqlite3")
+
+if ocr:
+    resume_processor = OCRProcessor(logger, cache=text_cache, profile="auto")
+elif hybrid:
+    resume_processor = HybridProcessor(logger, cache=text_cache)
+else:
+    resume_processor = ResumeProcessor(logger, cache=text_cache)  # Initialize the ResumeProcessor
 # Setting up the router
 router = APIRouter()
 
@@ -47,11 +75,16 @@ async def get_filtering_window(request: Request):
     return templates.TemplateResponse("filter_window.html", {"request": request})
 
 @router.post("/extract_data")
-async def extract_data(file: UploadFile):
+async def extract_data(file: UploadFile, pdf_backend: str = None):
     """
     Handle file upload, process it, and return extracted resume data or download file.
+    pdf_backend picks the PDF text backend for this request, the defaults remain as fallbacks.
     """
+    file_path = None
     try:
+        if pdf_backend is not None and pdf_backend not in PDF_BACKENDS:
+            raise HTTPException(status_code=400, detail=f"Unknown PDF backend. Available: {', '.join(PDF_BACKENDS)}")
+
         # Generate a unique filename and save the uploaded file
         file_extension = os.path.splitext(file.filename)[1]
         unique_filename = f"{uuid.uuid4()}{file_extension}"
@@ -62,10 +95,17 @@ async def extract_data(file: UploadFile):
             shutil.copyfileobj(file.file, buffer)
 
         # Step 1: Extract text from the resume using the ResumeProcessor class
-        if file_extension.lower() in ['.pdf', '.doc', '.docx']:
-            text = resume_processor.extract_text(file_path)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Only PDF, DOC, and DOCX are supported.")
+        # The processor sniffs the format from the file contents and rejects what it cannot read
+        try:
+            if pdf_backend and isinstance(resume_processor, ResumeProcessor):
+                # The requested backend first, then the processor's own preference as fallbacks
+                configured = resume_processor.pdf_extractor.backends
+                backends = (pdf_backend,) + tuple(b for b in configured if b != pdf_backend)
+                text = resume_processor.extract_text(file_path, pdf_backends=backends)
+            else:
+                text = resume_processor.extract_text(file_path)
+        except UnsupportedFormatError as e:
+            raise HTTPException(status_code=400, detail=f"{e}. Supported formats: {', '.join(resume_processor.registry.formats())}")
         
         # return {
         #         "status": "success",
@@ -78,11 +118,11 @@ async def extract_data(file: UploadFile):
             entities = ner_processor.extract_all_entities(text)
 
             # Return the extracted entities as a JSON response
-            return {
+            return MongoJSONResponse({
                 "status": "success",
                 "data": entities,
                 "text": text
-            }
+            })
     
         else:
             return text
@@ -108,7 +148,7 @@ async def extract_data(file: UploadFile):
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
     finally:
         # Clean up the uploaded file
-        if os.path.exists(file_path):
+        if file_path and os.path.exists(file_path):
             os.remove(file_path)
             
 @router.post("/analyze_resumes")
@@ -123,25 +163,25 @@ async def bulk_extract_data(file: UploadFile, request: Request):
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
         
-        extract_data = resume_processor.process_bulk_cvs(file_path, zip_file=True)
+        extract_data = resume_processor.process_bulk_cvs(file_path, zip_file=True, parallel=parallel_extraction)
         
-        all_entities, record = ner_processor.bulk_extract_all_entities(extract_data)
-
-        def serialize_mongo_id(entity):
-            if isinstance(entity, ObjectId):
-                return str(entity)
-            if isinstance(entity, dict):
-                return {k: serialize_mongo_id(v) for k, v in entity.items()}
-            elif isinstance(entity, list):
-                return [serialize_mongo_id(i) for i in entity]
-            return entity
+        # Results are saved to the resumes collection in chunks while the rest of the batch is still going through NER
+        batch_id = ner_processor.new_batch_id()
+        with ner_processor.open_writer() as writer:
+            all_entities, facets = ner_processor.bulk_extract_all_entities(
+                extract_data,
+                # document() returns a new dict, the _id insert_many adds stays out of all_entities
+                on_result=lambda index, entities: writer.write(ner_processor.resume_search.document(entities, batch_id)),
+            )
+        for failure in writer.failed:
+            logger.error(f"Resume {failure['index']} of batch {batch_id} not saved: {failure['error']}")
+        # One write per batch, served by /skill_facets
+        ner_processor.skill_aggregator.save(batch_id, facets)
         
-        collection_name = ner_processor.bulk_save_to_mongo(serialize_mongo_id(all_entities))
-        
-        # Render the filter_window.html template and pass collection_name
+        # Render the filter_window.html template and pass the batch ID, the pages send it as ?collection=
         return templates.TemplateResponse("filter_window.html", {
             "request": request,  # Required by Jinja2Templates
-            "collection_name": collection_name  # Pass collection_name to the template
+            "collection_name": batch_id  # Pass collection_name to the template
         })
 
     except HTTPException as http_exc:
@@ -150,15 +190,127 @@ async def bulk_extract_data(file: UploadFile, request: Request):
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
+@router.get("/cache_stats")
+async def get_cache_stats():
+    """
+    Return the hit/miss counters of the extracted-text cache and of the NER result cache.
+    """
+    return {
+        "status": "success",
+        "data": {
+            "text": text_cache.stats(),
+            "ner": ner_cache.stats(),
+        }
+    }
+
+
+@router.get("/skill_taxonomy")
+async def get_skill_taxonomy(request: Request):
+    """
+    Return the compiled skill taxonomy: canonical skill IDs, their categories and synonyms.
+    The taxonomy version is the ETag, so clients only download it again after a rebuild.
+    """
+    ner_processor.refresh_taxonomy()
+    taxonomy = ner_processor.taxonomy
+    etag = f'"{taxonomy.version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(taxonomy.artifact, headers={"ETag": etag})
+
+
+@router.get("/skill_facets")
+async def get_skill_facets(collection: str, request: Request):
+    """
+    Return how many resumes of a batch matched every skill, by category.
+    Facets of a batch never change once saved, so clients revalidate them with If-None-Match.
+    """
+    entry = ner_processor.skill_aggregator.load(collection)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No skill facets for collection {collection}")
+
+    etag, facets = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse({"status": "success", "data": facets}, headers=headers)
+
+
+@router.get("/query_resumes")
+def query_resumes(
+    collection: str,
+    skill: List[str] = Query([]),
+    category: List[str] = Query([]),
+    location: List[str] = Query([]),
+    education: List[str] = Query([]),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    after: str = None,
+):
+    """
+    Return one page of the resumes of a batch matching every filter, e.g.
+    /query_resumes?collection=X&skill=python&skill=django&location=bangalore&page=2
+
+    Filters run in MongoDB on indexed fields and only the fields of the candidate list are returned.
+    Pass the "next" cursor of a page as after to read the following one without skipping.
+    A plain def, so the blocking MongoDB calls run in the threadpool instead of the event loop.
+    """
+    try:
+        data = ner_processor.resume_search.query(
+            collection, skills=skill, categories=category, locations=location, education=education,
+            page=page, page_size=page_size, after=after,
+        )
+    except InvalidId:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {after}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to query resumes: {str(e)}")
+    return MongoJSONResponse({
+        "status": "success",
+        "data": data
+    })
+
+
+@router.get("/export_resumes")
+def export_resumes(
+    collection: str,
+    format: str = "ndjson",
+    skill: List[str] = Query([]),
+    category: List[str] = Query([]),
+    location: List[str] = Query([]),
+    education: List[str] = Query([]),
+):
+    """
+    Stream the resumes of a batch matching the filters (see /query_resumes) as NDJSON or CSV.
+    Resumes are encoded as they are read from MongoDB, so memory stays flat whatever the batch size.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}. Supported formats: {', '.join(EXPORT_FORMATS)}")
+    query = ner_processor.resume_search.build_filter(skill, category, location, education)
+    documents = ner_processor.resume_search.iter_documents(collection, query, EXPORT_PROJECTION)
+    return StreamingResponse(
+        export(documents, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{collection}_analysis.{format}"'},
+    )
+
+
 @router.get("/get_resume_data")
-async def get_resume_data(collection: str):
+def get_resume_data(collection: str, after: str = None, limit: int = Query(None, ge=1, le=1000)):
+    """
+    Return the resumes of a batch. With limit, one page of at most limit resumes and the "next" cursor
+    to pass as after for the following page. Use /export_resumes to download a whole batch.
+    A plain def like /query_resumes, the keyset reads block and run in the threadpool.
+    """
     try:
-        # Fetch data from MongoDB based on the collection name
-        data = ner_processor.fetch_data_from_mongo(collection)
-        return {
+        # Fetch data from MongoDB based on the batch ID, still called collection by the pages
+        data = ner_processor.fetch_data_from_mongo(collection, after=after, limit=limit)
+        # Encoded straight from the MongoDB documents, ObjectIds included
+        return MongoJSONResponse({
             "status": "success",
-            "data": data
-        }
+            "data": data,
+            "next": str(data[-1]["_id"]) if limit and len(data) == limit else None
+        })
+    except InvalidId:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {after}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch data: {str(e)}")
  
@@ -0,0 +1,151 @@
+import os
+import atexit
+import hashlib
+import sqlite3
+import threading
+
+from spacy.tokens import DocBin
+
+# Tokens and entities are all the dictionary based extractors need
+DOC_ATTRS = ["ORTH", "ENT_IOB", "ENT_TYPE"]
+
+
+class DocStore:
+    def __init__(self, logger, directory="cache/doc_store", shard_size=1000):
+        """
+        Stores parsed spaCy Docs in DocBin shards, so extractors can be re-applied without the models.
+
+        Shards are files of up to shard_size docs. A SQLite index maps every document hash to its
+        shard and position. Added docs are buffered and written when a shard fills up, on flush()
+        and at exit. Every flush writes new shards and never rewrites one, so a shard file and the
+        index rows pointing into it are written once; shard numbers come from SQLite, so several
+        processes can share the directory.
+
+        :param logger: Logger instance to log information.
+        :param directory: Directory of the shards and the index.
+        :param shard_size: Maximum number of docs per shard.
+        """
+        self.log = logger
+        self.directory = directory
+        self.shard_size = shard_size
+
+        self._lock = threading.Lock()
+        self._pending = []  # (key, doc) not written yet
+        self._pending_keys = set()
+
+        os.makedirs(directory, exist_ok=True)
+        # Writers of other processes hold the database only while a shard is written
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS docs (key TEXT PRIMARY KEY, shard INTEGER NOT NULL, position INTEGER NOT NULL)"
+        )
+        # One row per shard file, AUTOINCREMENT never hands out the same number twice
+        self._db.execute("CREATE TABLE IF NOT EXISTS shards (id INTEGER PRIMARY KEY AUTOINCREMENT, size INTEGER NOT NULL)")
+        self._db.execute("INSERT OR IGNORE INTO shards (id, size) SELECT shard, COUNT(*) FROM docs GROUP BY shard")
+        self._db.commit()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def doc_key(text):
+        """
+        Returns the key of a document, the SHA-256 of its preprocessed text.
+        """
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _shard_path(self, shard):
+        return os.path.join(self.directory, f"shard-{shard:05d}.spacy")
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._pending_keys:
+                return True
+            return self._db.execute("SELECT 1 FROM docs WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0] + len(self._pending)
+
+    def add(self, key, doc):
+        """
+        Buffers a doc for storage. Documents already stored are skipped.
+
+        :param key: The document key, see doc_key.
+        :param doc: The parsed doc.
+        """
+        if key in self:
+            return
+        with self._lock:
+            self._pending.append((key, doc))
+            self._pending_keys.add(key)
+            full = len(self._pending) >= self.shard_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered docs to the shards.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._pending_keys = set()
+            if not pending:
+                return
+
+            while pending:
+                batch, pending = pending[:self.shard_size], pending[self.shard_size:]
+                doc_bin = DocBin(attrs=DOC_ATTRS, store_user_data=False)
+                rows = []
+                for key, doc in batch:
+                    # The position is the doc's index in this shard's DocBin, nothing else
+                    rows.append((key, len(doc_bin)))
+                    doc_bin.add(doc)
+
+                try:
+                    shard = self._db.execute("INSERT INTO shards (size) VALUES (?)", (len(doc_bin),)).lastrowid
+                    # Write next to the shard and swap, readers never see a partial file
+                    temp_path = f"{self._shard_path(shard)}.tmp"
+                    doc_bin.to_disk(temp_path)
+                    os.replace(temp_path, self._shard_path(shard))
+                    # A key stored meanwhile by another process keeps its first copy
+                    cursor = self._db.executemany(
+                        "INSERT OR IGNORE INTO docs (key, shard, position) VALUES (?, ?, ?)",
+                        [(key, shard, position) for key, position in rows],
+                    )
+                    self._db.commit()
+                except Exception:
+                    self._db.rollback()
+                    raise
+                self.log.info(f"Stored {cursor.rowcount} docs in shard {shard}")
+
+    def iter_docs(self, vocab, keys=None):
+        """
+        Yields stored docs, one shard at a time so memory stays bounded by the shard size.
+
+        :param vocab: Vocab to load the docs into, normally the custom model's.
+        :param keys: Only yield these documents. Defaults to all of them.
+        :return: Iterator of (key, doc).
+        """
+        self.flush()
+        with self._lock:
+            rows = self._db.execute("SELECT key, shard, position FROM docs ORDER BY shard, position").fetchall()
+        if keys is not None:
+            keys = set(keys)
+            rows = [row for row in rows if row[0] in keys]
+
+        by_shard = {}
+        for key, shard, position in rows:
+            by_shard.setdefault(shard, []).append((position, key))
+
+        for shard, positions in by_shard.items():
+            docs = list(DocBin().from_disk(self._shard_path(shard)).get_docs(vocab))
+            for position, key in positions:
+                yield key, docs[position]
+
+    def get(self, key, vocab):
+        """
+        Returns one stored doc, or None when it is not stored.
+        """
+        for _, doc in self.iter_docs(vocab, keys=[key]):
+            return doc
+        return None
@@ -0,0 +1,133 @@
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+PARAGRAPH = W + "p"
+TABLE = W + "tbl"
+ROW = W + "tr"
+CELL = W + "tc"
+TEXT = W + "t"
+TAB = W + "tab"
+BREAKS = (W + "br", W + "cr")
+
+_HEADER_PART = re.compile(r"word/header(\d*)\.xml$")
+_FOOTER_PART = re.compile(r"word/footer(\d*)\.xml$")
+
+
+class DocxReader:
+    def __init__(self, include_headers=True, cell_separator="\t"):
+        """
+        Streams the text out of a DOCX file without building the python-docx object model.
+
+        Paragraphs come out one per line and every table row becomes one line with its
+        cells joined by cell_separator. Text boxes are included once (their VML fallback
+        copy is skipped) and headers/footers are placed before/after the body.
+
+        :param include_headers: Also read the header and footer parts.
+        :param cell_separator: String placed between the cells of a table row.
+        """
+        self.include_headers = include_headers
+        self.cell_separator = cell_separator
+
+    def _parts(self, zip_ref):
+        names = zip_ref.namelist()
+        if not self.include_headers:
+            return ["word/document.xml"]
+
+        def numbered(pattern):
+            return sorted(
+                (name for name in names if pattern.match(name)),
+                key=lambda name: int(pattern.match(name).group(1) or 0),
+            )
+
+        return numbered(_HEADER_PART) + ["word/document.xml"] + numbered(_FOOTER_PART)
+
+    def iter_lines(self, source):
+        """
+        Yields the paragraphs and table rows of the document in order.
+
+        :param source: Path to the DOCX file or a binary file object.
+        """
+        with zipfile.ZipFile(source) as zip_ref:
+            for part in self._parts(zip_ref):
+                with zip_ref.open(part) as xml_file:
+                    yield from self._iter_part(xml_file)
+
+    def _iter_part(self, xml_file):
+        open_elements = []
+        paragraphs = []  # text buffers of the paragraphs being read, text boxes nest them
+        rows = []        # cell texts of the table rows being read
+        cells = []       # paragraph texts of the table cells being read
+        fallback = 0
+
+        for event, element in iterparse(xml_file, events=("start", "end")):
+            tag = element.tag
+
+            if event == "start":
+                open_elements.append(element)
+                if tag == MC_FALLBACK:
+                    fallback += 1
+                elif fallback:
+                    continue
+                elif tag == PARAGRAPH:
+                    paragraphs.append([])
+                elif tag == ROW:
+                    rows.append([])
+                elif tag == CELL:
+                    cells.append([])
+                continue
+
+            open_elements.pop()
+            if tag == MC_FALLBACK:
+                fallback -= 1
+            elif fallback:
+                pass
+            elif tag == TEXT and paragraphs:
+                paragraphs[-1].append(element.text or "")
+            elif tag == TAB and paragraphs:
+                paragraphs[-1].append("\t")
+            elif tag in BREAKS and paragraphs:
+                paragraphs[-1].append("\n")
+            elif tag == PARAGRAPH:
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text
+            elif tag == CELL:
+                text = " ".join(paragraph.strip() for paragraph in cells.pop() if paragraph.strip())
+                if rows:
+                    rows[-1].append(text)
+            elif tag == ROW:
+                text = self.cell_separator.join(rows.pop())
+                if cells:
+                    # Row of a table nested in a cell
+                    cells[-1].append(text)
+                else:
+                    yield text
+
+            # Drop finished top-level blocks so memory stays flat however long the document is
+            if tag in (PARAGRAPH, TABLE) and open_elements and not any(
+                parent.tag in (PARAGRAPH, TABLE) for parent in open_elements
+            ):
+                open_elements[-1].remove(element)
+
+    def read(self, source):
+        """
+        Returns the text of the document, one non-empty paragraph or table row per line.
+
+        :param source: Path to the DOCX file or a binary file object.
+        """
+        return "\n".join(line.strip() for line in self.iter_lines(source) if line.strip())
+
+    def images(self, source):
+        """
+        Returns the bytes of every image embedded in the document.
+
+        :param source: Path to the DOCX file or a binary file object.
+        """
+        with zipfile.ZipFile(source) as zip_ref:
+            return [zip_ref.read(name) for name in zip_ref.namelist() if name.startswith("word/media/")]
@@ -0,0 +1,109 @@
+import io
+import zipfile
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+RTF_MAGIC = b"{\\rtf"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+JPEG_MAGIC = b"\xff\xd8\xff"
+TIFF_MAGICS = (b"II*\x00", b"MM\x00*")
+ODT_MIMETYPE = b"application/vnd.oasis.opendocument.text"
+# Name of the main stream of a Word 97-2003 file inside the OLE2 container, in UTF-16
+WORD_STREAM = "WordDocument".encode("utf-16-le")
+
+
+class UnsupportedFormatError(ValueError):
+    """
+    Raised when a file is of a format no extractor is registered for, or is visibly corrupt.
+    """
+
+
+def _sniff_zip(data):
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as zip_ref:
+            names = set(zip_ref.namelist())
+            if "word/document.xml" in names:
+                return "docx"
+            if "mimetype" in names and zip_ref.read("mimetype").strip() == ODT_MIMETYPE:
+                return "odt"
+    except zipfile.BadZipFile:
+        raise UnsupportedFormatError("Corrupt ZIP container")
+    return None
+
+
+def _looks_like_text(data):
+    sample = data[:4096]
+    if b"\x00" in sample:
+        return False
+    try:
+        text = sample.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is fine
+        if e.start < len(sample) - 4:
+            return False
+        text = sample[:e.start].decode("utf-8-sig")
+    printable = sum(char.isprintable() or char.isspace() for char in text)
+    return bool(text) and printable / len(text) > 0.95
+
+
+def sniff_format(data):
+    """
+    Identifies a file from its leading bytes.
+
+    :param data: The file contents.
+    :return: One of "pdf", "docx", "odt", "doc", "rtf", "png", "jpeg", "tiff", "txt", or None when unknown.
+    :raises UnsupportedFormatError: When the file claims a format but is visibly corrupt.
+    """
+    head = data[:1024]
+
+    # The PDF header may be preceded by junk, readers accept it anywhere in the first KB. The %%EOF
+    # marker is not required: trailing garbage or padding after it still leaves a readable file.
+    if PDF_MAGIC in head:
+        return "pdf"
+    if head.startswith(ZIP_MAGIC):
+        return _sniff_zip(data)
+    if head.startswith(OLE2_MAGIC):
+        return "doc" if WORD_STREAM in data else None
+    if head.startswith(RTF_MAGIC):
+        return "rtf"
+    if head.startswith(PNG_MAGIC):
+        return "png"
+    if head.startswith(JPEG_MAGIC):
+        return "jpeg"
+    if head.startswith(TIFF_MAGICS):
+        return "tiff"
+    if _looks_like_text(data):
+        return "txt"
+    return None
+
+
+class FormatRegistry:
+    def __init__(self):
+        """
+        Maps sniffed file formats to the extractor that reads them.
+        """
+        self._extractors = {}
+
+    def register(self, file_format, extractor):
+        """
+        Registers the extractor for a format returned by sniff_format.
+        """
+        self._extractors[file_format] = extractor
+
+    def formats(self):
+        return list(self._extractors)
+
+    def resolve(self, data, name=None):
+        """
+        Sniffs the file and returns its format together with the registered extractor.
+
+        :param data: The file contents.
+        :param name: File name, only used in error messages.
+        :return: (format, extractor)
+        :raises UnsupportedFormatError: When the format is unknown, corrupt or has no extractor.
+        """
+        file_format = sniff_format(data)
+        if file_format not in self._extractors:
+            raise UnsupportedFormatError(f"Unsupported file format: {file_format or 'unknown'} ({name or 'file'})")
+        return file_format, self._extractors[file_format]
@@ -0,0 +1,133 @@
+import re
+
+from .ResumeParser import ResumeProcessor
+from .OCRProcessor import OCRProcessor
+
+# Characters we expect in real resume text; anything else counts as garbage
+_CLEAN_CHAR = re.compile(r"[\w\s.,;:!?@&%#+\-/\\()\[\]{}'\"|*•·–—$€£₹]")
+# Unmapped glyphs as PyPDF2 reports them for fonts without a usable ToUnicode map
+_CID_GLYPH = re.compile(r"\(cid:\d+\)")
+
+
+class HybridProcessor(ResumeProcessor):
+    EXTRACTOR_VERSION = "3"
+
+    def __init__(self, logger, ocr_processor=None, min_chars=50, max_garbage_ratio=0.2, ocr_profile="auto", **kwargs):
+        """
+        Reads the text layer of every PDF page and only OCRs the pages whose text layer is unusable.
+        DOC and DOCX files are handled exactly as in ResumeProcessor.
+
+        :param logger: Logger instance to log information.
+        :param ocr_processor: OCRProcessor used for the pages that fail, created on demand if None.
+        :param min_chars: Minimum number of letters and digits a page needs to skip OCR.
+        :param max_garbage_ratio: Maximum share of unexpected characters a page may have to skip OCR.
+        :param ocr_profile: OCR profile used when the OCRProcessor is created here (see OCR_PROFILES).
+        """
+        super().__init__(logger, **kwargs)
+        self.ocr_processor = ocr_processor
+        self.min_chars = min_chars
+        self.max_garbage_ratio = max_garbage_ratio
+        self.ocr_profile = ocr_processor.profile if ocr_processor is not None else ocr_profile
+
+    def _worker_kwargs(self):
+        kwargs = super()._worker_kwargs()
+        kwargs.update(min_chars=self.min_chars, max_garbage_ratio=self.max_garbage_ratio, ocr_profile=self.ocr_profile)
+        return kwargs
+
+    def extractor_name(self, pdf_backends=None):
+        return f"{super().extractor_name(pdf_backends)}+ocr:{self.ocr_profile}"
+
+    def score_page(self, text):
+        """
+        Scores the text layer of a page.
+
+        :param text: Text extracted from the page's text layer.
+        :return: (number of letters and digits, share of garbage characters)
+        """
+        text = _CID_GLYPH.sub("�", text or "")
+        visible = [char for char in text if not char.isspace()]
+        if not visible:
+            return 0, 1.0
+
+        density = sum(char.isalnum() for char in visible)
+        garbage = sum(1 for char in visible if char == "�" or not _CLEAN_CHAR.match(char))
+        return density, garbage / len(visible)
+
+    def needs_ocr(self, text):
+        density, garbage_ratio = self.score_page(text)
+        return density < self.min_chars or garbage_ratio > self.max_garbage_ratio
+
+    def analyze_pdf(self, source, pdf_backends=None):
+        """
+        Extracts text from a PDF, falling back to OCR page by page.
+
+        :param source: Path to the PDF file or a binary file object.
+        :param pdf_backends: Overrides the configured PDF text backends for this call.
+        :return: (text, stats) where stats lists the page count, which pages (1-based) were OCR'd
+            and the backend that read the text layer.
+        """
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                data = f.read()
+        else:
+            data = source.getvalue()
+
+        pages, backend = self.pdf_extractor.extract_pages(data, pdf_backends)
+        # A page without a text layer may be a scan among digital pages, only OCR can tell it from a blank one
+        ocr_pages = [number for number, text in enumerate(pages, start=1) if self.needs_ocr(text)]
+
+        failed_pages = []
+        if ocr_pages:
+            results, failed_pages = self.ocr_pages(data, ocr_pages)
+            for result in results:
+                # An empty OCR result is no better than what the text layer had
+                if result["text"].strip():
+                    pages[result["page"] - 1] = result["text"]
+
+        stats = {
+            "pages": len(pages),
+            "ocr_pages": ocr_pages,
+            "ocr_failed_pages": failed_pages,
+            "text_layer_pages": [number for number in range(1, len(pages) + 1) if number not in ocr_pages],
+            "backend": backend,
+        }
+        return "\n".join(pages), stats
+
+    def ocr_pages(self, data, page_numbers):
+        """
+        OCRs pages of a PDF. When OCR fails, e.g. tesseract or poppler is missing, every page is tried on
+        its own so one bad page does not cost the others; the pages that still fail keep their text layer.
+
+        :param data: PDF bytes.
+        :param page_numbers: 1-based page numbers to OCR.
+        :return: (results, failed) with the OCRProcessor.ocr_pdf results and the page numbers that failed.
+        """
+        if self.ocr_processor is None:
+            self.ocr_processor = OCRProcessor(self.log, profile=self.ocr_profile)
+
+        try:
+            return self.ocr_processor.ocr_pdf(data=data, page_numbers=page_numbers), []
+        except Exception as e:
+            if len(page_numbers) == 1:
+                self.log.error(f"OCR failed on page {page_numbers[0]}, keeping its text layer: {e}")
+                return [], list(page_numbers)
+            self.log.warning(f"OCR failed on pages {page_numbers}, retrying page by page: {e}")
+
+        results, failed = [], []
+        for number in page_numbers:
+            try:
+                results.extend(self.ocr_processor.ocr_pdf(data=data, page_numbers=[number]))
+            except Exception as e:
+                self.log.error(f"OCR failed on page {number}, keeping its text layer: {e}")
+                failed.append(number)
+        return results, failed
+
+    def _extract_from_pdf(self, source, cv_path, pdf_backends=None, **options):
+        text = ""
+        try:
+            text, stats = self.analyze_pdf(source, pdf_backends)
+            self.log.info(f"Extracted {cv_path} with {stats['backend']}: {stats['pages']} pages, OCR on pages {stats['ocr_pages']}"
+                          + (f" (failed on {stats['ocr_failed_pages']})" if stats["ocr_failed_pages"] else ""))
+        except Exception as e:
+            self.log.exception(f"Error reading PDF {cv_path}: {e}", exc_info=True)
+        return text
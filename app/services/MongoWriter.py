@@ -0,0 +1,115 @@
+import threading
+
+from pymongo import MongoClient
+from pymongo.errors import BulkWriteError, PyMongoError
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(uri="mongodb://localhost:27017/", max_pool_size=50, timeout_ms=5000, socket_timeout_ms=None):
+    """
+    Returns the process-wide MongoClient for a URI and pool settings, creating it on first use.
+
+    MongoClient is thread-safe and pools its connections, so one per process is enough. Creating one per
+    request opens new connections and monitoring threads every time.
+
+    :param uri: The MongoDB URI.
+    :param max_pool_size: Maximum number of pooled connections per server.
+    :param timeout_ms: Server selection and connect timeout in milliseconds, how long an unreachable server takes to fail.
+    :param socket_timeout_ms: Timeout of a single operation on an open connection in milliseconds. Defaults to None
+        (no timeout): index builds, counts and large inserts legitimately take longer than a failed connect.
+    :return: The shared MongoClient.
+    """
+    key = (uri, max_pool_size, timeout_ms, socket_timeout_ms)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = MongoClient(
+                uri,
+                maxPoolSize=max_pool_size,
+                serverSelectionTimeoutMS=timeout_ms,
+                connectTimeoutMS=timeout_ms,
+                socketTimeoutMS=socket_timeout_ms,
+            )
+            _clients[key] = client
+        return client
+
+
+class MongoWriter:
+    def __init__(self, logger, collection, chunk_size=500):
+        """
+        Streams documents into a collection with unordered insert_many calls of at most chunk_size documents.
+
+        Documents are buffered by write() and inserted as soon as a chunk is full, so writing overlaps with
+        whatever produces them. Unordered inserts go on past a failed document; every failure is recorded
+        with the position of the document in the stream. Use it as a context manager, or call close().
+
+        :param logger: Logger instance to log information.
+        :param collection: The pymongo (or mongomock) collection to write to.
+        :param chunk_size: Maximum number of documents per insert_many.
+        """
+        self.log = logger
+        self.collection = collection
+        self.chunk_size = chunk_size
+
+        self._buffer = []
+        self._written = 0  # documents handed to insert_many so far
+        self.inserted = 0
+        self.failed = []  # {"index", "code", "error"} per document that was not inserted
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, document):
+        """
+        Buffers a document, inserting the buffer when it reaches chunk_size.
+        """
+        self._buffer.append(document)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, documents):
+        """
+        Writes every document of an iterable, see write.
+        """
+        for document in documents:
+            self.write(document)
+
+    def flush(self):
+        """
+        Inserts the buffered documents.
+        """
+        if not self._buffer:
+            return
+        chunk, self._buffer = self._buffer, []
+        offset, self._written = self._written, self._written + len(chunk)
+
+        try:
+            result = self.collection.insert_many(chunk, ordered=False)
+            self.inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            self.inserted += e.details.get("nInserted", 0)
+            for error in e.details.get("writeErrors", []):
+                self.failed.append({"index": offset + error["index"], "code": error.get("code"), "error": error.get("errmsg")})
+            self.log.error(f"{len(e.details.get('writeErrors', []))} of {len(chunk)} documents not saved to '{self.collection.name}'")
+        except PyMongoError as e:
+            # Nothing is known about the chunk, e.g. the server is unreachable
+            self.failed.extend({"index": offset + index, "code": None, "error": str(e)} for index in range(len(chunk)))
+            self.log.error(f"Error saving {len(chunk)} documents to '{self.collection.name}': {e}")
+
+    def close(self):
+        """
+        Inserts what is left in the buffer and logs the outcome.
+
+        :return: Dictionary with the number of documents inserted and the failures.
+        """
+        self.flush()
+        self.log.info(f"Saved {self.inserted} of {self._written} documents to '{self.collection.name}'")
+        return self.report()
+
+    def report(self):
+        return {"inserted": self.inserted, "failed": list(self.failed)}
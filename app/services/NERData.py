@@ -53,8 +53,48 @@ NER_ARRAYS = {
     ]
 }
 
+# Alternative spellings of a skill, mapped to its canonical name. The skill taxonomy
+# (SkillTaxonomy.py) is compiled from NER_ARRAYS and this table.
+SKILL_SYNONYMS = {
+    "javascript": ["js"],
+    "typescript": ["ts"],
+    "c#": ["c-sharp"],
+    "c++": ["cpp"],
+    "go": ["golang"],
+    "react": ["react.js"],
+    "angular": ["angular.js"],
+    "vue.js": ["vue"],
+    "express.js": ["express"],
+    "node.js": ["node"],
+    "postgresql": ["postgres"],
+    "sql server": ["sqlserver", "ms sql", "ms-sql"],
+    "google cloud platform": ["gcp"],
+    "visual studio code": ["vs code"],
+    "intellij idea": ["intellij"],
+    "prometheus": ["prom"],
+}
+
 EMAIL_REGEX = r'[^.]([a-zA-Z0-9._%+-]+[^.])@([a-zA-Z0-9]+(?:\.[a-zA-Z0-9]+)*)(\s*\.[a-zA-Z]{2,})'
 
 PHONE_REGEX = r"(?:\+?\d{1,3}[\s-]?)?(?:\(\d{3}\)|\d{3})[\s-]?\d{2,4}[\s-]?\d{2,4}"
 
-EDUCATION_WORDS = ["educational","university", "college", "institute", "school", "academy", "faculty", "polytechnic","iit","nit","mit",'iiit',"bit","vit","viit","bachelor", "master", "phd", "degree", "graduate","pursuing","btech","b.tech","m.tech","mtech","mba","ba","bsc","ma","msc","mca","mcom","bcom","bca","bba"]
\ No newline at end of file
+EDUCATION_WORDS = ["educational","university", "college", "institute", "school", "academy", "faculty", "polytechnic","iit","nit","mit",'iiit',"bit","vit","viit","bachelor", "master", "phd", "degree", "graduate","pursuing","btech","b.tech","m.tech","mtech","mba","ba","bsc","ma","msc","mca","mcom","bcom","bca","bba"]
+
+# Resume section headers, by section. Titles are compared on their letters only, lowercase,
+# so "WORK EXPERIENCE:", "Work-Experience" and "W O R K  E X P E R I E N C E" all match.
+SECTION_TITLES = {
+    "contact": ["contact", "contacts", "contact information", "contact details", "personal details", "personal information"],
+    "summary": ["summary", "professional summary", "profile", "profile summary", "professional profile", "objective",
+                "career objective", "about", "about me"],
+    "education": ["education", "academics", "academic background", "academic details", "academic qualifications",
+                  "educational qualifications", "educational background", "qualifications", "education and training"],
+    "experience": ["experience", "work experience", "professional experience", "relevant experience", "employment",
+                   "employment history", "work history", "career history", "internship", "internships",
+                   "internship experience"],
+    "skills": ["skills", "technical skills", "key skills", "core skills", "skill set", "skills and tools", "soft skills",
+               "core competencies", "competencies", "technologies", "technical expertise", "tools and technologies"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "project experience", "project work"],
+    "other": ["certifications", "certificates", "achievements", "awards", "honors", "honors and awards", "publications",
+              "languages", "interests", "hobbies", "activities", "extracurricular activities", "volunteering",
+              "positions of responsibility", "courses", "coursework", "trainings", "references", "declaration"],
+}
@@ -1,18 +1,55 @@
 import logging
 import re
 import os
-from bson import ObjectId
 
-import json, random, string
-from pymongo import MongoClient
+import json, random, string, time, hashlib
+from collections import namedtuple
+from itertools import islice
 from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc, Span
 import spacy
 
 # from NERData import NER_ARRAYS as NERArrays
 from .NERData import *
+from .SkillMatcher import SkillMatcher
+from .SkillTaxonomy import SkillTaxonomy, DEFAULT_TAXONOMY_PATH
+from .SkillAggregator import SkillAggregator
+from .TextCache import TextCache
+from .DocStore import DocStore
+from .TextChunker import split_chunks
+from .SectionSegmenter import Section, segment_sections, section_at
+from .MongoWriter import get_client
+from .ResumeSearch import ResumeSearch
+
+
+def _lap(timings, stage, start):
+    # Adds the seconds since start to the stage and returns the new start
+    now = time.perf_counter()
+    timings[stage] = timings.get(stage, 0.0) + now - start
+    return now
+
+
+SKILL_ENGINES = ("phrase", "aho")
+
+# Entity of a long text, found in one of its chunks, with offsets into the whole text
+ChunkEntity = namedtuple("ChunkEntity", ["text", "label_", "start_char", "end_char"])
+
+# Sections each model runs on, see SectionSegmenter. The default model finds the name and the schools, the custom
+# model designations, locations, companies and graduation years. Skills and contacts are matched on the whole text.
+GENERAL_SECTIONS = ("header", "contact", "education")
+CUSTOM_SECTIONS = ("header", "contact", "summary", "education", "experience")
+
+
 class NERProcessor:
+    # Bump when the extraction rules change, it is part of every result cache key
+    NER_VERSION = "2"
     
-    def __init__(self, logger: logging.Logger = None, mongo_uri: str = "mongodb://localhost:27017/", db_name: str = "resume_db"):
+    def __init__(self, logger: logging.Logger = None, mongo_uri: str = "mongodb://localhost:27017/", db_name: str = "resume_db",
+                 single_parse: bool = False, skill_engine: str = "phrase", taxonomy_path: str = DEFAULT_TAXONOMY_PATH,
+                 result_cache: TextCache = None, doc_store: DocStore = None,
+                 chunk_size: int = 10000, chunk_overlap: int = 200, chunk_batch_size: int = 16, chunk_n_process: int = 1,
+                 use_sections: bool = True, mongo_pool_size: int = 50, mongo_timeout_ms: int = 5000, write_chunk_size: int = 500,
+                 resume_ttl_days: float = None, nlp: spacy.language.Language = None, default_nlp: spacy.language.Language = None):
         # Initialize logger
         """
         Initialize the NERProcessor.
@@ -25,6 +62,46 @@ class NERProcessor:
             The MongoDB URI. Defaults to "mongodb://localhost:27017/"
         db_name : str, optional
             The name of the MongoDB database to use. Defaults to "resume_db"
+        single_parse : bool, optional
+            Tokenize each text once and share the tokens between all extractors, running only the
+            components NER needs from each model. Defaults to False.
+        skill_engine : str, optional
+            "phrase" matches skills with a spaCy PhraseMatcher on tokens, "aho" with the spaCy-free
+            Aho-Corasick SkillMatcher on the raw text. Defaults to "phrase".
+        taxonomy_path : str, optional
+            Path to the compiled skill taxonomy (see SkillTaxonomy.py). It is reloaded when the file changes.
+        result_cache : TextCache, optional
+            Cache for extracted entities, keyed by the preprocessed text and the model and taxonomy versions.
+            Defaults to None (no caching).
+        doc_store : DocStore, optional
+            Where to keep the parsed docs, so rematch can re-apply the dictionary extractors without the models.
+            Defaults to None (docs are not kept).
+        chunk_size : int, optional
+            Texts longer than this many characters are split into overlapping chunks on sentence boundaries,
+            so latency grows linearly and spaCy's max_length never applies. Defaults to 10000.
+        chunk_overlap : int, optional
+            Characters shared by neighbouring chunks, entities on a boundary are seen whole by one of them. Defaults to 200.
+        chunk_batch_size : int, optional
+            Chunks processed together, which caps the memory used for one long text. Defaults to 16.
+        chunk_n_process : int, optional
+            Processes the chunks of one text are spread over. Defaults to 1.
+        use_sections : bool, optional
+            Split resumes into sections on their headers and run each model only on the sections it needs
+            (GENERAL_SECTIONS, CUSTOM_SECTIONS). The output then lists the section of every entity under
+            "entity_sources". Defaults to True.
+        mongo_pool_size : int, optional
+            Maximum pooled connections of the process-wide MongoDB client (see MongoWriter.get_client). Defaults to 50.
+        mongo_timeout_ms : int, optional
+            Server selection and connect timeout of the MongoDB client, operations themselves have none. Defaults to 5000.
+        write_chunk_size : int, optional
+            Documents per unordered insert_many when saving results. Defaults to 500.
+        resume_ttl_days : float, optional
+            Saved resumes expire this many days after they were saved (a TTL index of the resumes collection).
+            Defaults to None, which leaves the TTL index as it is (no expiry unless one was set before).
+        nlp : spacy.language.Language, optional
+            The custom pipeline to use instead of loading en_tech_resume_ner_model, e.g. one already loaded.
+        default_nlp : spacy.language.Language, optional
+            The general pipeline to use instead of loading en_core_web_sm.
 
         Notes
         -----
@@ -38,25 +115,267 @@ class NERProcessor:
         else:
             self.logger = logger
             
-        # Make sure the records.json is empty
-        self.record_file_path = "D:\\TY\\resume-parser-nlp\\app\\static\\record.json"
-        if os.path.exists(self.record_file_path):
-            open(self.record_file_path, 'w').close()
-            
         # Initialize Data Strings and Arrays
         self.education_keywords = EDUCATION_WORDS
-        self.NERArrays = NER_ARRAYS
+        # Skill patterns by category come from the compiled taxonomy, matches are reported as canonical IDs
+        self.taxonomy = SkillTaxonomy(taxonomy_path, self.logger)
+        self.NERArrays = self.taxonomy.patterns
         self.Email_regex = EMAIL_REGEX
         self.Phone_regex = PHONE_REGEX
         
-        # Initialize MongoDB client
-        self.mongo_client = MongoClient(mongo_uri)
+        # Initialize MongoDB client, shared by every processor of the process
+        self.mongo_uri = mongo_uri
+        self.db_name = db_name
+        self.mongo_client = get_client(mongo_uri, max_pool_size=mongo_pool_size, timeout_ms=mongo_timeout_ms)
         self.db = self.mongo_client[db_name]
+        self.write_chunk_size = write_chunk_size
+
+        self.result_cache = result_cache
+        self.doc_store = doc_store
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.chunk_batch_size = chunk_batch_size
+        self.chunk_n_process = chunk_n_process
+        self.use_sections = use_sections
+
+        # Skill facets are counted in memory per batch and saved once, see SkillAggregator
+        self.skill_aggregator = SkillAggregator(self.logger, self.db)
+        # Saved resumes are filtered server side on indexed search fields
+        ttl_seconds = None if resume_ttl_days is None else int(resume_ttl_days * 24 * 3600)
+        self.resume_search = ResumeSearch(self.logger, self.db, self.taxonomy, ttl_seconds=ttl_seconds)
 
         # Initialize your NLP models
         self.custom_model = "app\\services\\en_tech_resume_ner_model"
-        self.nlp = spacy.load(self.custom_model)
-        self.default_nlp = spacy.load("en_core_web_sm")
+        self.nlp = nlp if nlp is not None else spacy.load(self.custom_model)
+        self.default_nlp = default_nlp if default_nlp is not None else spacy.load("en_core_web_sm")
+        # The custom model is retrained without bumping its meta version, so its files are hashed too
+        self.model_versions = (
+            self.model_version(self.default_nlp),
+            self.model_version(self.nlp, self.custom_model if nlp is None else None),
+        )
+
+        # In single-parse mode the tagger, parser, lemmatizer etc. of the default model are never run
+        self.single_parse = single_parse
+        if single_parse:
+            self.default_nlp.select_pipes(enable=self.ner_pipes(self.default_nlp))
+            self.nlp.select_pipes(enable=self.ner_pipes(self.nlp))
+
+        # The matcher is compiled once, and again only when the taxonomy is reloaded
+        if skill_engine not in SKILL_ENGINES:
+            raise ValueError(f"Unknown skill engine: {skill_engine}. Available: {', '.join(SKILL_ENGINES)}")
+        self.skill_engine = skill_engine
+        self.skill_matcher = self.build_skill_engine()
+
+    def build_skill_engine(self):
+        """
+        Compiles the selected skill engine from the current NERArrays.
+        """
+        if self.skill_engine == "aho":
+            return SkillMatcher(self.NERArrays)
+        return self.build_skill_matcher()
+
+    def refresh_taxonomy(self):
+        """
+        Reloads the skill taxonomy if its artifact changed on disk and recompiles the matcher.
+
+        Returns
+        -------
+        bool
+            True when a new taxonomy version was loaded.
+        """
+        if not self.taxonomy.reload_if_changed():
+            return False
+        self.NERArrays = self.taxonomy.patterns
+        self.skill_matcher = self.build_skill_engine()
+        self.logger.info(f"Skill matcher rebuilt for taxonomy {self.taxonomy.version}")
+        return True
+
+    def build_skill_matcher(self):
+        """
+        Builds the PhraseMatcher with one rule per skill category of NERArrays.
+
+        Returns
+        -------
+        spacy.matcher.PhraseMatcher
+            A matcher on the LOWER attribute, so it needs tokens only and no pipeline component.
+        """
+        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+
+        # Add patterns to the matcher for each skill category
+        for category, skills in self.NERArrays.items():
+            patterns = [self.nlp.make_doc(skill) for skill in skills]
+            matcher.add(category, patterns)
+
+        return matcher
+
+    @staticmethod
+    def ner_pipes(nlp):
+        """
+        Returns the names of the components the ner component of a pipeline depends on, including itself.
+
+        Parameters
+        ----------
+        nlp : spacy.language.Language
+            The pipeline.
+
+        Returns
+        -------
+        list
+            The ner component, preceded by the shared tok2vec/transformer when ner listens to it.
+        """
+        names = []
+        for name, pipe in nlp.pipeline:
+            if "ner" in getattr(pipe, "listening_components", []):
+                names.append(name)
+        names.append("ner")
+        return names
+
+    def share_tokens(self, doc):
+        """
+        Copies the tokens of a doc made by the custom model into the default model's vocab, without tokenizing again.
+
+        Parameters
+        ----------
+        doc : spacy.tokens.Doc
+            A doc made with the custom model's vocab.
+
+        Returns
+        -------
+        spacy.tokens.Doc
+            A doc with the same tokens that the default model can annotate.
+        """
+        return Doc(self.default_nlp.vocab, words=[token.text for token in doc], spaces=[bool(token.whitespace_) for token in doc])
+
+    def segment(self, text):
+        """
+        Splits a raw text into sections and preprocesses it.
+
+        Parameters
+        ----------
+        text : str
+            The text as extracted from the file, with its line breaks.
+
+        Returns
+        -------
+        tuple
+            (text, sections) with the preprocessed text and its sections, see SectionSegmenter. sections is
+            None when use_sections is off.
+        """
+        processed = self.preprocess_text(text)
+        if not self.use_sections:
+            return processed, None
+
+        # Preprocessing keeps every character but the stripped leading whitespace
+        shift = len(text) - len(text.lstrip())
+        sections = []
+        for section in segment_sections(text):
+            start, end = max(section.start - shift, 0), min(section.end - shift, len(processed))
+            if start < end:
+                sections.append(Section(section.name, start, end))
+        return processed, sections
+
+    def annotate(self, nlp, docs, sections, names, batch_size=64, n_process=1):
+        """
+        Runs a model on the named sections of token docs and sets the entities it finds on the whole docs.
+
+        Parameters
+        ----------
+        nlp : spacy.language.Language
+            The model, the docs must use its vocab.
+        docs : list of spacy.tokens.Doc
+            Tokenized preprocessed texts.
+        sections : list
+            The sections of every doc. None for a doc runs the model on all of it.
+        names : tuple of str
+            The sections the model runs on.
+        batch_size : int, optional
+            Number of docs spaCy processes per batch. Defaults to 64.
+        n_process : int, optional
+            Number of processes. Defaults to 1.
+
+        Yields
+        ------
+        spacy.tokens.Doc
+            Every doc with its entities, in input order.
+        """
+        inputs, token_maps = [], []
+        for doc, doc_sections in zip(docs, sections):
+            token_map = None
+            if doc_sections is not None and any(section.name not in names for section in doc_sections):
+                # A doc of the section tokens only, token_map holds the position of each in the whole doc
+                words, spaces, token_map = [], [], []
+                for section in doc_sections:
+                    span = doc.char_span(section.start, section.end, alignment_mode="expand")
+                    if section.name not in names or span is None:
+                        continue
+                    if spaces:
+                        spaces[-1] = True
+                    for token in span:
+                        if token_map and token.i <= token_map[-1]:
+                            continue
+                        words.append(token.text)
+                        spaces.append(bool(token.whitespace_))
+                        token_map.append(token.i)
+                inputs.append(Doc(nlp.vocab, words=words, spaces=spaces))
+            else:
+                inputs.append(doc)
+            token_maps.append(token_map)
+
+        for doc, token_map, parsed in zip(docs, token_maps, nlp.pipe(inputs, batch_size=batch_size, n_process=n_process)):
+            if token_map is None:
+                yield parsed
+                continue
+            ents = []
+            for ent in parsed.ents:
+                first, last = token_map[ent.start], token_map[ent.end - 1]
+                # Tokens that are not contiguous in the whole doc mean the entity ran across a skipped section
+                if last - first == ent.end - 1 - ent.start:
+                    ents.append(Span(doc, first, last + 1, label=ent.label_))
+            doc.ents = ents
+            yield doc
+
+    def parse(self, text, timings=None, sections=None):
+        """
+        Runs the models on a preprocessed text.
+
+        Parameters
+        ----------
+        text : str
+            The preprocessed text.
+        timings : dict, optional
+            If given, the seconds spent in every stage are added to it.
+        sections : list of Section, optional
+            The sections of the text, each model only runs on the ones it needs. Defaults to the whole text.
+
+        Returns
+        -------
+        tuple
+            (general_doc, custom_doc, skill_doc) for extract_entities, extract_custom_entities and extract_matched_skills.
+        """
+        timings = {} if timings is None else timings
+        start = time.perf_counter()
+
+        if self.single_parse:
+            # One tokenization shared by both models. Skills are matched on the lowercased text, its tokens
+            # differ where case drives the tokenizer ("Node.JS," vs "node.js,"), so it is tokenized on its own
+            custom_doc = self.nlp.make_doc(text)
+            skill_doc = self.nlp.make_doc(text.lower()) if self.skill_engine == "phrase" else None
+            start = _lap(timings, "tokenize", start)
+            general_doc, = self.annotate(self.default_nlp, [self.share_tokens(custom_doc)], [sections], GENERAL_SECTIONS)
+            start = _lap(timings, "general_ner", start)
+            custom_doc, = self.annotate(self.nlp, [custom_doc], [sections], CUSTOM_SECTIONS)
+            _lap(timings, "custom_ner", start)
+            return general_doc, custom_doc, skill_doc
+
+        general_doc, = self.annotate(self.default_nlp, [self.default_nlp.make_doc(text)], [sections], GENERAL_SECTIONS)
+        start = _lap(timings, "general_ner", start)
+        custom_doc, = self.annotate(self.nlp, [self.nlp.make_doc(text)], [sections], CUSTOM_SECTIONS)
+        start = _lap(timings, "custom_ner", start)
+        skill_doc = None
+        if self.skill_engine == "phrase":
+            skill_doc = self.nlp.make_doc(text.lower())
+            _lap(timings, "tokenize", start)
+        return general_doc, custom_doc, skill_doc
 
     def preprocess_text(self, text):
         """
@@ -76,7 +395,7 @@ class NERProcessor:
         text = text.replace('\r', " ")
         return text.replace('\n', ' ').strip()
 
-    def extract_entities(self, text):
+    def extract_entities(self, text, doc=None, ents=None):
         """
         Extracts entities from the text using spaCy NER.
 
@@ -84,13 +403,20 @@ class NERProcessor:
         ----------
         text : str
             The text from which to extract entities.
+        doc : spacy.tokens.Doc, optional
+            The text already processed by the default model, e.g. by nlp.pipe.
+        ents : iterable of spacy.tokens.Span, optional
+            Entities of the default model found earlier, e.g. kept in a stored doc. Used instead of doc.
 
         Returns
         -------
         dict
             A dictionary with the following keys: name, emails, phones, education. The values are lists of strings.
         """
-        doc = self.default_nlp(text)
+        if ents is None:
+            if doc is None:
+                doc = self.default_nlp(text)
+            ents = doc.ents
         
         extracted_info = {
             "name": None,
@@ -102,7 +428,7 @@ class NERProcessor:
         all_entities = []  # Store all entities
 
         # Extract using spaCy NER
-        for ent in doc.ents:
+        for ent in ents:
             all_entities.append((ent.text, ent.label_))  # Collect all entities
             if ent.label_ == "PERSON" and not extracted_info["name"]:
                 extracted_info["name"] = ent.text
@@ -120,7 +446,7 @@ class NERProcessor:
 
         return extracted_info
     
-    def extract_custom_entities(self, text):
+    def extract_custom_entities(self, text, doc=None, ents=None):
         """
         Extracts custom entities from the text using a custom spaCy NER model.
 
@@ -128,6 +454,10 @@ class NERProcessor:
         ----------
         text : str
             The text from which to extract entities.
+        doc : spacy.tokens.Doc, optional
+            The text already processed by the custom model, e.g. by nlp.pipe.
+        ents : iterable of spacy.tokens.Span, optional
+            Entities of the custom model found earlier, e.g. kept in a stored doc. Used instead of doc.
 
         Returns
         -------
@@ -138,13 +468,16 @@ class NERProcessor:
         # Entities to extract
         entities = ['Graduation Year', 'Designation', 'Location', 'Companies worked at']
         
-        doc = self.nlp(text)
+        if ents is None:
+            if doc is None:
+                doc = self.nlp(text)
+            ents = doc.ents
         
         extracted_info = {}
         all_entities = []  # Store all entities
 
         # Extract using custom spaCy NER
-        for ent in doc.ents:
+        for ent in ents:
             all_entities.append((ent.text, ent.label_))  # Collect all entities
             if ent.label_ in entities:
                 if ent.label_ in extracted_info.keys():
@@ -154,36 +487,45 @@ class NERProcessor:
 
         return extracted_info
     
-    def extract_matched_skills(self, text):
+    def extract_matched_skills(self, text, doc=None):
         """
-        Extracts matched skills from the text using a PhraseMatcher and updates the record.json.
+        Extracts matched skills from the text using the selected skill engine.
 
         Parameters
         ----------
         text : str
             The text from which to extract matched skills.
+        doc : spacy.tokens.Doc, optional
+            text.lower() already tokenized with the custom model's tokenizer. It must come from the
+            lowercased text: the tokenizer splits some tokens by case, so a doc of the original text
+            misses or adds skills. Ignored by the "aho" engine, which matches the raw text.
 
         Returns
         -------
         dict
             A dictionary with the following keys: 'Programming Languages', 'Frameworks', 'External Links', 'Social Links'. 
-            The values are lists of strings.
+            The values are lists of canonical skill IDs from the taxonomy.
         """
-        
-        # Initialize PhraseMatcher
-        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-        matched_skills = {}
+        self.refresh_taxonomy()
 
-        # Add patterns to the matcher for each skill category
-        for category, skills in self.NERArrays.items():  # Assuming NERArrays is defined elsewhere
-            patterns = [self.nlp.make_doc(skill) for skill in skills]
-            matcher.add(category, patterns)
+        if self.skill_engine == "aho":
+            matched_skills = self.skill_matcher.extract(text)
+        else:
+            matched_skills = self.phrase_match_skills(text, doc)
+        return self.taxonomy.canonicalize(matched_skills)
 
-        # Process the sample text
-        doc = self.nlp(text.lower())  # Convert text to lowercase to match the patterns
+    def phrase_match_skills(self, text, doc=None):
+        """
+        Matches skills with the PhraseMatcher engine, see extract_matched_skills.
+        """
+        matched_skills = {}
+
+        # Tokenize the sample text, the LOWER matcher needs no pipeline component
+        if doc is None:
+            doc = self.nlp.make_doc(text.lower())
 
         # Find matches in the text
-        matches = matcher(doc)
+        matches = self.skill_matcher(doc)
 
         # Extract matched skills with their categories
         for match_id, start, end in matches:
@@ -194,32 +536,9 @@ class NERProcessor:
             if skill not in matched_skills[category]:
                 matched_skills[category].append(skill)
 
-        # Load existing records from the record.json file
-        if os.path.exists(self.record_file_path):
-            with open(self.record_file_path, 'r', encoding='utf-8') as file:
-                try:
-                    existing_records = json.load(file)
-                except json.JSONDecodeError:
-                    existing_records = {}  # Initialize empty if file is corrupted or empty
-        else:
-            existing_records = {}
-
-        # Update existing records with the new matched skills
-        for category, skills in matched_skills.items():
-            if category in existing_records:
-                # Add new skills that are not already in the record
-                existing_records[category].extend([skill for skill in skills if skill not in existing_records[category]])
-            else:
-                # Create a new category if it doesn't exist
-                existing_records[category] = skills
-
-        # Write updated records back to the record.json file
-        with open(self.record_file_path, 'w', encoding='utf-8') as file:
-            json.dump(existing_records, file, ensure_ascii=False, indent=4)
-
         return matched_skills
 
-    def extract_all_entities(self, text):
+    def extract_all_entities(self, text, timings=None):
         """
         Extracts all entities from the text using multiple methods.
 
@@ -227,121 +546,449 @@ class NERProcessor:
         ----------
         text : str
             The text from which to extract entities.
+        timings : dict, optional
+            If given, the seconds spent in every stage (preprocess, cache, tokenize, general_ner, custom_ner,
+            general_rules, custom_entities, skills) are added to it.
 
         Returns
         -------
         dict
             A dictionary with all the extracted entities as keys and their corresponding values as lists of strings.
+            With use_sections, "entity_sources" lists the model entities the extractors saw, each with its section.
 
         """
-        
-        # Preprocess the text before extracting entities
-        text = self.preprocess_text(text)
+        timings = {} if timings is None else timings
+        start = time.perf_counter()
+
+        # Find the sections while the line breaks are there, then preprocess the text
+        text, sections = self.segment(text)
+        start = _lap(timings, "preprocess", start)
+
+        # Repeated texts skip the models entirely
+        key = None
+        if self.result_cache is not None:
+            self.refresh_taxonomy()
+            key = self.result_cache_key(text, sections)
+            cached = self.result_cache.get(key)
+            _lap(timings, "cache", start)
+            if cached is not None:
+                return json.loads(cached)["entities"]
+
+        if len(text) > self.chunk_size:
+            entities, matched_skills = self.extract_chunked(text, timings, sections)
+            self.cache_result(key, entities, matched_skills)
+            return entities
+
+        general_doc, custom_doc, skill_doc = self.parse(text, timings, sections)
+
+        # Extract information from various methods, sharing the parsed docs
+        start = time.perf_counter()
+        general_info = self.extract_entities(text, doc=general_doc)
+        start = _lap(timings, "general_rules", start)
+        custom_info = self.extract_custom_entities(text, doc=custom_doc)
+        start = _lap(timings, "custom_entities", start)
+        matched_skills = self.extract_matched_skills(text, doc=skill_doc)
+        _lap(timings, "skills", start)
+
+        self.logger.debug("NER stage timings (ms): " + ", ".join(f"{stage}={seconds * 1000:.1f}" for stage, seconds in timings.items()))
+        entities = self.combine_entities(general_info, custom_info, matched_skills)
+        self.add_entity_sources(entities, sections, general_doc.ents, custom_doc.ents)
+        self.cache_result(key, entities, matched_skills)
+        self.store_doc(text, general_doc, custom_doc, sections)
+        return entities
+
+    def extract_chunked(self, text, timings=None, sections=None):
+        """
+        Extracts all entities from a long preprocessed text chunk by chunk, see split_chunks.
 
-        # Extract information from various methods
-        general_info = self.extract_entities(text)
-        custom_info = self.extract_custom_entities(text)
-        matched_skills = self.extract_matched_skills(text)
+        The chunks go through the models chunk_batch_size at a time. Entity offsets are moved back into
+        the whole text and every entity is kept once, by the chunk owning its start. Contacts are matched
+        on the whole text. Chunked texts are not kept in the doc store. The models see whole chunks, with
+        sections their entities are kept only when they start in a section the model runs on.
 
-        # Combine all the extracted information into one dictionary without a subkey
+        Parameters
+        ----------
+        text : str
+            The preprocessed text.
+        timings : dict, optional
+            If given, the seconds spent chunking, in the models (chunk_ner) and in the extractors are added to it.
+        sections : list of Section, optional
+            The sections of the text. Defaults to the whole text.
+
+        Returns
+        -------
+        tuple
+            (entities, matched_skills) shaped like the outputs of extract_all_entities and extract_matched_skills.
+        """
+        timings = {} if timings is None else timings
+        start = time.perf_counter()
+        chunks = split_chunks(text, self.chunk_size, self.chunk_overlap)
+        start = _lap(timings, "chunk", start)
+
+        general_ents, custom_ents, matched_skills = [], [], {}
+        for batch_start in range(0, len(chunks), self.chunk_batch_size):
+            batch = chunks[batch_start:batch_start + self.chunk_batch_size]
+            docs = self.pipe_docs([text[chunk.start:chunk.end] for chunk in batch], self.chunk_batch_size, self.chunk_n_process)
+            for chunk, (general_doc, custom_doc, skill_doc) in zip(batch, docs):
+                for doc, found, names in ((general_doc, general_ents, GENERAL_SECTIONS), (custom_doc, custom_ents, CUSTOM_SECTIONS)):
+                    for ent in doc.ents:
+                        position = chunk.start + ent.start_char
+                        if sections is not None and section_at(sections, position) not in names:
+                            continue
+                        if chunk.own_start <= position < chunk.own_end:
+                            found.append(ChunkEntity(
+                                ent.text, ent.label_, position, chunk.start + ent.end_char
+                            ))
+                start = _lap(timings, "chunk_ner", start)
+
+                # Skill lists hold unique IDs, so a skill seen by two chunks is kept once anyway
+                chunk_text = text[chunk.start:chunk.end]
+                for category, skills in self.extract_matched_skills(chunk_text, doc=skill_doc).items():
+                    category_skills = matched_skills.setdefault(category, [])
+                    category_skills.extend(skill for skill in skills if skill not in category_skills)
+                start = _lap(timings, "skills", start)
+
+        general_info = self.extract_entities(text, ents=general_ents)
+        custom_info = self.extract_custom_entities(text, ents=custom_ents)
+        _lap(timings, "general_rules", start)
+
+        self.logger.debug(f"Extracted entities from {len(chunks)} chunks of a {len(text)} character text")
+        entities = self.combine_entities(general_info, custom_info, matched_skills)
+        self.add_entity_sources(entities, sections, general_ents, custom_ents)
+        return entities, matched_skills
+
+    def add_entity_sources(self, entities, sections, *ents):
+        """
+        Adds "entity_sources" to the extracted entities: the text, label and section of every model entity
+        the extractors saw. Nothing is added without sections.
+        """
+        if sections is None:
+            return
+        entities["entity_sources"] = [
+            {"text": ent.text, "label": ent.label_, "section": section_at(sections, ent.start_char)}
+            for found in ents for ent in found
+        ]
+
+    def combine_entities(self, *infos):
+        """
+        Combines the outputs of the extractors into one dictionary without a subkey, the first one to set a key wins.
+        """
         combined_info = {}
-        for info in [general_info, custom_info, matched_skills]:
+        for info in infos:
             for key, value in info.items():
                 if key not in combined_info:
                     combined_info[key] = value
                                     
         return combined_info
     
-    def bulk_extract_all_entities(self, texts):
-        all_entities = []
-        for text in texts:
-            combined_info = {}
-            info = self.extract_all_entities(text)
-            for key, value in info.items():
-                if key not in combined_info:
-                    combined_info[key] = value
-            all_entities.append(combined_info)
-
-        # Also return the record.json
-        with open(self.record_file_path, 'r', encoding='utf-8') as file:
-            record = json.load(file)
-            
-        return [all_entities, record]
-    
-    def bulk_save_to_mongo(self, data):
+    def bulk_extract_all_entities(self, texts, batch_size=64, n_process=1, on_result=None):
         """
-        Saves a list of extracted information to a MongoDB database. into a particular collection (random name) and returns the collection name for later fetching
+        Extracts all entities from many texts, streaming them through nlp.pipe instead of one call per text.
 
         Parameters
         ----------
-        data : list
-            A list of dictionaries containing the extracted information.
+        texts : list
+            The texts from which to extract entities.
+        batch_size : int, optional
+            Number of texts spaCy processes per batch. Defaults to 64.
+        n_process : int, optional
+            Number of processes per model. Each process loads its own copy of the model, so only raise this
+            for large batches. Defaults to 1.
+        on_result : callable, optional
+            Called with (index, entities) for every text, in input order, as soon as the text and all the ones
+            before it are done, e.g. MongoWriter.write to save results while the rest are still processed.
 
         Returns
         -------
-        None
+        list
+            [all_entities, facets] where all_entities holds one dictionary per text, in input order, identical
+            to what extract_all_entities returns, and facets counts the matched skills of the batch
+            (see SkillAggregator.aggregate). Save them with skill_aggregator.save once the batch has an ID.
+        """
+        segmented = [self.segment(text or "") for text in texts]
+        texts = [text for text, _ in segmented]
+        all_sections = [sections for _, sections in segmented]
+        self.refresh_taxonomy()
+
+        all_entities = [None] * len(texts)
+        all_matched_skills = [None] * len(texts)
+        keys = [None] * len(texts)
+        if self.result_cache is not None:
+            for index, text in enumerate(texts):
+                keys[index] = self.result_cache_key(text, all_sections[index])
+                cached = self.result_cache.get(keys[index])
+                if cached is not None:
+                    cached = json.loads(cached)
+                    all_entities[index], all_matched_skills[index] = cached["entities"], cached["skills"]
+
+        emitted = 0
+
+        def emit_ready():
+            # Hands out the finished results that no earlier text is still waiting in front of
+            nonlocal emitted
+            while on_result is not None and emitted < len(texts) and all_entities[emitted] is not None:
+                on_result(emitted, all_entities[emitted])
+                emitted += 1
+
+        emit_ready()
+
+        # Only the texts missing from the cache go through the models
+        misses = [index for index, entities in enumerate(all_entities) if entities is None]
+
+        # Long texts are chunked one by one, the rest is piped together
+        for index in [index for index in misses if len(texts[index]) > self.chunk_size]:
+            all_entities[index], all_matched_skills[index] = self.extract_chunked(texts[index], sections=all_sections[index])
+            self.cache_result(keys[index], all_entities[index], all_matched_skills[index])
+            emit_ready()
+        misses = [index for index in misses if len(texts[index]) <= self.chunk_size]
+
+        docs = self.pipe_docs(
+            [texts[index] for index in misses], batch_size, n_process, sections=[all_sections[index] for index in misses]
+        )
+        for index, (general_doc, custom_doc, skill_doc) in zip(misses, docs):
+            text, sections = texts[index], all_sections[index]
+            matched_skills = self.extract_matched_skills(text, doc=skill_doc)
+            all_matched_skills[index] = matched_skills
+            all_entities[index] = self.combine_entities(
+                self.extract_entities(text, doc=general_doc),
+                self.extract_custom_entities(text, doc=custom_doc),
+                matched_skills,
+            )
+            self.add_entity_sources(all_entities[index], sections, general_doc.ents, custom_doc.ents)
+            self.cache_result(keys[index], all_entities[index], matched_skills)
+            self.store_doc(text, general_doc, custom_doc, sections)
+            emit_ready()
+
+        if self.doc_store is not None:
+            self.doc_store.flush()
+
+        # Skill facets of the whole batch, counted in memory
+        facets = self.skill_aggregator.aggregate(all_matched_skills)
+            
+        return [all_entities, facets]
+
+    def pipe_docs(self, texts, batch_size=64, n_process=1, sections=None):
+        """
+        Streams preprocessed texts through the models, see parse. sections holds the sections of every
+        text, by default the models run on the whole texts.
 
-        Raises
+        Yields
         ------
-        Exception
-            If there is any error while saving data to MongoDB.
+        tuple
+            (general_doc, custom_doc, skill_doc) for every text, in input order.
         """
-        
-        # initiate the connection with mongo
-        # generate a random collection
-        collection_name = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(10))
-        try:
-            self.client = MongoClient(self.mongo_uri)
-            self.db = self.client[self.db_name]
-            self.logger.info("Connected to MongoDB successfully.")
-        except Exception as e:
-            self.logger.error(f"Error connecting to MongoDB: {e}")
-            
-        try:
-            self.db[collection_name].insert_many(data)
-            self.logger.info("Data saved to MongoDB successfully.")
-        except Exception as e:
-            self.logger.error(f"Error saving to MongoDB: {e}")
-        
-        return collection_name
+        sections = [None] * len(texts) if sections is None else sections
+        # nlp.pipe yields docs in input order, so the three streams stay aligned
+        if self.single_parse:
+            # Tokenize once, nlp.pipe skips the tokenizer for Doc inputs
+            token_docs = list(self.nlp.tokenizer.pipe(texts, batch_size=batch_size))
+            general_docs = self.annotate(
+                self.default_nlp, [self.share_tokens(doc) for doc in token_docs], sections, GENERAL_SECTIONS, batch_size, n_process
+            )
+            custom_docs = list(self.annotate(self.nlp, token_docs, sections, CUSTOM_SECTIONS, batch_size, n_process))
+        else:
+            general_docs = self.annotate(
+                self.default_nlp, list(self.default_nlp.tokenizer.pipe(texts, batch_size=batch_size)), sections, GENERAL_SECTIONS,
+                batch_size, n_process
+            )
+            custom_docs = self.annotate(
+                self.nlp, list(self.nlp.tokenizer.pipe(texts, batch_size=batch_size)), sections, CUSTOM_SECTIONS, batch_size, n_process
+            )
+        if self.skill_engine == "phrase":
+            skill_docs = self.nlp.tokenizer.pipe((text.lower() for text in texts), batch_size=batch_size)
+        else:
+            skill_docs = [None] * len(texts)
+
+        return zip(general_docs, custom_docs, skill_docs)
 
-    def save_to_mongo(self, data):
+    @staticmethod
+    def model_version(nlp, path=None):
+        """
+        Returns the name and version of a pipeline, followed by a hash of its files when a path is given.
+        """
+        version = f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+        if path is None:
+            return version
+
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                with open(os.path.join(root, filename), 'rb') as f:
+                    digest.update(f.read())
+        return f"{version}.{digest.hexdigest()[:12]}"
+
+    def store_doc(self, text, general_doc, custom_doc, sections=None):
+        """
+        Keeps the tokens and both entity sets of a text in the doc store. The custom doc is stored with
+        the default model's entities added as its "general" span group and the sections as its "sections" group.
         """
-        Saves the extracted information to a MongoDB database.
+        if self.doc_store is None:
+            return
+        key = self.doc_store.doc_key(text)
+        if key in self.doc_store:
+            return
+
+        doc = custom_doc
+        # Both docs cover the same text, character offsets map the entities even if the tokens differ
+        doc.spans["general"] = [
+            span for span in (
+                doc.char_span(ent.start_char, ent.end_char, label=ent.label_, alignment_mode="expand")
+                for ent in general_doc.ents
+            ) if span is not None
+        ]
+        if sections is not None:
+            doc.spans["sections"] = [
+                span for span in (
+                    doc.char_span(section.start, section.end, label=section.name, alignment_mode="expand")
+                    for section in sections
+                ) if span is not None
+            ]
+        self.doc_store.add(key, doc)
+
+    def rematch(self, keys=None):
+        """
+        Re-applies the dictionary based extractors (skills, education keywords, links, contacts) to the
+        stored docs, reusing their entities instead of running the statistical models again. Run it after
+        changing the taxonomy or the keyword lists.
 
         Parameters
         ----------
-        data : dict
-            The dictionary containing the extracted information.
+        keys : iterable of str, optional
+            Document keys (see DocStore.doc_key) to rematch. Defaults to every stored document.
+
+        Yields
+        ------
+        tuple
+            (key, entities) with entities shaped like the output of extract_all_entities.
+        """
+        if self.doc_store is None:
+            raise ValueError("rematch needs a doc_store")
+        self.refresh_taxonomy()
+
+        for key, doc in self.doc_store.iter_docs(self.nlp.vocab, keys):
+            text = doc.text
+            general_ents = doc.spans["general"] if "general" in doc.spans else []
+            sections = None
+            if self.use_sections and "sections" in doc.spans:
+                sections = [Section(span.label_, span.start_char, span.end_char) for span in doc.spans["sections"]]
+            # Skills are matched on a fresh tokenization of the lowercased text, exactly as extract_all_entities does
+            matched_skills = self.extract_matched_skills(text)
+            entities = self.combine_entities(
+                self.extract_entities(text, ents=general_ents),
+                self.extract_custom_entities(text, ents=doc.ents),
+                matched_skills,
+            )
+            self.add_entity_sources(entities, sections, general_ents, doc.ents)
+            # Refresh the result cache under the current taxonomy version
+            if self.result_cache is not None:
+                self.cache_result(self.result_cache_key(text, sections), entities, matched_skills)
+            yield key, entities
+
+    def ner_fingerprint(self):
+        """
+        Identifies everything the extracted entities depend on: both models, the taxonomy and the mode.
+        """
+        mode = "single" if self.single_parse else "full"
+        if self.use_sections:
+            mode += "+sections"
+        return f"{'+'.join(self.model_versions)}:{self.taxonomy.version}:{self.skill_engine}:{mode}"
+
+    def result_cache_key(self, text, sections=None):
+        """
+        Builds the result cache key of a preprocessed text and its sections. A new model or taxonomy version changes every key.
+        """
+        # The sections come from line breaks preprocessing removed, so they are part of the key
+        if sections is not None:
+            text += "".join(f"\0{section.name}:{section.start}:{section.end}" for section in sections)
+        return TextCache.make_key(text.encode("utf-8"), self.ner_fingerprint(), self.NER_VERSION)
+
+    def cache_result(self, key, entities, matched_skills):
+        if key is not None:
+            self.result_cache.set(key, json.dumps({"entities": entities, "skills": matched_skills}, ensure_ascii=False))
+
+    def new_batch_id(self):
+        """
+        Generates the random ID a batch of results is saved under.
+        """
+        return ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(10))
+
+    def open_writer(self):
+        """
+        Returns a MongoWriter streaming documents into the resumes collection with unordered inserts of
+        write_chunk_size. Write ResumeSearch.document outputs, they carry the batch_id.
+        """
+        return self.resume_search.writer(chunk_size=self.write_chunk_size)
+
+    def bulk_save_to_mongo(self, data):
+        """
+        Saves a list of extracted information to the resumes collection of the MongoDB database, under a new
+        batch ID (random name) and returns the batch ID for later fetching
+
+        Parameters
+        ----------
+        data : iterable
+            The dictionaries containing the extracted information. They are inserted in chunks as they are read,
+            with their batch and search fields (see ResumeSearch.document).
 
         Returns
         -------
-        None
+        str
+            The batch ID. Documents that could not be saved are logged with their position.
+        """
+        batch_id = self.new_batch_id()
+        with self.open_writer() as writer:
+            writer.write_many(self.resume_search.document(entities, batch_id) for entities in data)
+        for failure in writer.failed:
+            self.logger.error(f"Document {failure['index']} of batch {batch_id} not saved: {failure['error']}")
+        return batch_id
+
+    def save_to_mongo(self, data, batch_id=None):
+        """
+        Saves the extracted information of one resume to the resumes collection of the MongoDB database.
 
-        Raises
-        ------
-        Exception
-            If there is any error while saving data to MongoDB.
+        Parameters
+        ----------
+        data : dict
+            The dictionary containing the extracted information. It is saved with its batch and search fields
+            (see ResumeSearch.document).
+        batch_id : str, optional
+            The batch to add the resume to. Defaults to a new batch.
+
+        Returns
+        -------
+        str
+            The batch ID, or None if the resume could not be saved (the error is logged).
         """
+        batch_id = batch_id or self.new_batch_id()
         try:
-            self.db.resumes.insert_one(data)
-            self.logger.info("Data saved to MongoDB successfully.")
+            self.resume_search.ensure_indexes()
+            self.resume_search.collection.insert_one(self.resume_search.document(data, batch_id))
+            self.logger.info(f"Data saved to MongoDB successfully, batch {batch_id}.")
+            return batch_id
         except Exception as e:
             self.logger.error(f"Error saving to MongoDB: {e}")
+            return None
 
-    def fetch_data_from_mongo(self, collection_name):
+    def fetch_data_from_mongo(self, batch_id, after=None, limit=None):
         """
-        Fetches all the data from the specified MongoDB collection.
+        Fetches the data of the specified batch from the resumes collection, in insertion order.
 
         Parameters
         ----------
-        collection_name : str
-            The name of the collection to fetch the data from.
+        batch_id : str
+            The batch to fetch the data of, as returned by bulk_save_to_mongo.
+        after : str, optional
+            Keyset cursor, the _id of the last document already fetched. Defaults to the start.
+        limit : int, optional
+            Maximum number of documents. Defaults to all of them, prefer paging or
+            ResumeSearch.iter_documents for large collections.
 
         Returns
         -------
         data : list
-            A list of documents fetched from the collection.
+            A list of documents fetched from the collection, as MongoDB returns them. Encode them with
+            MongoJSON.dumps, which handles their ObjectIds.
         """
         try:
                 
@@ -352,24 +999,14 @@ class NERProcessor:
             # except Exception as e:
                 # self.logger.error(f"Error connecting to MongoDB: {e}")
 
-            collection = self.db[collection_name]
-            data = list(collection.find({}))
-
-            # Convert ObjectId fields to strings for serialization
-            def serialize_mongo_id(entity):
-                if isinstance(entity, ObjectId):
-                    return str(entity)
-                if isinstance(entity, dict):
-                    return {k: serialize_mongo_id(v) for k, v in entity.items()}
-                elif isinstance(entity, list):
-                    return [serialize_mongo_id(i) for i in entity]
-                return entity
-            
-            # Serialize ObjectIds in the fetched data
-            serialized_data = [serialize_mongo_id(doc) for doc in data]
+            # Read with keyset queries, at most limit documents
+            data = self.resume_search.iter_documents(batch_id, batch_size=min(limit or 1000, 1000), after=after)
+            if limit is not None:
+                data = islice(data, limit)
 
-            self.logger.info(f"Fetched {len(serialized_data)} documents from collection '{collection_name}'.")
-            return serialized_data
+            data = list(data)
+            self.logger.info(f"Fetched {len(data)} documents of batch '{batch_id}'.")
+            return data
         except Exception as e:
             self.logger.error(f"Error fetching data from MongoDB: {e}")
             raise
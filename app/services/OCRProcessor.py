@@ -1,117 +1,490 @@
+import io
 import os
+import time
+import uuid
 import pytesseract
-from pdf2image import convert_from_path
+from concurrent.futures import ThreadPoolExecutor
+from pdf2image import convert_from_path, convert_from_bytes, pdfinfo_from_path, pdfinfo_from_bytes
 from docx2pdf import convert as docx2pdf_convert
+from spire.doc import Document as SpireDoc, FileFormat
+from spire.doc.common import Stream
+from PIL import Image, ImageStat
 import re
-from PIL import Image
 import logging
 
+from .TextCache import TextCache
+from .DocxReader import DocxReader
+from .FormatRegistry import FormatRegistry, UnsupportedFormatError
+
+# Rasterization, image preprocessing and tesseract settings per OCR profile.
+# "threshold" is None (keep greyscale/colour), "otsu" or a fixed 0-255 cut-off.
+OCR_PROFILES = {
+    "fast": {"dpi": 150, "grayscale": True, "threshold": "otsu", "psm": 3, "oem": 1, "lang": "eng"},
+    "balanced": {"dpi": 200, "grayscale": True, "threshold": None, "psm": 3, "oem": 1, "lang": "eng"},
+    "accurate": {"dpi": 300, "grayscale": False, "threshold": None, "psm": 3, "oem": 3, "lang": "eng"},
+}
+
+# Profiles tried in order by the "auto" profile until tesseract is confident enough
+AUTO_PROFILE_LADDER = ["fast", "balanced", "accurate"]
+
+SPIRE_EVALUATION_WARNING = "Evaluation Warning: The document was created with Spire.Doc for Python."
+
+
 class OCRProcessor:
-    def __init__(self, logger, temp_dir="temp"):
+    # Bump whenever the extracted text changes so cached entries are not reused
+    EXTRACTOR_VERSION = "4"
+
+    def __init__(self, logger, temp_dir="temp", cache=None, ocr_workers=4, render_threads=4, profile="accurate", min_confidence=75, min_native_chars=50,
+                 blank_stddev=2.0):
         """
         Initializes the OCRProcessor with a logger and a temporary directory for storing intermediate files.
         
         :param logger: Logger instance to log information.
-        :param temp_dir: Directory to store temporary images and converted PDFs.
+        :param temp_dir: Directory to store converted PDFs. Page images are never written to disk.
+        :param cache: Optional TextCache, files with identical bytes are then only OCR'd once.
+        :param ocr_workers: Number of pages OCR'd at the same time.
+        :param render_threads: Number of poppler threads used to rasterize a PDF.
+        :param profile: Name of an entry in OCR_PROFILES, or "auto" to escalate through AUTO_PROFILE_LADDER.
+        :param min_confidence: Mean word confidence (0-100) below which "auto" re-OCRs a page with the next profile.
+        :param min_native_chars: Letters and digits a DOC/DOCX needs before its embedded text is trusted without OCR.
+        :param blank_stddev: Pages whose thumbnail has a lower grey level standard deviation are blank and not OCR'd.
         """
+        if profile != "auto" and profile not in OCR_PROFILES:
+            raise ValueError(f"Unknown OCR profile: {profile}")
+
         self.log = logger
         self.temp_dir = temp_dir
+        self.cache = cache
+        self.ocr_workers = max(1, ocr_workers)
+        self.render_threads = render_threads
+        self.profile = profile
+        self.min_confidence = min_confidence
+        self.min_native_chars = min_native_chars
+        self.blank_stddev = blank_stddev
+        self.docx_reader = DocxReader()
+
+        # Extractors by sniffed file format, a new format only needs an entry here
+        self.registry = FormatRegistry()
+        self.registry.register("pdf", self.pdf_to_text)
+        self.registry.register("docx", self.docx_to_text)
+        self.registry.register("doc", self.doc_to_text)
+        for image_format in ("png", "jpeg", "tiff"):
+            self.registry.register(image_format, self.image_file_to_text)
         os.makedirs(temp_dir, exist_ok=True)
 
-    def pdf_to_text(self, pdf_path):
+    def cache_key(self, data):
         """
-        Extracts text from a PDF file using OCR.
+        Cache key for a file: its content hash plus the extractor name, profile and version.
+        """
+        return TextCache.make_key(data, f"{type(self).__name__}:{self.profile}", self.EXTRACTOR_VERSION)
+
+    def prepare_image(self, image, profile):
+        """
+        Applies the greyscale conversion and binarization of a profile to a page image.
         
-        :param pdf_path: Path to the PDF file.
+        :param image: PIL image of the page.
+        :param profile: Entry of OCR_PROFILES.
+        :return: The prepared PIL image.
+        """
+        if profile["grayscale"] or profile["threshold"] is not None:
+            image = image.convert("L")
+
+        threshold = profile["threshold"]
+        if threshold == "otsu":
+            threshold = self._otsu_threshold(image)
+        if threshold is not None:
+            image = image.point(lambda value: 255 if value > threshold else 0)
+        return image
+
+    @staticmethod
+    def _otsu_threshold(image):
+        histogram = image.histogram()[:256]
+        total = sum(histogram)
+        weighted_total = sum(value * count for value, count in enumerate(histogram))
+
+        best_threshold, best_variance = 127, 0.0
+        background, weighted_background = 0, 0
+        for value, count in enumerate(histogram):
+            background += count
+            if background == 0:
+                continue
+            foreground = total - background
+            if foreground == 0:
+                break
+            weighted_background += value * count
+            mean_background = weighted_background / background
+            mean_foreground = (weighted_total - weighted_background) / foreground
+            variance = background * foreground * (mean_background - mean_foreground) ** 2
+            if variance > best_variance:
+                best_threshold, best_variance = value, variance
+        return best_threshold
+
+    def _tesseract_config(self, profile):
+        return f"--psm {profile['psm']} --oem {profile['oem']}"
+
+    def image_to_text(self, image, profile_name=None):
+        """
+        Runs tesseract on a single page image.
+        
+        :param image: PIL image of the page.
+        :param profile_name: Profile to apply, defaults to the processor's profile ("auto" uses its first step).
         :return: Extracted text as a string.
         """
+        profile_name = profile_name or self.profile
+        if profile_name == "auto":
+            profile_name = AUTO_PROFILE_LADDER[0]
+        profile = OCR_PROFILES[profile_name]
+        return pytesseract.image_to_string(self.prepare_image(image, profile), lang=profile["lang"], config=self._tesseract_config(profile))
+
+    def image_to_text_with_confidence(self, image, profile_name):
+        """
+        Runs tesseract on a single page image and also reports its mean word confidence.
+        
+        :param image: PIL image of the page.
+        :param profile_name: Name of an entry in OCR_PROFILES.
+        :return: (text, confidence) with confidence between 0 and 100, or None when no word was recognised.
+        """
+        profile = OCR_PROFILES[profile_name]
+        data = pytesseract.image_to_data(
+            self.prepare_image(image, profile),
+            lang=profile["lang"],
+            config=self._tesseract_config(profile),
+            output_type=pytesseract.Output.DICT,
+        )
+
+        # Rebuild the text line by line from the word boxes
+        lines = {}
+        confidences = []
+        for i, word in enumerate(data["text"]):
+            if not word.strip():
+                continue
+            line = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(line, []).append(word)
+            confidence = float(data["conf"][i])
+            if confidence >= 0:
+                confidences.append(confidence)
+
+        text = "\n".join(" ".join(words) for words in lines.values())
+        # No confidence at all rather than 0, ocr_pdf tells a blank page from a failed one
+        confidence = sum(confidences) / len(confidences) if confidences else None
+        return text, confidence
+
+    def is_blank(self, image, size=256):
+        """
+        Tells whether a page image is visually blank, from the grey level spread of a small thumbnail.
+        Averaging down to the thumbnail evens out scanner noise, while any line of text still shows.
+        """
+        thumbnail = image.convert("L")
+        thumbnail.thumbnail((size, size))
+        return ImageStat.Stat(thumbnail).stddev[0] < self.blank_stddev
+
+    def _ocr_page(self, task):
+        image, profile_name, with_confidence = task
+        start = time.perf_counter()
+        if self.is_blank(image):
+            return {"text": "", "confidence": None, "blank": True, "seconds": time.perf_counter() - start, "profile": profile_name}
+        if with_confidence:
+            text, confidence = self.image_to_text_with_confidence(image, profile_name)
+        else:
+            text, confidence = self.image_to_text(image, profile_name), None
+        return {"text": text, "confidence": confidence, "blank": False, "seconds": time.perf_counter() - start, "profile": profile_name}
+
+    def _map_pages(self, tasks):
+        if len(tasks) <= 1 or self.ocr_workers == 1:
+            return [self._ocr_page(task) for task in tasks]
+        with ThreadPoolExecutor(max_workers=min(self.ocr_workers, len(tasks))) as executor:
+            return list(executor.map(self._ocr_page, tasks))
+
+    def images_to_text(self, images):
+        """
+        OCRs page images on a bounded thread pool. tesseract runs as a subprocess, so threads are enough.
+        
+        :param images: PIL images of the pages, in page order.
+        :return: List of (text, seconds) per page, in page order.
+        """
+        results = self._map_pages([(image, None, False) for image in images])
+        return [(result["text"], result["seconds"]) for result in results]
+
+    def page_count(self, pdf_path=None, data=None):
+        """
+        Returns the number of pages of a PDF, read by poppler without rendering anything.
+        """
+        info = pdfinfo_from_bytes(data) if data is not None else pdfinfo_from_path(pdf_path)
+        return info["Pages"]
+
+    def render_pages(self, pdf_path=None, data=None, dpi=300, page_numbers=None):
+        """
+        Rasterizes PDF pages into memory.
+        
+        :param pdf_path: Path to the PDF file (ignored when data is given).
+        :param data: PDF bytes.
+        :param dpi: Rendering resolution.
+        :param page_numbers: 1-based page numbers to render, in ascending order, all pages if None.
+        :return: List of PIL images.
+        """
+        # Without an output folder pdf2image reads the rendered pages from poppler's stdout
+        def convert(**kwargs):
+            if data is not None:
+                return convert_from_bytes(data, dpi=dpi, thread_count=self.render_threads, **kwargs)
+            return convert_from_path(pdf_path, dpi=dpi, thread_count=self.render_threads, **kwargs)
+
+        if page_numbers is None:
+            return convert()
+
+        # One poppler call per run of consecutive pages
+        images = []
+        run = []
+        for number in list(page_numbers) + [None]:
+            if run and (number is None or number != run[-1] + 1):
+                images.extend(convert(first_page=run[0], last_page=run[-1]))
+                run = []
+            if number is not None:
+                run.append(number)
+        return images
+
+    def ocr_pdf(self, pdf_path=None, data=None, page_numbers=None):
+        """
+        OCRs the pages of a PDF with the processor's profile.
+
+        Pages are rendered and OCR'd in windows of ocr_workers pages, so only one window of
+        page images is in memory at a time, whatever the length of the PDF.
+
+        With the "auto" profile every page starts at the cheapest profile and only the
+        pages whose confidence stays under min_confidence are re-rendered and OCR'd
+        with the next profile of AUTO_PROFILE_LADDER, as are the pages where it found no
+        word at all. Only pages that are visually blank (see is_blank) are never OCR'd.
+        
+        :param pdf_path: Path to the PDF file (ignored when data is given).
+        :param data: PDF bytes.
+        :param page_numbers: 1-based page numbers to OCR, all pages if None.
+        :return: One dict per page, in page order, with the text, confidence (None without any word), whether
+            the page is blank, the profile used and seconds spent.
+        """
+        if page_numbers is None:
+            page_numbers = list(range(1, self.page_count(pdf_path, data) + 1))
+        page_numbers = sorted(page_numbers)
+
+        results = []
+        for start in range(0, len(page_numbers), self.ocr_workers):
+            results.extend(self._ocr_window(pdf_path, data, page_numbers[start:start + self.ocr_workers]))
+
+        for number, result in zip(page_numbers, results):
+            result["page"] = number
+        return results
+
+    def _ocr_window(self, pdf_path, data, page_numbers):
+        # Renders and OCRs a window of pages, escalating through the ladder in "auto"
+        ladder = AUTO_PROFILE_LADDER if self.profile == "auto" else [self.profile]
+        with_confidence = len(ladder) > 1
+
+        start = time.perf_counter()
+        images = self.render_pages(pdf_path, data, OCR_PROFILES[ladder[0]]["dpi"], page_numbers)
+        render_seconds = time.perf_counter() - start
+
+        results = self._map_pages([(image, ladder[0], with_confidence) for image in images])
+        for result in results:
+            result["render_seconds"] = render_seconds / max(1, len(images))
+        del images
+
+        for profile_name in ladder[1:]:
+            # No word at all is the worst result, unless there is nothing on the page
+            retry = [
+                i for i, result in enumerate(results)
+                if not result["blank"] and (result["confidence"] is None or result["confidence"] < self.min_confidence)
+            ]
+            if not retry:
+                break
+            self.log.debug(f"Re-OCR of pages {[page_numbers[i] for i in retry]} with profile {profile_name}")
+
+            start = time.perf_counter()
+            images = self.render_pages(pdf_path, data, OCR_PROFILES[profile_name]["dpi"], [page_numbers[i] for i in retry])
+            render_seconds = (time.perf_counter() - start) / len(retry)
+
+            for i, result in zip(retry, self._map_pages([(image, profile_name, True) for image in images])):
+                result["seconds"] += results[i]["seconds"]
+                result["render_seconds"] = results[i]["render_seconds"] + render_seconds
+                previous = results[i]["confidence"]
+                if result["confidence"] is not None and (previous is None or result["confidence"] >= previous):
+                    results[i] = result
+                else:
+                    results[i]["seconds"], results[i]["render_seconds"] = result["seconds"], result["render_seconds"]
+            del images
+
+        return results
+
+    def pdf_to_text_with_timings(self, pdf_path):
+        """
+        Extracts text from a PDF file using OCR, keeping the page images in memory.
+        
+        :param pdf_path: Path to the PDF file.
+        :return: (text, timings) where timings holds the rasterization time and the OCR time of every page.
+        """
         self.log.info(f"Extracting text from PDF: {pdf_path}")
         try:
-            # Convert PDF pages to images
-            pages = convert_from_path(pdf_path, dpi=300, fmt='png', output_folder=self.temp_dir, thread_count=4)
-            text = ""
-            for i, page in enumerate(pages):
-                image_path = os.path.join(self.temp_dir, f"page_{i}.png")
-                page.save(image_path, "PNG")
-                self.log.debug(f"Saved page {i} as image: {image_path}")
-                # Perform OCR on the image
-                extracted_text = pytesseract.image_to_string(Image.open(image_path))
-                self.log.debug(f"Extracted text from page {i}: {extracted_text[:100]}...")  # Log first 100 chars
-                text += extracted_text + "\n"
-                # Remove the temporary image
-                os.remove(image_path)
-                self.log.debug(f"Removed temporary image: {image_path}")
-            return text
+            results = self.ocr_pdf(pdf_path)
+            for result in results:
+                self.log.debug(f"OCR of page {result['page']} with {result['profile']} took {result['seconds']:.2f}s: {result['text'][:100]}...")  # Log first 100 chars
+
+            text = "".join(result["text"] + "\n" for result in results)
+            timings = {
+                "render": sum(result["render_seconds"] for result in results),
+                "pages": [result["seconds"] for result in results],
+            }
+            return text, timings
         except Exception as e:
             self.log.error(f"Error extracting text from PDF: {e}")
             raise e
 
+    def pdf_to_text(self, pdf_path):
+        """
+        Extracts text from a PDF file using OCR.
+        
+        :param pdf_path: Path to the PDF file.
+        :return: Extracted text as a string.
+        """
+        text, timings = self.pdf_to_text_with_timings(pdf_path)
+        self.log.info(f"OCR of {pdf_path}: rendered in {timings['render']:.2f}s, pages took {[round(t, 2) for t in timings['pages']]}s")
+        return text
+
+    def docx_native_text(self, docx_path):
+        """
+        Reads the text stored in a DOCX file: body paragraphs, tables, text boxes, headers and footers.
+        
+        :param docx_path: Path to the DOCX file.
+        :return: (text, images) where images holds the bytes of every embedded image.
+        """
+        return self.docx_reader.read(docx_path), self.docx_reader.images(docx_path)
+
+    def _has_native_text(self, text):
+        return sum(char.isalnum() for char in text) >= self.min_native_chars
+
     def docx_to_text(self, docx_path):
         """
-        Extracts text from a DOCX file by converting it to PDF first and then using OCR.
+        Extracts text from a DOCX file without converting it. Embedded images are only OCR'd
+        when the document has no usable text of its own (e.g. a scanned resume pasted into Word).
         
         :param docx_path: Path to the DOCX file.
         :return: Extracted text as a string.
         """
         self.log.info(f"Extracting text from DOCX: {docx_path}")
         try:
-            # Convert DOCX to PDF
-            pdf_path = os.path.join(self.temp_dir, f"{os.path.splitext(os.path.basename(docx_path))[0]}.pdf")
-            docx2pdf_convert(docx_path, pdf_path)
-            self.log.debug(f"Converted DOCX to PDF: {pdf_path}")
-            # Use PDF to text extraction
-            text = self.pdf_to_text(pdf_path)
-            # Remove the temporary PDF
-            os.remove(pdf_path)
-            self.log.debug(f"Removed temporary PDF: {pdf_path}")
-            return text
+            text, images = self.docx_native_text(docx_path)
+            if self._has_native_text(text) or not images:
+                return text
+
+            images = self.decode_images(images)
+            if not images:
+                return text
+            self.log.debug(f"DOCX has no usable text, running OCR on {len(images)} embedded images")
+            ocr_text = "\n".join(page_text for page_text, _ in self.images_to_text(images))
+            return f"{text}\n{ocr_text}" if text else ocr_text
         except Exception as e:
             self.log.error(f"Error extracting text from DOCX: {e}")
             raise e
 
+    def decode_images(self, images):
+        """
+        Decodes embedded image bytes, skipping the ones PIL cannot rasterize (e.g. the EMF/WMF drawings Word embeds).
+
+        :param images: Image file contents.
+        :return: List of loaded PIL images.
+        """
+        decoded = []
+        for data in images:
+            try:
+                image = Image.open(io.BytesIO(data))
+                image.load()
+            except Exception as e:
+                # PIL reports unsupported and malformed images with many exception types
+                self.log.debug(f"Skipped an embedded image that cannot be decoded: {e}")
+                continue
+            decoded.append(image)
+        return decoded
+
     def doc_to_text(self, doc_path):
         """
-        Extracts text from a DOC file by converting it to PDF first and then using OCR.
+        Extracts text from a DOC file with Spire.Doc. Only when the document has no usable text
+        of its own is it rendered to PDF (in memory, by Spire) and OCR'd.
         
         :param doc_path: Path to the DOC file.
         :return: Extracted text as a string.
         """
         self.log.info(f"Extracting text from DOC: {doc_path}")
         try:
-            # Convert DOC to PDF using docx2pdf (requires LibreOffice on macOS/Linux)
-            pdf_path = os.path.join(self.temp_dir, f"{os.path.splitext(os.path.basename(doc_path))[0]}.pdf")
-            docx2pdf_convert(doc_path, pdf_path)
-            self.log.debug(f"Converted DOC to PDF: {pdf_path}")
-            # Use PDF to text extraction
-            text = self.pdf_to_text(pdf_path)
-            # Remove the temporary PDF
-            os.remove(pdf_path)
-            self.log.debug(f"Removed temporary PDF: {pdf_path}")
-            return text
+            doc = SpireDoc(doc_path)
+            text = doc.GetText().replace(SPIRE_EVALUATION_WARNING, " ").strip()
+            if self._has_native_text(text):
+                return text
+
+            self.log.debug("DOC has no usable text, rendering it to PDF for OCR")
+            stream = Stream()
+            doc.SaveToStream(stream, FileFormat.PDF)
+            return "".join(result["text"] + "\n" for result in self.ocr_pdf(data=bytes(stream.ToArray())))
         except Exception as e:
             self.log.error(f"Error extracting text from DOC: {e}")
             raise e
 
+    def converted_to_text(self, file_path):
+        """
+        Previous DOC/DOCX path: converts the document to PDF with docx2pdf (needs Word or LibreOffice)
+        and OCRs every page. Kept for benchmarking against the native readers.
+        
+        :param file_path: Path to the DOC or DOCX file.
+        :return: Extracted text as a string.
+        """
+        pdf_path = os.path.join(self.temp_dir, f"{uuid.uuid4()}.pdf")
+        try:
+            docx2pdf_convert(file_path, pdf_path)
+            return self.pdf_to_text(pdf_path)
+        finally:
+            if os.path.exists(pdf_path):
+                os.remove(pdf_path)
+
+    def image_file_to_text(self, image_path):
+        """
+        Extracts text from a scanned resume saved as an image (PNG, JPEG, TIFF).
+        
+        :param image_path: Path to the image file.
+        :return: Extracted text as a string.
+        """
+        self.log.info(f"Extracting text from image: {image_path}")
+        with Image.open(image_path) as image:
+            return self.image_to_text(image)
+
     def extract_text(self, file_path):
         """
-        Extracts text from .pdf, .docx, and .doc files using OCR.
+        Extracts text from any format registered in self.registry. PDFs and images are OCR'd,
+        DOC and DOCX files are read natively and only fall back to OCR when they carry no text.
+        The format is sniffed from the file contents, the extension is not trusted.
         
         :param file_path: Path to the file.
         :return: Extracted text as a string.
         """
         self.log.info(f"Starting text extraction for file: {file_path}")
-        file_extension = os.path.splitext(file_path)[1].lower()
-        text = ""
-
-        if file_extension == ".pdf":
-            text = self.pdf_to_text(file_path)
-        elif file_extension == ".docx":
-            text = self.docx_to_text(file_path)
-        elif file_extension == ".doc":
-            text = self.doc_to_text(file_path)
+        with open(file_path, 'rb') as f:
+            data = f.read()
+
+        try:
+            _, extractor = self.registry.resolve(data, file_path)
+        except UnsupportedFormatError as e:
+            self.log.error(f"Rejected {file_path}: {e}")
+            raise
+
+        if self.cache is None:
+            return self._extract_text(extractor, file_path)
+
+        key = self.cache_key(data)
+        text = self.cache.get(key)
+        if text is None:
+            text = self._extract_text(extractor, file_path)
+            if text:
+                self.cache.set(key, text)
         else:
-            self.log.error(f"Unsupported file format: {file_path}")
-            raise ValueError(f"Unsupported file format: {file_extension}")
+            self.log.info(f"Using cached text for file: {file_path}")
+        return text
+
+    def _extract_text(self, extractor, file_path):
+        text = extractor(file_path)
 
         # Clean up the text if needed
         text = self.postprocess_text(text)
@@ -0,0 +1,121 @@
+import io
+import shutil
+import subprocess
+
+from PyPDF2 import PdfReader
+
+
+def _pypdf2_pages(data):
+    return [page.extract_text() or "" for page in PdfReader(io.BytesIO(data)).pages]
+
+
+def _pdftotext_pages(data, timeout=60):
+    # poppler is already installed for pdf2image; -layout keeps multi-column resumes readable
+    if shutil.which("pdftotext") is None:
+        raise FileNotFoundError("pdftotext is not installed")
+    result = subprocess.run(
+        ["pdftotext", "-layout", "-enc", "UTF-8", "-", "-"],
+        input=data,
+        capture_output=True,
+        timeout=timeout,
+        check=True,
+    )
+    return _split_pages(result.stdout.decode("utf-8", errors="replace"))
+
+
+def _pdfminer_pages(data):
+    from pdfminer.high_level import extract_text
+    return _split_pages(extract_text(io.BytesIO(data)))
+
+
+def _split_pages(text):
+    # Both pdftotext and pdfminer end every page with a form feed
+    pages = text.split("\f")
+    if pages and not pages[-1].strip():
+        pages.pop()
+    return pages
+
+
+# Registered PDF text backends: name -> function(pdf bytes) returning the text of every page
+PDF_BACKENDS = {
+    "pypdf2": _pypdf2_pages,
+    "pdftotext": _pdftotext_pages,
+    "pdfminer": _pdfminer_pages,
+}
+
+DEFAULT_PDF_BACKENDS = ("pdftotext", "pypdf2")
+
+
+def register_pdf_backend(name, pages_function):
+    """
+    Registers a PDF text backend.
+
+    :param name: Name used to select the backend.
+    :param pages_function: Function taking the PDF bytes and returning a list with the text of every page.
+    """
+    PDF_BACKENDS[name] = pages_function
+
+
+def available_pdf_backends():
+    """
+    Returns the names of the registered backends that can run in this environment.
+    """
+    available = []
+    for name in PDF_BACKENDS:
+        if name == "pdftotext" and shutil.which("pdftotext") is None:
+            continue
+        if name == "pdfminer":
+            try:
+                import pdfminer  # noqa: F401
+            except ImportError:
+                continue
+        available.append(name)
+    return available
+
+
+class PDFTextExtractor:
+    def __init__(self, logger, backends=DEFAULT_PDF_BACKENDS):
+        """
+        Extracts PDF text with the first backend of a preference list that succeeds.
+
+        :param logger: Logger instance to log information.
+        :param backends: Backend names from PDF_BACKENDS, in order of preference.
+        """
+        self.log = logger
+        self.backends = tuple(backends)
+
+    def extract_pages(self, source, backends=None):
+        """
+        Extracts the text of every page, falling back to the next backend when one fails.
+
+        :param source: Path to the PDF file, a binary file object or the PDF bytes.
+        :param backends: Overrides the configured preference list for this call.
+        :return: (pages, name of the backend that produced them)
+        """
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                data = f.read()
+        elif isinstance(source, bytes):
+            data = source
+        else:
+            data = source.getvalue()
+
+        errors = []
+        for name in backends or self.backends:
+            if name not in PDF_BACKENDS:
+                errors.append(f"{name}: unknown backend")
+                continue
+            try:
+                return PDF_BACKENDS[name](data), name
+            except Exception as e:
+                self.log.debug(f"PDF backend {name} failed, trying the next one: {e}")
+                errors.append(f"{name}: {e}")
+
+        raise RuntimeError(f"All PDF backends failed ({'; '.join(errors)})")
+
+    def extract_text(self, source, backends=None):
+        """
+        Extracts the text of a PDF, see extract_pages.
+        """
+        pages, _ = self.extract_pages(source, backends)
+        return "\n".join(pages)
@@ -0,0 +1,75 @@
+import io
+import csv
+
+from .MongoJSON import dumps
+
+# Export formats and their media types
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# One row per resume, lists are joined with "; "
+CSV_COLUMNS = ["_id", "name", "emails", "phones", "Designation", "Location", "education", "Companies worked at",
+               "Graduation Year", "skills"]
+
+# Lines are sent in chunks of about this size rather than one write per resume
+CHUNK_BYTES = 64 * 1024
+
+
+def _chunks(lines):
+    # Joins the encoded lines into chunks of about CHUNK_BYTES
+    buffer, size = [], 0
+    for data in lines:
+        buffer.append(data)
+        size += len(data)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def ndjson_lines(documents):
+    """
+    Yields one encoded JSON line per document, see MongoJSON.dumps.
+    """
+    for document in documents:
+        yield dumps(document) + b"\n"
+
+
+def csv_lines(documents, columns=CSV_COLUMNS):
+    """
+    Yields the encoded CSV header and then one line per document.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for document in documents:
+        row = []
+        for column in columns:
+            value = document.get(column)
+            if isinstance(value, list):
+                value = "; ".join(str(item) for item in value)
+            row.append("" if value is None else str(value))
+        writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Only the header when there are no documents
+    yield buffer.getvalue().encode("utf-8")
+
+
+def export(documents, export_format):
+    """
+    Encodes documents as they are read, for a streaming response. Nothing but the current chunk is held.
+
+    :param documents: Iterable of resumes, e.g. ResumeSearch.iter_documents.
+    :param export_format: One of EXPORT_FORMATS.
+    :return: Iterator of bytes chunks.
+    """
+    if export_format == "ndjson":
+        return _chunks(ndjson_lines(documents))
+    if export_format == "csv":
+        return _chunks(csv_lines(documents))
+    raise ValueError(f"Unknown export format: {export_format}. Available: {', '.join(EXPORT_FORMATS)}")
@@ -1,14 +1,98 @@
+import io
 import os
+import time
+import logging
 import zipfile
-from PyPDF2 import PdfReader
-from docx import Document
-from spire.doc import Document as SpireDoc
+import collections
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from spire.doc import Document as SpireDoc, FileFormat
+from spire.doc.common import Stream
 import nltk
 
+from .ZipIngestor import ZipIngestor, ZipLimitError
+from .DocxReader import DocxReader
+from .PDFBackends import PDFTextExtractor, DEFAULT_PDF_BACKENDS
+from .FormatRegistry import FormatRegistry, UnsupportedFormatError, sniff_format
+from .TextCache import TextCache
+
+# Processor owned by a pool worker process, created once by _init_worker
+_worker_processor = None
+
+
+def _init_worker(processor_cls, processor_kwargs):
+    global _worker_processor
+    logging.basicConfig(level=logging.INFO)
+    _worker_processor = processor_cls(logging.getLogger(processor_cls.__name__), **processor_kwargs)
+
+
+def _extract_chunk(cv_files):
+    """
+    Runs inside a pool worker. Returns a (text, error) pair for every file in the chunk.
+    """
+    results = []
+    for cv_file in cv_files:
+        try:
+            results.append((_worker_processor.extract_item(cv_file), None))
+        except Exception as e:
+            results.append(("", f"{type(e).__name__}: {e}"))
+    return results
+
+
 class ResumeProcessor:
-    def __init__(self, logger, preprocess=False):
+    # Bump whenever the extracted text changes so cached entries are not reused
+    EXTRACTOR_VERSION = "3"
+
+    def __init__(self, logger, preprocess=False, workers=None, chunk_size=1, timeout=120, zip_ingestor=None, cache=None, pdf_backends=DEFAULT_PDF_BACKENDS,
+                 max_inflight_bytes=64 * 1024 * 1024):
+        """
+        :param logger: Logger instance to log information.
+        :param preprocess: Tokenize and lemmatize the extracted text.
+        :param workers: Number of worker processes for bulk extraction (defaults to the CPU count).
+        :param chunk_size: Number of files handed to a worker at a time.
+        :param timeout: Seconds a worker gets for a single file before it is recorded as failed and the worker replaced (None waits forever).
+        :param zip_ingestor: ZipIngestor used for bulk uploads, carrying the archive size limits.
+        :param cache: Optional TextCache, files with identical bytes are then only extracted once.
+        :param pdf_backends: PDF text backends (see PDFBackends.PDF_BACKENDS) tried in order until one succeeds.
+        :param max_inflight_bytes: Bytes of file contents bulk extraction queues for the pool at most.
+        """
         self.log = logger
         self.preprocess = preprocess
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.timeout = timeout
+        self.max_inflight_bytes = max_inflight_bytes
+        # Every member is read, iter_zip_cvs keeps the ones of a registered format
+        self.zip_ingestor = zip_ingestor or ZipIngestor(logger, extensions=None)
+        self.cache = cache
+        self.docx_reader = DocxReader()
+        self.pdf_extractor = PDFTextExtractor(logger, pdf_backends)
+
+        # Extractors by sniffed file format, a new format only needs an entry here
+        self.registry = FormatRegistry()
+        self.registry.register("pdf", self._extract_from_pdf)
+        self.registry.register("docx", self._extract_from_docx)
+        self.registry.register("doc", self._extract_from_doc)
+        self.registry.register("txt", self._extract_from_txt)
+
+    def _worker_kwargs(self):
+        """
+        Constructor arguments used to rebuild this processor inside pool workers.
+        """
+        return {"preprocess": self.preprocess, "pdf_backends": self.pdf_extractor.backends}
+
+    def extractor_name(self, pdf_backends=None):
+        """
+        Name of this extractor and the options that change its output, used in cache keys.
+        """
+        backends = ",".join(pdf_backends or self.pdf_extractor.backends)
+        return type(self).__name__ + ("+preprocess" if self.preprocess else "") + f"+pdf:{backends}"
+
+    def cache_key(self, data, pdf_backends=None):
+        """
+        Cache key for a file: its content hash plus the extractor name and version.
+        """
+        return TextCache.make_key(data, self.extractor_name(pdf_backends), self.EXTRACTOR_VERSION)
 
     def preprocess_text(self, text):
         """
@@ -26,49 +110,69 @@ class ResumeProcessor:
         # Join the tokens back into a string
         return " ".join(tokens)
 
-    def extract_text(self, cv_path):
+    def extract_text(self, cv_path, data=None, pdf_backends=None):
         """
-        Extract text from .pdf, .docx, and .doc files.
+        Extract text from any format registered in self.registry (PDF, DOCX, DOC and plain text).
+        The format is sniffed from the file contents, the extension is not trusted.
+
+        When data is given it holds the file contents and cv_path is only used as its name.
+        pdf_backends overrides the configured PDF backends for this call.
         """
-        file_extension = os.path.splitext(cv_path)[1].lower()
-        text = ""
+        if data is None:
+            with open(cv_path, 'rb') as f:
+                data = f.read()
 
-        if file_extension == ".pdf":
-            text = self._extract_from_pdf(cv_path)
-        elif file_extension == ".docx":
-            text = self._extract_from_docx(cv_path)
-        elif file_extension == ".doc":
-            text = self._extract_from_doc(cv_path)
-        else:
-            self.log.error(f"Unsupported file format: {cv_path}")
-            raise ValueError(f"Unsupported file format: {file_extension}")
+        try:
+            file_format, extractor = self.registry.resolve(data, cv_path)
+        except UnsupportedFormatError as e:
+            self.log.error(f"Rejected {cv_path}: {e}")
+            raise
+
+        if self.cache is None:
+            return self._extract_text(extractor, cv_path, data, pdf_backends)
+
+        key = self.cache_key(data, pdf_backends)
+        text = self.cache.get(key)
+        if text is None:
+            text = self._extract_text(extractor, cv_path, data, pdf_backends)
+            # Failed extractions come back empty, keep them out of the cache
+            if text:
+                self.cache.set(key, text)
+        return text
 
+    def _extract_text(self, extractor, cv_path, data, pdf_backends=None):
+        text = extractor(io.BytesIO(data), cv_path, pdf_backends=pdf_backends)
         return self.preprocess_text(text) if self.preprocess else text
 
-    def _extract_from_pdf(self, cv_path):
+    def extract_item(self, item):
+        """
+        Extracts text from a file path or a (name, data) pair as produced by ZipIngestor.
+        """
+        if isinstance(item, tuple):
+            return self.extract_text(*item)
+        return self.extract_text(item)
+
+    def _extract_from_pdf(self, source, cv_path, pdf_backends=None, **options):
         text = ""
         try:
-            with open(cv_path, 'rb') as f:
-                reader = PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text()
+            text = self.pdf_extractor.extract_text(source, pdf_backends)
         except Exception as e:
             self.log.exception(f"Error reading PDF {cv_path}: {e}", exc_info=True)
         return text
 
-    def _extract_from_docx(self, cv_path):
+    def _extract_from_docx(self, source, cv_path, **options):
         text = ""
         try:
-            doc = Document(cv_path)
-            text = "\n".join([paragraph.text.strip() for paragraph in doc.paragraphs])
+            text = self.docx_reader.read(source)
         except Exception as e:
             self.log.exception(f"Error reading DOCX {cv_path}: {e}", exc_info=True)
         return text
 
-    def _extract_from_doc(self, cv_path):
+    def _extract_from_doc(self, source, cv_path, **options):
         text = ""
         try:
-            doc = SpireDoc(cv_path)
+            doc = SpireDoc()
+            doc.LoadFromStream(Stream(source.getvalue()), FileFormat.Doc)
             text = doc.GetText()
             part_a, part_b = text.split("Evaluation Warning: The document was created with Spire.Doc for Python.")
             return part_a + " " + part_b
@@ -76,6 +180,9 @@ class ResumeProcessor:
             self.log.exception(f"Error reading DOC {cv_path}: {e}", exc_info=True)
         return text
 
+    def _extract_from_txt(self, source, cv_path, **options):
+        return source.getvalue().decode("utf-8-sig", errors="replace")
+
     def find_cvs(self, directory):
         """
         Finds all CV files (PDF, DOC, DOCX) in the directory.
@@ -92,31 +199,198 @@ class ResumeProcessor:
             self.log.exception(f"Error finding CVs in directory {directory}: {e}", exc_info=True)
         return cv_files
 
-    def process_bulk_cvs(self, directory, zip_file=False):
+    def extract_bulk(self, cv_files):
+        """
+        Extracts text from many CV files in parallel using a process pool.
+        Items are file paths or (name, data) pairs (see extract_item), from any iterable:
+        they are read as the pool needs them, and reading stops while max_inflight_bytes
+        of file contents are waiting for or in a worker, so a ZIP is never held in memory as a whole.
+
+        Returns one record per file, in input order: {"file", "text", "error"}.
+        A file that raises gets an empty text and an error message instead of failing the
+        whole batch. Every chunk has its own deadline, timeout seconds per file from when a
+        worker took it: a chunk past it is recorded as timed out and the pool is replaced.
+        When a worker dies (e.g. a native crash in a reader), the chunks it may have been
+        running are retried one at a time, so only the file that crashes is recorded as failed.
+        Files already in the cache are answered here and never reach the pool.
+        """
+        records = []
+        keys = {}
+        workers = self.workers or os.cpu_count() or 1
+        items = enumerate(cv_files)
+        exhausted = False
+
+        ready = collections.deque()     # chunks read and waiting for a worker: (indices, items, bytes)
+        isolated = collections.deque()  # chunks that were running when a worker died, retried alone
+        running = {}                    # future -> (chunk, deadline, alone)
+        inflight = 0
+        executor = None
+
+        def read_chunk():
+            indices, chunk_items, size = [], [], 0
+            for index, cv_file in items:
+                records.append(None)
+                name, data = cv_file if isinstance(cv_file, tuple) else (cv_file, None)
+                if self.cache is not None:
+                    if data is None:
+                        with open(name, 'rb') as f:
+                            data = f.read()
+                    keys[index] = self.cache_key(data)
+                    text = self.cache.get(keys[index])
+                    if text is not None:
+                        records[index] = {"file": name, "text": text, "error": None}
+                        continue
+
+                indices.append(index)
+                chunk_items.append(cv_file)
+                # Paths are read by the workers, only the bytes of (name, data) items go through the pool
+                size += len(cv_file[1]) if isinstance(cv_file, tuple) else 0
+                if len(indices) >= self.chunk_size:
+                    break
+            return (indices, chunk_items, size) if indices else None
+
+        def record(chunk, outcomes):
+            nonlocal inflight
+            indices, chunk_items, size = chunk
+            inflight -= size
+            for index, item, (text, error) in zip(indices, chunk_items, outcomes):
+                name = item[0] if isinstance(item, tuple) else item
+                if error:
+                    self.log.error(f"Error extracting {name}: {error}")
+                elif text and index in keys:
+                    self.cache.set(keys[index], text)
+                records[index] = {"file": name, "text": text, "error": error}
+
+        def fail(chunk, error):
+            record(chunk, [("", error)] * len(chunk[0]))
+
+        def submit(chunk, alone):
+            deadline = time.monotonic() + self.timeout * len(chunk[0]) if self.timeout else None
+            running[executor.submit(_extract_chunk, chunk[1])] = (chunk, deadline, alone)
+
+        try:
+            while True:
+                # Read ahead, a chunk per idle worker, within the byte budget
+                while not exhausted and len(ready) < workers and inflight <= self.max_inflight_bytes:
+                    chunk = read_chunk()
+                    if chunk is None:
+                        exhausted = True
+                    else:
+                        ready.append(chunk)
+                        inflight += chunk[2]
+
+                if executor is None and (ready or isolated):
+                    executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(type(self), self._worker_kwargs()))
+                # No more chunks than workers are submitted, so a chunk starts as soon as it is submitted
+                if isolated:
+                    if not running:
+                        submit(isolated.popleft(), alone=True)
+                else:
+                    while ready and len(running) < workers:
+                        submit(ready.popleft(), alone=False)
+                if not running:
+                    break
+
+                deadlines = [deadline for _, deadline, _ in running.values() if deadline is not None]
+                timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = wait(running, timeout, return_when=FIRST_COMPLETED)
+
+                broken = False
+                for future in done:
+                    chunk, _, alone = running.pop(future)
+                    try:
+                        record(chunk, future.result())
+                    except BrokenProcessPool:
+                        broken = True
+                        if alone:
+                            fail(chunk, "Worker process died while extracting this file")
+                        else:
+                            isolated.append(chunk)
+                    except Exception as e:
+                        fail(chunk, f"{type(e).__name__}: {e}")
+
+                now = time.monotonic()
+                expired = [future for future, (_, deadline, _) in running.items() if deadline is not None and deadline <= now]
+                for future in expired:
+                    fail(running.pop(future)[0], f"Timed out after {self.timeout}s")
+
+                if broken or expired:
+                    # A stuck or dead worker takes the pool with it: the chunks still running start over on a new one
+                    for future, (chunk, _, alone) in running.items():
+                        if future.done() and future.exception() is None:
+                            record(chunk, future.result())
+                        elif broken:
+                            isolated.append(chunk)
+                        else:
+                            (isolated if alone else ready).appendleft(chunk)
+                    running.clear()
+                    self._stop_executor(executor)
+                    executor = None
+        finally:
+            if executor is not None:
+                self._stop_executor(executor)
+
+        return records
+
+    @staticmethod
+    def _stop_executor(executor):
+        # ProcessPoolExecutor cannot stop a busy worker, so its processes are terminated
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+    def iter_zip_cvs(self, zip_source):
+        """
+        Yields (name, data) for the members of a ZIP archive this processor can read. Members are
+        selected by their sniffed format, not their extension; the others are skipped. Members that
+        look corrupt are kept, extracting them reports the error.
+
+        :param zip_source: Path to the ZIP file or a binary file object.
+        """
+        formats = set(self.registry.formats())
+        for name, data in self.zip_ingestor.iter_members(zip_source):
+            try:
+                file_format = sniff_format(data)
+            except UnsupportedFormatError:
+                yield name, data
+                continue
+            if file_format in formats:
+                yield name, data
+            else:
+                self.log.info(f"Skipped {name} in ZIP: {file_format or 'unknown'} format")
+
+    def process_bulk_cvs(self, directory, zip_file=False, parallel=False):
         """
         Reads and extracts text from multiple CV files in a given directory or ZIP file.
+        ZIP members are read in memory one at a time, as extraction needs them, and never written to disk.
+        With parallel=True the files are spread over a process pool (see extract_bulk).
 
         Returns an array of texts for all CVs.
         """
-        # Handle ZIP file extraction
         if zip_file:
-            try:
-                with zipfile.ZipFile(directory, 'r') as zip_ref:
-                    temp_dir = os.path.join(os.getcwd(), '.temp_extract')
-                    os.makedirs(temp_dir, exist_ok=True)
-                    zip_ref.extractall(temp_dir)
-                    directory = temp_dir
-            except Exception as e:
-                self.log.exception(f"Error extracting ZIP file: {e}", exc_info=True)
-                return []
-
-        # Find all CVs in the directory
-        cv_files = self.find_cvs(directory)
-        all_texts = []
-
-        # Extract text from each CV
-        for cv_file in cv_files:
-            text = self.extract_text(cv_file)
-            all_texts.append(text)
-
-        return all_texts
+            cv_files = self.iter_zip_cvs(directory)
+        else:
+            # Find all CVs in the directory
+            cv_files = self.find_cvs(directory)
+
+        try:
+            if parallel:
+                return [record["text"] for record in self.extract_bulk(cv_files)]
+
+            all_texts = []
+
+            # Extract text from each CV, a file of an unsupported format counts as empty like in extract_bulk
+            for cv_file in cv_files:
+                try:
+                    text = self.extract_item(cv_file)
+                except UnsupportedFormatError:
+                    text = ""
+                all_texts.append(text)
+
+            return all_texts
+        except (zipfile.BadZipFile, ZipLimitError) as e:
+            self.log.exception(f"Error reading ZIP file: {e}", exc_info=True)
+            return []
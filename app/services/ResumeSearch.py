@@ -0,0 +1,301 @@
+import re
+import logging
+import argparse
+import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+from .MongoWriter import MongoWriter
+from .SkillAggregator import SkillAggregator
+
+# All batches share one collection, every resume carries the batch_id of its upload
+RESUMES_COLLECTION = "resumes"
+
+# Fields added to every saved resume so each filter is an equality match on a multikey index.
+# MongoDB cannot put two array fields in one index, so every field has its own, behind batch_id.
+SEARCH_FIELDS = ["skills", "skill_categories", "location_terms", "education_terms"]
+
+# What the candidate list needs, entity_sources and the per-category lists stay in the collection
+LIST_PROJECTION = {"name": 1, "emails": 1, "phones": 1, "Designation": 1, "Location": 1, "education": 1, "skills": 1}
+
+# Everything but the storage and search fields, for exports
+EXPORT_PROJECTION = {"batch_id": 0, "saved_at": 0, "skill_categories": 0, "location_terms": 0, "education_terms": 0}
+
+# Names of the per-upload collections batches used to be saved to, see migrate
+LEGACY_COLLECTION = re.compile(r"^[A-Z0-9]{10}$")
+
+TTL_INDEX = "ttl_saved_at"
+DUPLICATE_KEY = 11000
+
+MAX_PAGE_SIZE = 100
+
+_TERM = re.compile(r"[a-z0-9]+")
+
+
+def terms(values):
+    """
+    Returns the unique lowercase words of the values, in order.
+    """
+    found = {}
+    for value in values or []:
+        for term in _TERM.findall(str(value).lower()):
+            found.setdefault(term, None)
+    return list(found)
+
+
+class ResumeSearch:
+    def __init__(self, logger, db, taxonomy, collection_name=RESUMES_COLLECTION, ttl_seconds=None):
+        """
+        Stores the resumes of every batch in one collection and filters them in MongoDB, so the browser
+        only receives the page it shows.
+
+        Resumes are saved with their batch_id and flattened search fields (see document). Every index starts
+        with batch_id, so a batch is read like its own collection used to be. Skills and categories are
+        matched exactly, locations and schools by their words.
+
+        :param logger: Logger instance to log information.
+        :param db: The MongoDB database the resumes are saved in.
+        :param taxonomy: The SkillTaxonomy, its categories are the skill fields of a resume.
+        :param collection_name: Name of the resumes collection.
+        :param ttl_seconds: Resumes are deleted by MongoDB this long after they were saved. Defaults to None,
+            which leaves the TTL index as it is: resumes are kept unless an earlier run set a TTL.
+        """
+        self.log = logger
+        self.db = db
+        self.taxonomy = taxonomy
+        self.collection = db[collection_name]
+        self.ttl_seconds = ttl_seconds
+        self._indexed = False
+
+    def search_fields(self, entities):
+        """
+        Computes the search fields of extracted entities.
+
+        :param entities: The entities of a resume, as returned by NERProcessor.extract_all_entities.
+        :return: Dictionary with skills (every canonical skill ID), skill_categories (the categories with a match),
+            location_terms and education_terms (the words of the locations and of the schools).
+        """
+        skills, skill_categories = [], []
+        for category in self.taxonomy.categories:
+            matched = entities.get(category) or []
+            if matched:
+                skill_categories.append(category)
+            skills.extend(skill for skill in matched if skill not in skills)
+        return {
+            "skills": skills,
+            "skill_categories": skill_categories,
+            "location_terms": terms(entities.get("Location")),
+            "education_terms": terms(entities.get("education")),
+        }
+
+    def document(self, entities, batch_id, saved_at=None):
+        """
+        Returns the document to save for a resume: its entities, its batch, when it was saved and its search fields.
+        """
+        return {
+            **entities,
+            "batch_id": batch_id,
+            "saved_at": saved_at or datetime.datetime.utcnow(),
+            **self.search_fields(entities),
+        }
+
+    def ensure_indexes(self):
+        """
+        Creates the indexes of the resumes collection, once per process: batch_id with _id for reading a batch
+        in order, batch_id with each search field and _id for the filters, and the TTL index on saved_at
+        when ttl_seconds is set. A changed TTL is applied to the existing index. An unset one leaves the index
+        alone, so a process started without the setting never lifts the expiry another one configured.
+        """
+        if self._indexed:
+            return
+        self.collection.create_index([("batch_id", ASCENDING), ("_id", ASCENDING)], name="batch")
+        for field in SEARCH_FIELDS:
+            self.collection.create_index(
+                [("batch_id", ASCENDING), (field, ASCENDING), ("_id", ASCENDING)], name=f"batch_{field}"
+            )
+
+        if self.ttl_seconds is not None:
+            ttl_index = self.collection.index_information().get(TTL_INDEX)
+            if ttl_index is None:
+                self.collection.create_index("saved_at", name=TTL_INDEX, expireAfterSeconds=self.ttl_seconds)
+            elif ttl_index.get("expireAfterSeconds") != self.ttl_seconds:
+                self.db.command("collMod", self.collection.name, index={"name": TTL_INDEX, "expireAfterSeconds": self.ttl_seconds})
+
+        self._indexed = True
+        self.log.info(f"Indexes ready on '{self.collection.name}' (TTL: {self.ttl_seconds or 'unchanged'})")
+
+    def writer(self, chunk_size=500):
+        """
+        Returns a MongoWriter into the resumes collection, making sure the indexes exist first.
+        """
+        self.ensure_indexes()
+        return MongoWriter(self.log, self.collection, chunk_size=chunk_size)
+
+    @staticmethod
+    def build_filter(skills=(), categories=(), locations=(), education=()):
+        """
+        Translates the filters into a MongoDB query. Every filter must hold: all the skills, at least one skill
+        in each category, and all the words of each location and education value.
+
+        :param skills: Canonical skill IDs.
+        :param categories: Skill categories.
+        :param locations: Locations, e.g. "Bangalore".
+        :param education: Schools or parts of their names, e.g. "institute of technology".
+        :return: The query document.
+        """
+        query = {}
+        if skills:
+            query["skills"] = {"$all": [skill.lower() for skill in skills]}
+        if categories:
+            query["skill_categories"] = {"$all": list(categories)}
+        for field, values in (("location_terms", locations), ("education_terms", education)):
+            words = terms(values)
+            if words:
+                query[field] = {"$all": words}
+        return query
+
+    @staticmethod
+    def after(query, cursor):
+        """
+        Restricts a query to the resumes after a keyset cursor, the _id of the last resume already read.
+
+        :raises bson.errors.InvalidId: If the cursor is not an ObjectId string.
+        """
+        if not cursor:
+            return query
+        return {**query, "_id": {"$gt": ObjectId(cursor)}}
+
+    def query(self, batch_id, skills=(), categories=(), locations=(), education=(), page=1, page_size=50, after=None):
+        """
+        Returns one page of the resumes of a batch matching the filters, see build_filter.
+
+        :param batch_id: The batch.
+        :param page: Page number, from 1. Ignored when after is given.
+        :param page_size: Resumes per page, at most MAX_PAGE_SIZE.
+        :param after: Keyset cursor, the "next" value of the previous page. Unlike page, reading from a cursor
+            costs the same on every page instead of skipping all the resumes before it.
+        :return: Dictionary with the total number of matches, the page, the page size, the projected resumes
+            of the page in insertion order with their _id as a string, and the cursor of the next page
+            (None on the last one).
+        """
+        page = 1 if after else max(page, 1)
+        page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+        query = {"batch_id": batch_id, **self.build_filter(skills, categories, locations, education)}
+
+        cursor = (
+            self.collection.find(self.after(query, after), LIST_PROJECTION)
+            .sort("_id", ASCENDING)
+            .skip((page - 1) * page_size)
+            .limit(page_size)
+        )
+        results = []
+        for resume in cursor:
+            resume["_id"] = str(resume["_id"])
+            results.append(resume)
+
+        return {
+            "total": self.collection.count_documents(query),
+            "page": page,
+            "page_size": page_size,
+            "results": results,
+            "next": results[-1]["_id"] if len(results) == page_size else None,
+        }
+
+    def iter_documents(self, batch_id, query=None, projection=None, batch_size=1000, after=None):
+        """
+        Yields the resumes of a batch in insertion order, reading batch_size at a time with keyset queries,
+        so memory stays flat and no server cursor has to live for the whole read.
+
+        :param batch_id: The batch.
+        :param query: MongoDB query, see build_filter. Defaults to every resume of the batch.
+        :param projection: MongoDB projection. Defaults to whole documents.
+        :param batch_size: Resumes per query.
+        :param after: Keyset cursor to start from, see query.
+        """
+        query = {"batch_id": batch_id, **(query or {})}
+        while True:
+            batch = list(
+                self.collection.find(self.after(query, after), projection).sort("_id", ASCENDING).limit(batch_size)
+            )
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            after = str(batch[-1]["_id"])
+
+    def legacy_collections(self):
+        """
+        Returns the names of the per-upload collections left from before the resumes collection.
+        """
+        return sorted(name for name in self.db.list_collection_names() if LEGACY_COLLECTION.match(name))
+
+    def migrate(self, collection_name, drop=False, chunk_size=500, aggregator=None):
+        """
+        Copies a per-upload collection into the resumes collection, its name becoming the batch_id, so links
+        of the batch keep working. Resumes keep their _id and get their search fields; the ones already copied
+        are skipped, so an interrupted migration can simply be run again. Skills saved before the taxonomy
+        (js, postgres, golang...) are replaced by their canonical IDs, and the skill facets of the batch are
+        counted again from them.
+
+        :param collection_name: The legacy collection.
+        :param drop: Drop the legacy collection once every resume is copied.
+        :param chunk_size: Resumes per insert.
+        :param aggregator: SkillAggregator the facets are saved with. Defaults to one on the same database.
+        :return: Dictionary with the number of resumes copied, the number already copied before and the
+            failures, see MongoWriter.report.
+        """
+        legacy = self.db[collection_name]
+        aggregator = aggregator or SkillAggregator(self.log, self.db)
+        all_matched_skills = []
+        with self.writer(chunk_size) as writer:
+            for resume in legacy.find({}).sort("_id", ASCENDING):
+                # Search fields of older batches are computed again from the entities
+                entities = {key: value for key, value in resume.items() if key not in SEARCH_FIELDS}
+                matched_skills = self.taxonomy.canonicalize(
+                    {category: entities[category] for category in self.taxonomy.categories if entities.get(category)}
+                )
+                entities.update(matched_skills)
+                all_matched_skills.append(matched_skills)
+                # Keep the upload time for the TTL, the ObjectId carries it
+                saved_at = resume["_id"].generation_time.replace(tzinfo=None) if isinstance(resume["_id"], ObjectId) else None
+                writer.write(self.document(entities, collection_name, saved_at))
+
+        # A duplicate _id is a resume copied by an earlier run
+        failed = [failure for failure in writer.failed if failure["code"] != DUPLICATE_KEY]
+        report = {"inserted": writer.inserted, "skipped": len(writer.failed) - len(failed), "failed": failed}
+        # Every resume of the batch was read, so the facets are complete also when some were copied before
+        aggregator.save(collection_name, aggregator.aggregate(all_matched_skills))
+        if drop and not failed:
+            legacy.drop()
+        self.log.info(f"Migrated {report['inserted']} resumes of '{collection_name}' ({len(report['failed'])} failed)")
+        return report
+
+
+if __name__ == "__main__":
+    # Run from the app directory: python -m services.ResumeSearch --mongo-uri mongodb://localhost:27017/
+    from .MongoWriter import get_client
+    from .SkillTaxonomy import SkillTaxonomy
+
+    parser = argparse.ArgumentParser(description="Move the per-upload collections into the resumes collection")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/")
+    parser.add_argument("--db", default="resume_db")
+    parser.add_argument("--drop", action="store_true", help="Drop every legacy collection once it is copied")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the legacy collections")
+    parser.add_argument("--ttl-days", type=float, default=None,
+                        help="Expire resumes this many days after they were saved, as resume_ttl_days does. Unset leaves the TTL as it is")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger("migrate_resumes")
+    ttl_seconds = None if args.ttl_days is None else int(args.ttl_days * 24 * 3600)
+    search = ResumeSearch(logger, get_client(args.mongo_uri)[args.db], SkillTaxonomy(logger=logger), ttl_seconds=ttl_seconds)
+
+    collections = search.legacy_collections()
+    print(f"{len(collections)} legacy collections")
+    for name in collections:
+        if args.dry_run:
+            print(f"{name}: {search.db[name].estimated_document_count()} resumes")
+            continue
+        report = search.migrate(name, drop=args.drop)
+        print(f"{name}: {report['inserted']} copied, {report['skipped']} already there, {len(report['failed'])} failed")
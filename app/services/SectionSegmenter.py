@@ -0,0 +1,72 @@
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+from .NERData import SECTION_TITLES
+
+# text[start:end] is the section, header line included
+Section = namedtuple("Section", ["name", "start", "end"])
+
+# Text before the first header, usually the name and the contact details
+PREAMBLE = "header"
+
+# Header lines are short, the title may be followed by a colon and the section's first line
+_LINE = re.compile(r"[^\n\r]+")
+_TITLE_END = re.compile(r"[:|]")
+_NOT_LETTERS = re.compile(r"[^a-z]+")
+MAX_TITLE_LENGTH = 48
+
+
+def title_key(title):
+    """
+    Normalizes a header title to its lowercase letters.
+    """
+    return _NOT_LETTERS.sub("", title.lower())
+
+
+# Every title of SECTION_TITLES, by key
+_SECTIONS_BY_TITLE = {title_key(title): name for name, titles in SECTION_TITLES.items() for title in titles}
+
+
+def segment_sections(text, titles=None):
+    """
+    Splits a resume into sections on its header lines, e.g. "EDUCATION", "Work Experience:" or "Skills: Python, SQL".
+
+    Line breaks are needed to find the headers, so segment the text before preprocessing it. A text without
+    any header is a single PREAMBLE section.
+
+    :param text: The text as extracted from the file.
+    :param titles: Sections by title key (see title_key). Defaults to the titles of SECTION_TITLES.
+    :return: List of Section tuples in text order, covering the whole text.
+    """
+    titles = _SECTIONS_BY_TITLE if titles is None else titles
+
+    headers = []
+    for line in _LINE.finditer(text):
+        candidate = _TITLE_END.split(line.group(), 1)[0].strip()
+        if not candidate or len(candidate) > MAX_TITLE_LENGTH:
+            continue
+        name = titles.get(title_key(candidate))
+        if name is not None:
+            headers.append((name, line.start()))
+
+    sections = []
+    if not headers or headers[0][1] > 0:
+        sections.append(Section(PREAMBLE, 0, headers[0][1] if headers else len(text)))
+    for index, (name, start) in enumerate(headers):
+        end = headers[index + 1][1] if index + 1 < len(headers) else len(text)
+        sections.append(Section(name, start, end))
+    return sections
+
+
+def section_at(sections, offset):
+    """
+    Returns the name of the section containing the character offset, or None when it is outside all of them.
+
+    :param sections: Sections in text order, as returned by segment_sections.
+    :param offset: Character offset into the segmented text.
+    """
+    index = bisect_right([section.start for section in sections], offset) - 1
+    if index >= 0 and offset < sections[index].end:
+        return sections[index].name
+    return None
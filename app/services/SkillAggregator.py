@@ -0,0 +1,92 @@
+import json
+import hashlib
+import datetime
+from collections import Counter, OrderedDict
+
+
+class SkillAggregator:
+    def __init__(self, logger, db, collection_name="skill_facets", memory_batches=256):
+        """
+        Counts the skills matched in a batch of resumes in memory and persists the facets once per batch.
+
+        :param logger: Logger instance to log information.
+        :param db: The MongoDB database the facets are stored in, one document per batch.
+        :param collection_name: Name of the facets collection.
+        :param memory_batches: Number of recently used batches kept in memory in front of MongoDB.
+        """
+        self.log = logger
+        self.collection = db[collection_name]
+        self.memory_batches = memory_batches
+        self._memory = OrderedDict()  # batch_id -> (etag, facets)
+
+    @staticmethod
+    def aggregate(matched_skills_list):
+        """
+        Counts in how many resumes every skill was matched.
+
+        :param matched_skills_list: Dictionaries of category -> skills, as returned by NERProcessor.extract_matched_skills.
+        :return: Dictionary of category -> list of {"skill", "count"}, most frequent skills first.
+            Skills are values rather than keys because skill IDs such as node.js contain dots.
+        """
+        counters = {}
+        for matched_skills in matched_skills_list:
+            for category, skills in matched_skills.items():
+                counters.setdefault(category, Counter()).update(set(skills))
+        return {
+            category: [
+                {"skill": skill, "count": count}
+                for skill, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+            ]
+            for category, counter in counters.items()
+        }
+
+    @staticmethod
+    def etag(facets):
+        """
+        Returns a strong ETag for the facets, derived from their content.
+        """
+        digest = hashlib.sha1(json.dumps(facets, sort_keys=True).encode("utf-8")).hexdigest()
+        return f'"{digest[:16]}"'
+
+    def _remember(self, batch_id, entry):
+        self._memory[batch_id] = entry
+        self._memory.move_to_end(batch_id)
+        while len(self._memory) > self.memory_batches:
+            self._memory.popitem(last=False)
+
+    def save(self, batch_id, facets):
+        """
+        Persists the facets of a batch with a single write.
+
+        :param batch_id: The batch key, e.g. the collection its resumes were saved to.
+        :param facets: Facets as returned by aggregate.
+        :return: The ETag of the facets.
+        """
+        etag = self.etag(facets)
+        self.collection.replace_one(
+            {"_id": batch_id},
+            {"_id": batch_id, "facets": facets, "etag": etag, "updated_at": datetime.datetime.utcnow()},
+            upsert=True,
+        )
+        self._remember(batch_id, (etag, facets))
+        self.log.info(f"Saved skill facets of batch {batch_id} ({sum(len(skills) for skills in facets.values())} skills)")
+        return etag
+
+    def load(self, batch_id):
+        """
+        Returns the facets of a batch.
+
+        :param batch_id: The batch key given to save.
+        :return: (etag, facets), or None when the batch is unknown.
+        """
+        entry = self._memory.get(batch_id)
+        if entry is not None:
+            self._memory.move_to_end(batch_id)
+            return entry
+
+        document = self.collection.find_one({"_id": batch_id}, {"facets": 1, "etag": 1})
+        if document is None:
+            return None
+        entry = (document.get("etag") or self.etag(document["facets"]), document["facets"])
+        self._remember(batch_id, entry)
+        return entry
@@ -0,0 +1,135 @@
+from collections import deque
+
+# Characters that continue a word, a skill never starts right after or ends right before one of them
+WORD_CHARS = set("_&@")
+# Characters that continue a word after the end of a skill ("c" is not matched in "c++" or "c#")
+TRAILING_WORD_CHARS = set("+#")
+
+
+def _lower(text):
+    # str.lower() changes the length of a few characters (e.g. U+0130), offsets must stay aligned
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+
+class SkillMatcher:
+    def __init__(self, taxonomy):
+        """
+        Matches every skill of a taxonomy in one linear pass over raw text, using an Aho-Corasick automaton.
+
+        Needs no spaCy model, so skills can be tagged in workers that never load one. Matching is case
+        insensitive and follows the word boundaries the spaCy tokenizer mostly uses: "." only joins two
+        alphanumerics (node.js, asp.net), "-" only joins a following digit (python-3), "&" and "@" always
+        join (r&d, emails), "+" and "#" belong to the skill before them (c++, c#), the rest separates words.
+
+        :param taxonomy: Dictionary of category -> iterable of skill strings, like NER_ARRAYS.
+        """
+        self.categories = list(taxonomy)
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        # Patterns are added in the order the PhraseMatcher engine would report them
+        for category_index, skills in enumerate(taxonomy.values()):
+            for skill in skills:
+                self._add(skill.lower(), category_index)
+        self._build_failure_links()
+
+    def _add(self, pattern, category_index):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        output = (len(pattern), category_index, pattern)
+        if output not in self._outputs[state]:
+            self._outputs[state].append(output)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                # Children of the root fail back to the root
+                self._fail[next_state] = self._goto[fail].get(char, 0) if state else 0
+                # A state also reports every pattern that ends in its failure state
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    @staticmethod
+    def _starts_word(text, start):
+        if start == 0:
+            return True
+        before = text[start - 1]
+        if before.isalnum() or before in WORD_CHARS:
+            return False
+        if before == "." and start > 1 and text[start - 2].isalnum():
+            return False
+        return True
+
+    @staticmethod
+    def _ends_word(text, end):
+        if end == len(text):
+            return True
+        after = text[end]
+        if after.isalnum() or after in WORD_CHARS or after in TRAILING_WORD_CHARS:
+            return False
+        following = text[end + 1] if end + 1 < len(text) else ""
+        if after == "." and following.isalnum():
+            return False
+        if after == "-" and following.isdigit():
+            return False
+        return True
+
+    def matches(self, text):
+        """
+        Finds every skill in the text.
+
+        :param text: The raw text, in any case.
+        :return: List of (category, skill, start, end) character offsets, ordered by position.
+        """
+        lowered = _lower(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = []
+        state = 0
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            end = position + 1
+            if not self._ends_word(lowered, end):
+                continue
+            for length, category_index, pattern in outputs[state]:
+                start = end - length
+                if self._starts_word(lowered, start):
+                    found.append((start, end, category_index, pattern))
+
+        found.sort(key=lambda match: (match[0], match[1], match[2]))
+        return [(self.categories[category_index], pattern, start, end) for start, end, category_index, pattern in found]
+
+    def extract(self, text):
+        """
+        Returns the matched skills by category, in the same shape as NERProcessor.extract_matched_skills.
+
+        :param text: The raw text, in any case.
+        :return: Dictionary of category -> list of unique lowercase skills, in order of appearance.
+        """
+        matched_skills = {}
+        for category, skill, _, _ in self.matches(text):
+            skills = matched_skills.setdefault(category, [])
+            if skill not in skills:
+                skills.append(skill)
+        return matched_skills
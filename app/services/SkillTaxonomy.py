@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import argparse
+
+from .NERData import NER_ARRAYS, SKILL_SYNONYMS
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+TAXONOMY_SCHEMA = 1
+
+
+def build_taxonomy(ner_arrays=NER_ARRAYS, synonyms=SKILL_SYNONYMS):
+    """
+    Compiles the skill lists and the synonym table into the taxonomy artifact.
+
+    Every skill gets one canonical ID (its lowercase canonical name), the categories it belongs to and
+    its synonyms. Skills listed under several categories are merged. Dictionary-valued categories such
+    as external_links map a name to its domains, which become synonyms of the name.
+
+    :param ner_arrays: Dictionary of category -> list of skills, or -> dictionary of name -> domains.
+    :param synonyms: Dictionary of canonical name -> list of alternative spellings.
+    :return: The artifact as a JSON-serializable dictionary.
+    :raises ValueError: When a spelling maps to two skills or a synonym names an unknown skill.
+    """
+    canonical_of = {}
+    for canonical, aliases in synonyms.items():
+        for alias in aliases:
+            canonical_of[alias.lower()] = canonical.lower()
+
+    skills = {}
+    categories = {}
+    canonical = {}
+
+    def add_surface(surface, skill_id):
+        surface = surface.lower()
+        if canonical.get(surface, skill_id) != skill_id:
+            raise ValueError(f"'{surface}' maps to both '{canonical[surface]}' and '{skill_id}'")
+        canonical[surface] = skill_id
+        if surface != skill_id and surface not in skills[skill_id]["synonyms"]:
+            skills[skill_id]["synonyms"].append(surface)
+
+    for category, entries in ner_arrays.items():
+        if isinstance(entries, dict):
+            items = [(name, [name] + list(domains)) for name, domains in entries.items()]
+        else:
+            items = [(name, [name]) for name in entries]
+
+        for name, surfaces in items:
+            skill_id = canonical_of.get(name.lower(), name.lower())
+            skill = skills.setdefault(skill_id, {"categories": [], "synonyms": []})
+            if category not in skill["categories"]:
+                skill["categories"].append(category)
+                categories.setdefault(category, []).append(skill_id)
+            add_surface(skill_id, skill_id)
+            for surface in surfaces:
+                add_surface(surface, skill_id)
+
+    for skill_id, aliases in synonyms.items():
+        if skill_id.lower() not in skills:
+            raise ValueError(f"Synonyms given for unknown skill '{skill_id}'")
+        for alias in aliases:
+            add_surface(alias, skill_id.lower())
+
+    # Prebuilt matcher patterns: every spelling of the skills of a category
+    patterns = {
+        category: [surface for skill_id in skill_ids for surface in [skill_id] + skills[skill_id]["synonyms"]]
+        for category, skill_ids in categories.items()
+    }
+
+    artifact = {
+        "skills": skills,
+        "categories": categories,
+        "patterns": patterns,
+        "canonical": canonical,
+    }
+    # The version is a hash of the content, so rebuilding an unchanged source keeps it
+    digest = hashlib.sha256(json.dumps(artifact, sort_keys=True).encode("utf-8")).hexdigest()
+    return {"schema": TAXONOMY_SCHEMA, "version": digest[:12], **artifact}
+
+
+def write_taxonomy(path=DEFAULT_TAXONOMY_PATH, artifact=None):
+    """
+    Writes the artifact atomically, so workers reloading it never read a partial file.
+
+    :param path: Output path.
+    :param artifact: The artifact, built from NERData when None.
+    :return: The written artifact.
+    """
+    artifact = artifact or build_taxonomy()
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=1)
+    os.replace(temp_path, path)
+    return artifact
+
+
+class SkillTaxonomy:
+    def __init__(self, path=DEFAULT_TAXONOMY_PATH, logger=None, check_interval=5.0):
+        """
+        Loads the compiled skill taxonomy and reloads it when the artifact changes on disk.
+
+        :param path: Path to the artifact written by write_taxonomy.
+        :param logger: Logger instance to log information.
+        :param check_interval: Minimum seconds between two checks of the artifact's modification time.
+        """
+        self.path = path
+        self.log = logger or logging.getLogger(__name__)
+        self.check_interval = check_interval
+        self._mtime = None
+        self._checked_at = 0.0
+        self.load()
+
+    def load(self):
+        """
+        Reads the artifact. When it is missing the taxonomy is built in memory from NERData.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, "r", encoding="utf-8") as f:
+                artifact = json.load(f)
+        except FileNotFoundError:
+            self.log.warning(f"Skill taxonomy {self.path} not found, building it from NERData")
+            mtime = None
+            artifact = build_taxonomy()
+
+        if artifact.get("schema") != TAXONOMY_SCHEMA:
+            raise ValueError(f"Unsupported skill taxonomy schema: {artifact.get('schema')}")
+
+        self.artifact = artifact
+        self.version = artifact["version"]
+        self.skills = artifact["skills"]
+        self.categories = artifact["categories"]
+        self.patterns = artifact["patterns"]
+        self.canonical = artifact["canonical"]
+        self._mtime = mtime
+        self._checked_at = time.monotonic()
+        self.log.info(f"Loaded skill taxonomy {self.version} with {len(self.skills)} skills")
+
+    def reload_if_changed(self):
+        """
+        Reloads the artifact if its modification time changed, checking at most every check_interval seconds.
+
+        :return: True when the taxonomy was reloaded.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+
+        try:
+            self.load()
+        except (ValueError, KeyError) as e:
+            # Keep serving the previous version rather than failing every request
+            self.log.error(f"Could not reload skill taxonomy {self.path}: {e}")
+            self._mtime = mtime
+            return False
+        return True
+
+    def canonicalize(self, matched_skills):
+        """
+        Replaces matched spellings by canonical skill IDs.
+
+        :param matched_skills: Dictionary of category -> list of matched spellings.
+        :return: Dictionary of category -> list of unique canonical IDs, in order of appearance.
+        """
+        canonical_skills = {}
+        for category, surfaces in matched_skills.items():
+            skill_ids = canonical_skills.setdefault(category, [])
+            for surface in surfaces:
+                skill_id = self.canonical.get(surface, surface)
+                if skill_id not in skill_ids:
+                    skill_ids.append(skill_id)
+        return canonical_skills
+
+
+if __name__ == "__main__":
+    # Run from the app directory: python -m services.SkillTaxonomy
+    parser = argparse.ArgumentParser(description="Compile NER_ARRAYS and SKILL_SYNONYMS into the skill taxonomy artifact")
+    parser.add_argument("--output", default=DEFAULT_TAXONOMY_PATH, help="Path of the artifact to write")
+    args = parser.parse_args()
+
+    artifact = write_taxonomy(args.output)
+    print(f"Wrote skill taxonomy {artifact['version']} ({len(artifact['skills'])} skills) to {args.output}")
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TextCache:
+    def __init__(self, logger, db_path="cache/text_cache.sqlite3", memory_limit=64 * 1024 * 1024, disk_limit=1024 * 1024 * 1024):
+        """
+        Two tier, content addressed cache for extracted text.
+
+        The first tier is an in-process LRU, the second a SQLite file shared by every
+        process that points at the same path. Both tiers evict least recently used
+        entries once their size budget (in bytes of UTF-8 text) is exceeded.
+
+        :param logger: Logger instance to log information.
+        :param db_path: Path of the SQLite file, or None to keep the cache in memory only.
+        :param memory_limit: Size budget of the in-process tier.
+        :param disk_limit: Size budget of the SQLite tier.
+        """
+        self.log = logger
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.db_path = db_path
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            # Total size kept up to date by triggers, so every process sharing the file sees it without a scan
+            self._db.execute("CREATE TABLE IF NOT EXISTS totals (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._db.execute(
+                "INSERT OR IGNORE INTO totals (name, value) SELECT 'size', COALESCE(SUM(size), 0) FROM entries"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN "
+                "UPDATE totals SET value = value + NEW.size WHERE name = 'size'; END"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN "
+                "UPDATE totals SET value = value + NEW.size - OLD.size WHERE name = 'size'; END"
+            )
+            self._db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN "
+                "UPDATE totals SET value = value - OLD.size WHERE name = 'size'; END"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(data, extractor, version):
+        """
+        Builds the cache key for a file from its bytes and the extractor that reads it.
+        """
+        return f"{hashlib.sha256(data).hexdigest()}:{extractor}:{version}"
+
+    def get(self, key):
+        """
+        Returns the cached text for key, or None on a miss.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self.hits["disk"] += 1
+                    self._remember(key, row[0])
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, text):
+        """
+        Stores text under key in both tiers.
+        """
+        with self._lock:
+            self._remember(key, text)
+
+            if self._db is not None:
+                # An upsert rather than INSERT OR REPLACE, whose implicit delete does not fire the triggers
+                self._db.execute(
+                    "INSERT INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, accessed = excluded.accessed",
+                    (key, text, len(text.encode("utf-8")), time.time()),
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def _remember(self, key, text):
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key).encode("utf-8"))
+        self._memory[key] = text
+        self._memory_size += len(text.encode("utf-8"))
+
+        while self._memory_size > self.memory_limit and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted.encode("utf-8"))
+
+    def _disk_size(self):
+        return self._db.execute("SELECT value FROM totals WHERE name = 'size'").fetchone()[0]
+
+    def _evict_disk(self, batch=64):
+        total = self._disk_size()
+        if total <= self.disk_limit:
+            return
+
+        # Drop the least recently used entries, a batch at a time, until we are back under 90% of the budget
+        target = int(self.disk_limit * 0.9)
+        removed = 0
+        while total > target:
+            rows = self._db.execute("SELECT key, size FROM entries ORDER BY accessed LIMIT ?", (batch,)).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= target:
+                    break
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                removed += size
+        self.log.info(f"Evicted {removed} bytes from the text cache")
+
+    def stats(self):
+        """
+        Returns the hit/miss counters and the current size of each tier.
+        """
+        with self._lock:
+            disk_entries, disk_size = 0, 0
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                disk_size = self._disk_size()
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "memory_size": self._memory_size,
+                "disk_entries": disk_entries,
+                "disk_size": disk_size,
+            }
@@ -0,0 +1,56 @@
+import re
+from collections import namedtuple
+
+# A chunk covers text[start:end] and owns the entities starting in [own_start, own_end)
+Chunk = namedtuple("Chunk", ["start", "end", "own_start", "own_end"])
+
+# Sentence ends and the separators resumes use between items, once newlines are gone
+_BREAK = re.compile(r"[.!?;|•]\s+")
+
+
+def _cut(text, start, end, chunk_size):
+    # Latest sentence end in the second half of the window, else the latest space, else a hard cut
+    floor = start + chunk_size // 2
+    last = None
+    for match in _BREAK.finditer(text, floor, end):
+        last = match.end()
+    if last is not None:
+        return last
+    space = text.rfind(" ", floor, end)
+    return space + 1 if space != -1 else end
+
+
+def split_chunks(text, chunk_size=10000, overlap=200):
+    """
+    Splits a long text into chunks of at most chunk_size characters that end on sentence boundaries
+    where possible and overlap their neighbours by about overlap characters.
+
+    Every position belongs to exactly one chunk, the middle of each overlap separates them, so an entity
+    found by two chunks is kept once: by the chunk owning its start.
+
+    :param text: The text to split.
+    :param chunk_size: Maximum chunk length in characters.
+    :param overlap: Characters the next chunk starts before the end of the previous one.
+    :return: List of Chunk tuples in text order.
+    """
+    if overlap * 2 >= chunk_size:
+        raise ValueError("overlap must be less than half of chunk_size")
+
+    spans = []
+    start = 0
+    while True:
+        end = len(text) if len(text) - start <= chunk_size else _cut(text, start, start + chunk_size, chunk_size)
+        spans.append((start, end))
+        if end >= len(text):
+            break
+        # Start the next chunk on a word boundary inside the overlap
+        next_start = end - overlap
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 and space + 1 < end else next_start
+
+    chunks = []
+    for index, (start, end) in enumerate(spans):
+        own_start = 0 if index == 0 else (start + spans[index - 1][1]) // 2
+        own_end = len(text) if index == len(spans) - 1 else (spans[index + 1][0] + end) // 2
+        chunks.append(Chunk(start, end, own_start, own_end))
+    return chunks
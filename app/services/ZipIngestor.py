@@ -0,0 +1,68 @@
+import zipfile
+
+
+class ZipLimitError(ValueError):
+    """
+    Raised when a ZIP archive exceeds the configured member count or uncompressed size.
+    """
+
+
+class ZipIngestor:
+    def __init__(self, logger, max_total_size=512 * 1024 * 1024, max_members=5000, extensions=(".pdf", ".docx", ".doc")):
+        """
+        Reads CV files straight out of a ZIP archive without extracting it to disk.
+
+        :param logger: Logger instance to log information.
+        :param max_total_size: Maximum number of uncompressed bytes read across all members.
+        :param max_members: Maximum number of CV files accepted from one archive.
+        :param extensions: File extensions treated as CVs, everything else is skipped. None keeps every file.
+        """
+        self.log = logger
+        self.max_total_size = max_total_size
+        self.max_members = max_members
+        self.extensions = extensions
+
+    def _is_cv(self, info):
+        if info.is_dir():
+            return False
+        parts = info.filename.replace("\\", "/").split("/")
+        # Skip macOS resource forks and hidden files/directories
+        if any(part.startswith(".") or part == "__MACOSX" for part in parts):
+            return False
+        return self.extensions is None or parts[-1].lower().endswith(self.extensions)
+
+    def list_members(self, zip_ref):
+        """
+        Returns the CV members of an open archive after checking the declared limits.
+        """
+        members = [info for info in zip_ref.infolist() if self._is_cv(info)]
+
+        if len(members) > self.max_members:
+            raise ZipLimitError(f"ZIP contains {len(members)} CV files, the limit is {self.max_members}")
+
+        declared_size = sum(info.file_size for info in members)
+        if declared_size > self.max_total_size:
+            raise ZipLimitError(f"ZIP expands to {declared_size} bytes, the limit is {self.max_total_size}")
+
+        return members
+
+    def iter_members(self, zip_source):
+        """
+        Yields (name, data) for every CV file in the archive, in archive order.
+
+        :param zip_source: Path to the ZIP file or a binary file object.
+        """
+        with zipfile.ZipFile(zip_source, 'r') as zip_ref:
+            members = self.list_members(zip_ref)
+            self.log.info(f"Reading {len(members)} CV files from ZIP")
+
+            remaining = self.max_total_size
+            for info in members:
+                # Sizes in the archive headers can lie, so cap what is actually decompressed
+                with zip_ref.open(info) as member:
+                    data = member.read(remaining + 1)
+                if len(data) > remaining:
+                    raise ZipLimitError(f"ZIP expands past the limit of {self.max_total_size} bytes")
+                remaining -= len(data)
+
+                yield info.filename, data
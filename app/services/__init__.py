@@ -1,4 +1,6 @@
-from .Scraper import Scraper
+from .scraper import Scraper
 from .OCRProcessor import OCRProcessor
 from .ResumeParser import ResumeProcessor
-from .NERProcessor import NERProcessor
\ No newline at end of file
+from .HybridProcessor import HybridProcessor
+from .NERProcessor import NERProcessor
+from .TextCache import TextCache
\ No newline at end of file
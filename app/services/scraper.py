@@ -1,16 +1,21 @@
-import re, os
+import re, os, io
 from os import path, listdir
-from PyPDF2 import PdfReader
 from docx import Document
 import docx
 from openpyxl import Workbook
 from ultra_logger import Logger
-from spire.doc import Document as SpireDoc
+from spire.doc import Document as SpireDoc, FileFormat
+from spire.doc.common import Stream
 import zipfile
 
+from .ZipIngestor import ZipIngestor, ZipLimitError
+from .PDFBackends import PDFTextExtractor, DEFAULT_PDF_BACKENDS
+from .FormatRegistry import sniff_format, UnsupportedFormatError
+
 class Scraper:
-    def __init__(self,log_file="scraper.log"):
+    def __init__(self,log_file="scraper.log", pdf_backends=DEFAULT_PDF_BACKENDS):
         self.log = Logger("Scraper.py", f"{log_file}", True, True)
+        self.pdf_extractor = PDFTextExtractor(self.log, pdf_backends)
         self.EMAIL_REGEX = r'[^.]([a-zA-Z0-9._%+-]+[^.])@([a-zA-Z0-9]+(?:\.[a-zA-Z0-9]+)*)(\s*\.[a-zA-Z]{2,})'
         self.PHONE_REGEX = r"(?:\+?\d{1,3}[\s-]?)?(?:\(\d{3}\)|\d{3})[\s-]?\d{2,4}[\s-]?\d{2,4}"
 
@@ -69,11 +74,12 @@ class Scraper:
         return extracted_emails
 
 
-    def process_cv(self, cv_path):
+    def process_cv(self, cv_path, data=None):
         """Extracts email IDs, contact numbers, and overall text from a CV.
 
         Args:
             cv_path (str): Path to the CV file (PDF or Word).
+            data (bytes, optional): File contents, in which case cv_path is only used as the name.
 
         Returns:T
             tuple: A tuple containing (email, contact_number, text)
@@ -81,17 +87,25 @@ class Scraper:
 
 
         self.log.info(f"Processing CV: {cv_path}")
+        source = cv_path if data is None else io.BytesIO(data)
         text = ""
 
-        # Determine file type and handle accordingly
-        if cv_path.endswith(".pdf"):
+        # Determine file type from the contents, the extension may lie
+        try:
+            if data is None:
+                with open(cv_path, 'rb') as f:
+                    file_format = sniff_format(f.read())
+            else:
+                file_format = sniff_format(data)
+        except (IOError, UnsupportedFormatError) as e:
+            self.log.error(f"Error reading file: {cv_path} ({e})")
+            file_format = None
+
+        if file_format == "pdf":
             try:
                 # Read PDF
                 self.log.info(f"Reading PDF: {cv_path}")
-                with open(cv_path, 'rb') as f:
-                    reader = PdfReader(f)
-                    for page in reader.pages:
-                        text += page.extract_text()
+                text = self.pdf_extractor.extract_text(source)
                         
             except (IOError, FileNotFoundError) as e:
                 self.log.error(f"Error accessing file: {cv_path} ({e})")
@@ -99,11 +113,11 @@ class Scraper:
             except Exception as e:
                 self.log.exception(f"Unexpected error: {e}", exc_info=True)
                     
-        elif cv_path.endswith(".docx"):
+        elif file_format == "docx":
             try:
                 # Read Word document using python-docx
                 self.log.info(f"Reading Word: {cv_path}")
-                doc = Document(cv_path)  # Use Document() from python-docx
+                doc = Document(source)  # Use Document() from python-docx
 
                 # Extract text from paragraphs
                 text = ""
@@ -116,11 +130,15 @@ class Scraper:
             except Exception as e:
                 self.log.exception(f"Unexpected error: {e}", exc_info=True)
 
-        elif cv_path.endswith(".doc"):
+        elif file_format == "doc":
             try:
                 # Read DOC using textract (may not be perfect for all DOC formats)
                 self.log.info(f"Reading DOC using Spire.doc: {cv_path}")
-                doc = SpireDoc(cv_path)
+                if data is None:
+                    doc = SpireDoc(cv_path)
+                else:
+                    doc = SpireDoc()
+                    doc.LoadFromStream(Stream(data), FileFormat.Doc)
                 text = doc.GetText()
                 
             except (IOError, FileNotFoundError) as e:
@@ -179,32 +197,16 @@ class Scraper:
         
     def read_and_exctract_from_cvs(self, directory="CV", zip_file=False):
             
-        # Extract ZIP file if necessary
+        # Read the CVs straight out of the ZIP file, one member at a time as they are processed;
+        # nothing is extracted to disk. Archive errors surface while iterating, see below.
         if zip_file:
-            try:
-                with zipfile.ZipFile(directory, 'r') as zip_ref:
-                    # Extract to a temporary directory to avoid conflicts
-                    temp_dir = os.path.join(os.getcwd(), '.temp_extract')
-                    os.makedirs(temp_dir, exist_ok=True)  # Create directory if it doesn't exist
-                    zip_ref.extractall(temp_dir)
-                    directory = temp_dir  # Update directory to temporary location
-                    
-            except zipfile.BadZipFile:
-                self.log.exception(f"Invalid ZIP file: {zip_file}", exc_info=True)
-                return {
-                'status': 'error',
-                'message': 'Invalid ZIP file'
-            }
-            
-            except Exception as e:  # Catch other potential errors
-                self.log.exception(f"Error extracting ZIP file: {e}", exc_info=True)
-                return {
-                'status': 'error',
-                'message': f'Error extracting ZIP file {e}'
-            }
-        
-        self.log.info(f"Reading CVs from {directory}")
-        cv_files = self.find_cvs(directory)
+            cv_files = ZipIngestor(self.log).iter_members(directory)
+            output_file = f"{path.splitext(directory)[0]}_output.xlsx"
+
+        else:
+            self.log.info(f"Reading CVs from {directory}")
+            cv_files = self.find_cvs(directory)
+            output_file = f"{directory}/output.xlsx"
 
         # Create a new Excel workbook and worksheet
         workbook = Workbook()
@@ -216,8 +218,12 @@ class Scraper:
             worksheet.cell(row=1, column=2).value = "Contact Numbers"
             worksheet.cell(row=1, column=3).value = "CV content"
 
-            for i, cv_path in enumerate(cv_files, start=1):
-                emails, contact_numbers, text = self.process_cv(cv_path)
+            for i, cv_file in enumerate(cv_files, start=1):
+                # ZIP members come as (name, data) pairs, directory entries as paths
+                if isinstance(cv_file, tuple):
+                    emails, contact_numbers, text = self.process_cv(*cv_file)
+                else:
+                    emails, contact_numbers, text = self.process_cv(cv_file)
                 
                 emails = ','.join(emails)
                 contact_numbers = ','.join(contact_numbers)
@@ -227,15 +233,29 @@ class Scraper:
                 worksheet.cell(row=i+1, column=3).value = text
 
             # Save the workbook
-            workbook.save(f"{directory}/output.xlsx")
+            workbook.save(output_file)
             
-            self.log.info(f"Data is extracted and saved to output.xlsx")
+            self.log.info(f"Data is extracted and saved to {output_file}")
             
             return {
                 'status': 'success',
-                'excel_file': f"{directory}/output.xlsx"
+                'excel_file': output_file
                 }
 
+        except zipfile.BadZipFile:
+            self.log.exception(f"Invalid ZIP file: {directory}", exc_info=True)
+            return {
+                'status': 'error',
+                'message': 'Invalid ZIP file'
+            }
+
+        except ZipLimitError as e:
+            self.log.error(f"ZIP file rejected: {e}")
+            return {
+                'status': 'error',
+                'message': str(e)
+            }
+
         except Exception as e:
             self.log.exception(f"Unexpected error {e}", exc_info=True)
             
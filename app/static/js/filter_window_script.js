@@ -1,214 +1,39 @@
-let NERArrays = {
-  // external_links: {
-  //   github: ["github.com"],
-  //   linkedin: ["linkedin.com"],
-  //   hackerrank: ["hackerrank.com"],
-  //   leetcode: ["leetcode.com"],
-  //   codechef: ["codechef.com"],
-  //   codingninjas: ["codingninjas.com"],
-  // },
-  // social_links: {
-  //   instagram: ["instagram.com"],
-  //   twitter: ["twitter.com", "x.com"],
-  //   facebook: ["facebook.com"],
-  // },
-  external_links: [
-    "github.com",
-    "linkedin.com",
-    "hackerrank.com",
-    "leetcode.com",
-    "codechef.com",
-    "codingninjas.com",
-  ],
-  social_links: ["instagram.com", "twitter.com", "facebook.com"],
-  programming_languages: [
-    "python",
-    "java",
-    "javascript",
-    "js",
-    "c#",
-    "c-sharp",
-    "c++",
-    "cpp",
-    "ruby",
-    "go",
-    "golang",
-    "swift",
-    "kotlin",
-    "php",
-    "typescript",
-    "ts",
-    "scala",
-    "rust",
-    "perl",
-    "clojure",
-    "bash",
-    "shell",
-    "objective-c",
-    "dart",
-    "r",
-    "matlab",
-    "elixir",
-    "haskell",
-    "lua",
-    "erlang",
-    "f#",
-    "fortran",
-    "cobol",
-    "sas",
-  ],
-  frameworks: [
-    "django",
-    "flask",
-    "react",
-    "react.js",
-    "angular",
-    "angular.js",
-    "vue.js",
-    "vue",
-    "spring",
-    "spring boot",
-    "asp.net",
-    "ruby on rails",
-    "express.js",
-    "express",
-    "node.js",
-    "node",
-    "laravel",
-    "symfony",
-    "ember.js",
-    "backbone.js",
-    "next.js",
-    "nuxt.js",
-    "svelte",
-    "pyramid",
-    "fastapi",
-    "bottle",
-    "phoenix",
-    "meteor",
-    "gatsby",
-    "blazor",
-    "uikit",
-  ],
-  databases: [
-    "mysql",
-    "postgresql",
-    "postgres",
-    "mongodb",
-    "oracle",
-    "sql server",
-    "sqlserver",
-    "ms sql",
-    "ms-sql",
-    "sqlite",
-    "redis",
-    "cassandra",
-    "mariadb",
-    "elasticsearch",
-    "db2",
-    "couchdb",
-    "dynamodb",
-    "neo4j",
-    "influxdb",
-    "hbase",
-    "firebase",
-    "firestore",
-    "cockroachdb",
-    "memcached",
-    "sql",
-  ],
-  tools: [
-    "git",
-    "docker",
-    "kubernetes",
-    "jenkins",
-    "aws",
-    "azure",
-    "gcp",
-    "google cloud platform",
-    "tensorflow",
-    "pytorch",
-    "postman",
-    "visual studio code",
-    "vs code",
-    "intellij idea",
-    "intellij",
-    "eclipse",
-    "jira",
-    "slack",
-    "bitbucket",
-    "circleci",
-    "travisci",
-    "heroku",
-    "rancher",
-    "openshift",
-    "gitlab",
-    "kibana",
-    "airflow",
-    "hadoop",
-    "jupyter",
-    "databricks",
-    "zepl",
-  ],
-  cloud_platforms: [
-    "aws",
-    "azure",
-    "google cloud platform",
-    "gcp",
-    "ibm cloud",
-    "oracle cloud",
-    "alibaba cloud",
-    "digitalocean",
-    "linode",
-    "rackspace",
-    "cloudflare",
-  ],
-  devops_tools: [
-    "jenkins",
-    "ansible",
-    "terraform",
-    "terraform cloud",
-    "puppet",
-    "chef",
-    "nagios",
-    "prometheus",
-    "prom",
-    "grafana",
-    "splunk",
-    "docker swarm",
-    "saltstack",
-    "new relic",
-    "elk stack",
-    "zabbix",
-  ],
-  frontend_technologies: [
-    "html",
-    "css",
-    "bootstrap",
-    "tailwind css",
-    "materialize",
-    "bulma",
-    "foundation",
-    "semantic ui",
-    "sass",
-    "less",
-    "stylus",
-  ],
-};
+// Filter words by category, loaded from the skill taxonomy served by the API
+let NERArrays = {};
 
-// Instead of having the NERArrays read the record.json as it changes in the filter words to display in the sidebar
-async function loadNERArrays() {
+// The taxonomy is the single source of the skill vocabulary, see app/services/SkillTaxonomy.py
+async function loadSkillTaxonomy() {
   try {
-    const response = await fetch("/static/record.json");
+    const response = await fetch("/skill_taxonomy");
     if (!response.ok) {
       throw new Error("Network response was not ok");
     }
-    NERArrays = await response.json();
-    console.log(NERArrays, "NERArrays");
+    const taxonomy = await response.json();
+    NERArrays = taxonomy.categories;
 
     return NERArrays;
   } catch (error) {
-    console.error("Error fetching JSON:", error);
+    console.error("Error fetching skill taxonomy:", error);
+  }
+}
+
+// Skills found in this batch and how many resumes mention them, saved once per batch by the API
+async function loadSkillFacets(collection) {
+  try {
+    const params = new URLSearchParams({ collection });
+    const response = await fetch(`/skill_facets?${params}`);
+    if (!response.ok) {
+      throw new Error("Network response was not ok");
+    }
+    const facets = (await response.json()).data;
+    NERArrays = {};
+    for (const category in facets) {
+      NERArrays[category] = facets[category].map((facet) => facet.skill);
+    }
+
+    return NERArrays;
+  } catch (error) {
+    console.error("Error fetching skill facets:", error);
   }
 }
 
@@ -220,6 +45,9 @@ function createFilterCheckbox(category, label) {
   checkbox.type = "checkbox";
   checkbox.id = `filter-${category}-${label}`;
   checkbox.classList.add("mr-2");
+  // Read by the filter button, the server filters on the skill IDs
+  checkbox.dataset.category = category;
+  checkbox.dataset.skill = label;
 
   const labelElement = document.createElement("label");
   labelElement.classList.add("text-sm");
@@ -270,51 +98,14 @@ function generateFilterSidebar() {
 }
 
 // Wait for DOM content to load before generating the filter sidebar
-document.addEventListener("DOMContentLoaded", function () {
-  // make an async function to load the NERArrays and generate Filter side bar
-  loadNERArrays();
+document.addEventListener("DOMContentLoaded", async function () {
+  // Show the skills of the analysed batch, or the whole skill vocabulary outside of a batch
+  const collection = typeof collectionName !== "undefined" ? collectionName : "";
+  if (!collection || !(await loadSkillFacets(collection))) {
+    await loadSkillTaxonomy();
+  }
 
   generateFilterSidebar();
 
-  document
-    .getElementById("download")
-    .addEventListener("click", async function () {
-      try {
-        // Fetch data from MongoDB (replace with your actual fetch URL)
-        const collectionName = "{{ collection_name }}"; // Assuming this is passed from the backend
-        const response = await fetch(
-          `/get_resume_data?collection=${collectionName}`
-        );
-        if (!response.ok) {
-          throw new Error("Failed to fetch data");
-        }
-
-        // Convert fetched data to JSON
-        const data = await response.json();
-
-        // Convert the JSON object to a string
-        const jsonData = JSON.stringify(data, null, 2); // Pretty-printed JSON
-
-        // Create a Blob with the JSON data
-        const blob = new Blob([jsonData], { type: "application/json" });
-
-        // Create a temporary URL for the Blob
-        const url = URL.createObjectURL(blob);
-
-        // Create a temporary download link element
-        const link = document.createElement("a");
-        link.href = url;
-        link.download = `${collectionName}_analysis.json`; // Naming the file
-
-        // Programmatically click the link to trigger the download
-        link.click();
-
-        // Clean up the temporary URL
-        URL.revokeObjectURL(url);
-      } catch (error) {
-        console.error("Error downloading data:", error);
-      }
-    });
-
   // setTimeout(() => generateFilterSidebar(), 1000);
 });
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+from docx import Document
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.DocxReader import DocxReader
+
+parser = argparse.ArgumentParser(description="Streaming DocxReader vs the python-docx object model")
+parser.add_argument("corpus", help="Directory with .docx resumes")
+parser.add_argument("--repeat", type=int, default=5, help="Passes over the corpus per reader")
+args = parser.parse_args()
+
+files = [os.path.join(args.corpus, f) for f in sorted(os.listdir(args.corpus)) if f.lower().endswith(".docx")]
+if not files:
+    sys.exit("No DOCX files found")
+
+
+def python_docx_text(path):
+    doc = Document(path)
+    return "\n".join([paragraph.text.strip() for paragraph in doc.paragraphs])
+
+
+reader = DocxReader()
+
+
+def measure(name, extract):
+    # Peak memory of a single pass, measured separately so tracing does not skew the timings
+    tracemalloc.start()
+    chars = sum(len(extract(path)) for path in files)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for path in files:
+            extract(path)
+    seconds = (time.perf_counter() - start) / (args.repeat * len(files))
+
+    print(f"{name:<12} {seconds * 1000:>8.2f} ms/doc {peak / 1024:>10.0f} KiB peak {chars:>10} chars")
+
+
+print(f"{len(files)} documents")
+measure("python-docx", python_docx_text)
+measure("DocxReader", reader.read)
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import ResumeProcessor, NERProcessor
+
+parser = argparse.ArgumentParser(description="Per-text NER loop vs batched nlp.pipe in bulk_extract_all_entities")
+parser.add_argument("corpus", help="Directory with resumes, cycled to reach each document count")
+parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Document counts to measure")
+parser.add_argument("--batch-size", type=int, default=64)
+parser.add_argument("--n-process", type=int, default=1)
+parser.add_argument("--skip-loop-above", type=int, default=10000, help="Only time the slow loop up to this many documents")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_ner_bulk")
+
+files = [os.path.join(args.corpus, f) for f in sorted(os.listdir(args.corpus))]
+texts = [record["text"] for record in ResumeProcessor(logger).extract_bulk(files) if record["text"]]
+if not texts:
+    sys.exit("No readable resumes found")
+
+ner_processor = NERProcessor(logger)
+
+
+def loop_extract(batch):
+    # The previous bulk implementation: one extract_all_entities call per text
+    return [ner_processor.extract_all_entities(text) for text in batch]
+
+
+print(f"{len(texts)} distinct resumes, batch_size={args.batch_size}, n_process={args.n_process}")
+print(f"{'docs':>7} {'loop/s':>9} {'pipe/s':>9} {'speedup':>8}")
+
+for size in args.sizes:
+    batch = [texts[i % len(texts)] for i in range(size)]
+
+    start = time.perf_counter()
+    piped, _ = ner_processor.bulk_extract_all_entities(batch, batch_size=args.batch_size, n_process=args.n_process)
+    pipe_rate = size / (time.perf_counter() - start)
+
+    if size > args.skip_loop_above:
+        print(f"{size:>7} {'-':>9} {pipe_rate:>9.1f} {'-':>8}")
+        continue
+
+    start = time.perf_counter()
+    looped = loop_extract(batch)
+    loop_rate = size / (time.perf_counter() - start)
+
+    if looped != piped:
+        print(f"  WARNING: bulk output differs from the per-text loop at {size} documents")
+    print(f"{size:>7} {loop_rate:>9.1f} {pipe_rate:>9.1f} {pipe_rate / loop_rate:>7.1f}x")
@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import ResumeProcessor, NERProcessor
+
+parser = argparse.ArgumentParser(description="NER latency against text length, long texts are chunked")
+parser.add_argument("corpus", help="Directory with resumes, concatenated to build the long texts")
+parser.add_argument("--lengths", type=int, nargs="+", default=[10000, 100000, 1000000, 5000000], help="Text lengths in characters")
+parser.add_argument("--chunk-size", type=int, default=10000)
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_ner_chunking")
+
+files = [os.path.join(args.corpus, f) for f in sorted(os.listdir(args.corpus))]
+texts = [record["text"] for record in ResumeProcessor(logger).extract_bulk(files) if record["text"]]
+if not texts:
+    sys.exit("No readable resumes found")
+corpus = "\n".join(texts)
+
+ner_processor = NERProcessor(logger, chunk_size=args.chunk_size)
+
+for length in args.lengths:
+    text = (corpus * (length // len(corpus) + 1))[:length]
+    timings = {}
+    start = time.perf_counter()
+    entities = ner_processor.extract_all_entities(text, timings)
+    seconds = time.perf_counter() - start
+    stages = " ".join(f"{stage}={elapsed:.2f}" for stage, elapsed in timings.items())
+    print(f"{length:>10} chars {seconds:>8.2f} s {length / seconds / 1000:>8.1f} kchars/s  {stages}")
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import ResumeProcessor, NERProcessor
+from services.NERProcessor import GENERAL_SECTIONS, CUSTOM_SECTIONS
+
+parser = argparse.ArgumentParser(description="NER on whole resumes vs on the sections each model needs")
+parser.add_argument("corpus", help="Directory with resumes")
+parser.add_argument("--single-parse", action="store_true")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_ner_sections")
+
+files = [os.path.join(args.corpus, f) for f in sorted(os.listdir(args.corpus))]
+texts = [record["text"] for record in ResumeProcessor(logger).extract_bulk(files) if record["text"]]
+if not texts:
+    sys.exit("No readable resumes found")
+
+ner_processor = NERProcessor(logger, single_parse=args.single_parse)
+
+# Tokens each model is run on, whole texts vs sections
+whole_tokens = general_tokens = custom_tokens = 0
+found = {}
+for text in texts:
+    text, sections = ner_processor.segment(text)
+    doc = ner_processor.nlp.make_doc(text)
+    whole_tokens += len(doc)
+    for section in sections:
+        span = doc.char_span(section.start, section.end, alignment_mode="expand")
+        tokens = len(span) if span is not None else 0
+        general_tokens += tokens if section.name in GENERAL_SECTIONS else 0
+        custom_tokens += tokens if section.name in CUSTOM_SECTIONS else 0
+        found[section.name] = found.get(section.name, 0) + 1
+print(f"{len(texts)} resumes, sections found: {found}")
+print(f"tokens through the default model {general_tokens / whole_tokens:.0%}, the custom model {custom_tokens / whole_tokens:.0%}")
+
+results = {}
+for use_sections in (False, True):
+    ner_processor.use_sections = use_sections
+    start = time.perf_counter()
+    results[use_sections], _ = ner_processor.bulk_extract_all_entities(texts)
+    seconds = time.perf_counter() - start
+    print(f"{'sections' if use_sections else 'whole':<10} {seconds:>8.2f} s {len(texts) / seconds:>8.1f} resumes/s")
+
+changed = sum(
+    {key: value for key, value in sectioned.items() if key != "entity_sources"} != whole
+    for whole, sectioned in zip(results[False], results[True])
+)
+print(f"{changed} resumes with different entities")
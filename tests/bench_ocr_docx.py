@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from difflib import SequenceMatcher
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import OCRProcessor
+
+parser = argparse.ArgumentParser(description="Native DOC/DOCX reading vs converting to PDF and running OCR")
+parser.add_argument("corpus", help="Directory with .doc/.docx resumes")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_ocr_docx")
+processor = OCRProcessor(logger)
+
+
+def normalize(text):
+    return " ".join(text.split()).lower()
+
+
+files = [
+    os.path.join(args.corpus, filename)
+    for filename in sorted(os.listdir(args.corpus))
+    if filename.lower().endswith((".doc", ".docx"))
+]
+if not files:
+    sys.exit("No DOC/DOCX files found")
+
+native_times, converted_times, similarities = [], [], []
+for file_path in files:
+    start = time.perf_counter()
+    if file_path.lower().endswith(".docx"):
+        native_text = processor.docx_to_text(file_path)
+    else:
+        native_text = processor.doc_to_text(file_path)
+    native_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    try:
+        converted_text = processor.converted_to_text(file_path)
+    except Exception as e:
+        print(f"Conversion failed for {file_path}: {e}")
+        continue
+    converted_times.append(time.perf_counter() - start)
+
+    similarities.append(SequenceMatcher(None, normalize(native_text), normalize(converted_text), autojunk=False).ratio())
+
+print(f"{len(files)} documents")
+print(f"native:    {sum(native_times) / len(native_times) * 1000:.1f} ms per document")
+if converted_times:
+    print(f"converted: {sum(converted_times) / len(converted_times) * 1000:.1f} ms per document")
+    print(f"text similarity native vs converted: {sum(similarities) / len(similarities):.3f}")
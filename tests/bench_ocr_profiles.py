@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from difflib import SequenceMatcher
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import OCRProcessor
+from services.OCRProcessor import OCR_PROFILES
+
+# Reference corpus: every <name>.pdf needs a <name>.txt holding its correct text
+parser = argparse.ArgumentParser(description="Latency and character accuracy of each OCR profile")
+parser.add_argument("corpus", help="Directory with <name>.pdf / <name>.txt pairs")
+parser.add_argument("--profiles", nargs="+", default=list(OCR_PROFILES) + ["auto"])
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_ocr_profiles")
+
+
+def normalize(text):
+    return " ".join(text.split()).lower()
+
+
+def char_accuracy(reference, hypothesis):
+    return SequenceMatcher(None, normalize(reference), normalize(hypothesis), autojunk=False).ratio()
+
+
+def load_corpus(directory):
+    corpus = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(".pdf"):
+            continue
+        reference_path = os.path.join(directory, os.path.splitext(filename)[0] + ".txt")
+        if not os.path.exists(reference_path):
+            print(f"Skipping {filename}: no reference text")
+            continue
+        with open(reference_path, "r", encoding="utf-8") as f:
+            corpus.append((os.path.join(directory, filename), f.read()))
+    return corpus
+
+
+corpus = load_corpus(args.corpus)
+if not corpus:
+    sys.exit("No documents with reference text found")
+print(f"{len(corpus)} documents\n")
+print(f"{'profile':<10} {'docs/s':>8} {'mean s':>8} {'p95 s':>8} {'accuracy':>9}")
+
+for profile in args.profiles:
+    processor = OCRProcessor(logger, profile=profile)
+    latencies, accuracies = [], []
+
+    for pdf_path, reference in corpus:
+        start = time.perf_counter()
+        text, _ = processor.pdf_to_text_with_timings(pdf_path)
+        latencies.append(time.perf_counter() - start)
+        accuracies.append(char_accuracy(reference, text))
+
+    latencies.sort()
+    total = sum(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{profile:<10} {len(latencies) / total:>8.2f} {total / len(latencies):>8.2f} {p95:>8.2f} {sum(accuracies) / len(accuracies):>9.3f}")
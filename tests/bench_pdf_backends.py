@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import argparse
+from difflib import SequenceMatcher
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.PDFBackends import PDF_BACKENDS, available_pdf_backends
+
+# Fidelity is measured against <name>.txt next to <name>.pdf when it exists
+parser = argparse.ArgumentParser(description="Throughput and fidelity of every PDF text backend")
+parser.add_argument("corpus", help="Directory with .pdf resumes and optional <name>.txt reference texts")
+parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per backend")
+args = parser.parse_args()
+
+documents = []
+for filename in sorted(os.listdir(args.corpus)):
+    if not filename.lower().endswith(".pdf"):
+        continue
+    with open(os.path.join(args.corpus, filename), "rb") as f:
+        data = f.read()
+    reference_path = os.path.join(args.corpus, os.path.splitext(filename)[0] + ".txt")
+    reference = None
+    if os.path.exists(reference_path):
+        with open(reference_path, "r", encoding="utf-8") as f:
+            reference = f.read()
+    documents.append((filename, data, reference))
+
+if not documents:
+    sys.exit("No PDF files found")
+
+
+def normalize(text):
+    return " ".join(text.split()).lower()
+
+
+print(f"{len(documents)} documents, {sum(len(data) for _, data, _ in documents) / 1024:.0f} KiB")
+print(f"{'backend':<10} {'docs/s':>8} {'ms/doc':>8} {'failures':>9} {'fidelity':>9}")
+
+for name in available_pdf_backends():
+    extract_pages = PDF_BACKENDS[name]
+    failures = 0
+    fidelities = []
+
+    for filename, data, reference in documents:
+        try:
+            text = "\n".join(extract_pages(data))
+        except Exception as e:
+            failures += 1
+            print(f"  {name} failed on {filename}: {e}")
+            continue
+        if reference is not None:
+            fidelities.append(SequenceMatcher(None, normalize(reference), normalize(text), autojunk=False).ratio())
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for _, data, _ in documents:
+            try:
+                extract_pages(data)
+            except Exception:
+                pass
+    seconds = (time.perf_counter() - start) / (args.repeat * len(documents))
+
+    fidelity = f"{sum(fidelities) / len(fidelities):.3f}" if fidelities else "n/a"
+    print(f"{name:<10} {1 / seconds:>8.1f} {seconds * 1000:>8.1f} {failures:>9} {fidelity:>9}")
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.MongoWriter import get_client
+from services.ResumeSearch import ResumeSearch
+from services.SkillTaxonomy import SkillTaxonomy
+
+parser = argparse.ArgumentParser(description="/query_resumes latency on a synthetic batch, against a running MongoDB")
+parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/")
+parser.add_argument("--resumes", type=int, default=20000, help="Resumes in the batch")
+parser.add_argument("--queries", type=int, default=200, help="Queries per filter")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_query_resumes")
+
+random.seed(0)
+taxonomy = SkillTaxonomy(logger=logger)
+db = get_client(args.mongo_uri)["bench_resume_db"]
+db.drop_collection("bench_resumes")
+search = ResumeSearch(logger, db, taxonomy, collection_name="bench_resumes")
+LOCATIONS = ["Bangalore", "Pune", "Hyderabad", "Chennai", "Delhi", "Mumbai", "Noida", "Gurgaon"]
+SCHOOLS = ["Indian Institute of Technology Delhi", "University of Pune", "Vellore Institute of Technology", "Anna University"]
+
+
+def resume(index):
+    entities = {"name": f"Candidate {index}", "Location": [random.choice(LOCATIONS)], "education": [random.choice(SCHOOLS)]}
+    for category, skills in taxonomy.categories.items():
+        if random.random() < 0.6:
+            entities[category] = random.sample(skills, min(len(skills), random.randint(1, 4)))
+    return search.document(entities, "bench")
+
+
+start = time.perf_counter()
+with search.writer() as writer:
+    writer.write_many(resume(index) for index in range(args.resumes))
+    # Other batches share the collection
+    writer.write_many(search.document({"name": f"Other {index}"}, "other") for index in range(args.resumes))
+print(f"{args.resumes} resumes written and indexed in {time.perf_counter() - start:.1f} s")
+
+skills = [skill for category in taxonomy.categories.values() for skill in category]
+filters = {
+    "none": lambda: {},
+    "skill": lambda: {"skills": [random.choice(skills)]},
+    "2 skills": lambda: {"skills": random.sample(skills, 2)},
+    "category": lambda: {"categories": [random.choice(list(taxonomy.categories))]},
+    "location": lambda: {"locations": [random.choice(LOCATIONS)]},
+    "education": lambda: {"education": [random.choice(SCHOOLS).split()[-1]]},
+    "skill+location": lambda: {"skills": [random.choice(skills)], "locations": [random.choice(LOCATIONS)]},
+}
+
+print(f"{'filter':<16} {'p50 ms':>8} {'p95 ms':>8}  plan")
+for name, make_filter in filters.items():
+    latencies = []
+    for _ in range(args.queries):
+        query = make_filter()
+        start = time.perf_counter()
+        search.query("bench", page=random.randint(1, 5), **query)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    plan = search.collection.find({"batch_id": "bench", **search.build_filter(**query)}).explain()["queryPlanner"]["winningPlan"]
+    stages = []
+    while plan:
+        stages.append(plan["stage"])
+        plan = plan.get("inputStage")
+    p50, p95 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<16} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f}  {' <- '.join(stages)}")
+
+db.drop_collection("bench_resumes")
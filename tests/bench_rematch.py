@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import ResumeProcessor, NERProcessor
+from services.DocStore import DocStore
+
+parser = argparse.ArgumentParser(description="Refreshing NER results: full re-run vs rematch over the stored DocBin shards")
+parser.add_argument("corpus", help="Directory with resumes, cycled to reach --documents")
+parser.add_argument("--documents", type=int, default=5000, help="Number of documents in the archive")
+parser.add_argument("--single-parse", action="store_true")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_rematch")
+
+files = [os.path.join(args.corpus, f) for f in sorted(os.listdir(args.corpus))]
+texts = [record["text"] for record in ResumeProcessor(logger).extract_bulk(files) if record["text"]]
+if not texts:
+    sys.exit("No readable resumes found")
+# Every document must be distinct, the store is keyed by text hash
+archive = [f"{texts[i % len(texts)]}\n{i}" for i in range(args.documents)]
+
+store_directory = tempfile.mkdtemp(prefix="doc_store_")
+try:
+    doc_store = DocStore(logger, directory=store_directory)
+    ner_processor = NERProcessor(logger, single_parse=args.single_parse, doc_store=doc_store)
+
+    start = time.perf_counter()
+    full, _ = ner_processor.bulk_extract_all_entities(archive)
+    full_seconds = time.perf_counter() - start
+
+    size = sum(os.path.getsize(os.path.join(store_directory, f)) for f in os.listdir(store_directory))
+    print(f"{len(doc_store)} docs stored, {size / 1024 / 1024:.1f} MiB on disk")
+
+    start = time.perf_counter()
+    rematched = dict(ner_processor.rematch())
+    rematch_seconds = time.perf_counter() - start
+
+    keys = [doc_store.doc_key(ner_processor.preprocess_text(text)) for text in archive]
+    differing = sum(rematched[key] != entities for key, entities in zip(keys, full))
+
+    print(f"{'full NER':<10} {full_seconds:>8.1f} s {len(archive) / full_seconds:>8.1f} docs/s")
+    print(f"{'rematch':<10} {rematch_seconds:>8.1f} s {len(archive) / rematch_seconds:>8.1f} docs/s")
+    print(f"{differing} documents with different results")
+    print(f"Estimated for 50k documents: full {50000 * full_seconds / len(archive) / 60:.0f} min, "
+          f"rematch {50000 * rematch_seconds / len(archive) / 60:.1f} min")
+finally:
+    shutil.rmtree(store_directory, ignore_errors=True)
@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import time
+import random
+import datetime
+import argparse
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import MongoJSON
+
+parser = argparse.ArgumentParser(description="Encoding resume documents to JSON: recursive rewrite + jsonable_encoder vs MongoJSON.dumps")
+parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Numbers of documents")
+args = parser.parse_args()
+
+random.seed(0)
+SKILLS = ["python", "java", "c++", "c#", "go", "react", "django", "docker", "kubernetes", "aws", "postgresql", "node.js"]
+
+
+def resume(index):
+    # Shaped like a saved resume, with its _id and a few search fields
+    skills = random.sample(SKILLS, 6)
+    return {
+        "_id": ObjectId(),
+        "name": f"Candidate {index}",
+        "emails": [f"candidate{index}@example.com"],
+        "phones": ["+91 9876543210"],
+        "education": ["Indian Institute of Technology, Delhi"],
+        "Designation": ["Software Engineer"],
+        "Location": ["Bangalore"],
+        "programming_languages": skills[:3],
+        "frameworks": skills[3:],
+        "entity_sources": [{"text": "Software Engineer", "label": "Designation", "section": "experience"}] * 4,
+        "skills": skills,
+        "saved_at": datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds=index),
+    }
+
+
+def serialize_mongo_id(entity):
+    # The previous per-route rewrite
+    if isinstance(entity, ObjectId):
+        return str(entity)
+    if isinstance(entity, dict):
+        return {k: serialize_mongo_id(v) for k, v in entity.items()}
+    elif isinstance(entity, list):
+        return [serialize_mongo_id(i) for i in entity]
+    return entity
+
+
+def previous(documents):
+    # Rewrite, jsonable_encoder, then what JSONResponse.render does
+    content = jsonable_encoder({"status": "success", "data": [serialize_mongo_id(doc) for doc in documents]})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def shared(documents):
+    return MongoJSON.dumps({"status": "success", "data": documents})
+
+
+def shared_fallback(documents):
+    orjson, MongoJSON.orjson = MongoJSON.orjson, None
+    try:
+        return MongoJSON.dumps({"status": "success", "data": documents})
+    finally:
+        MongoJSON.orjson = orjson
+
+
+encoders = [("previous", previous), ("json", shared_fallback)]
+if MongoJSON.orjson is not None:
+    encoders.append(("orjson", shared))
+else:
+    print("orjson is not installed, only the json fallback is measured")
+
+for size in args.sizes:
+    documents = [resume(index) for index in range(size)]
+    outputs = {}
+    for name, encode in encoders:
+        start = time.perf_counter()
+        outputs[name] = encode(documents)
+        seconds = time.perf_counter() - start
+        print(f"{size:>7} docs {name:<9} {seconds * 1000:>9.1f} ms {size / seconds:>10.0f} docs/s {len(outputs[name]) / 1e6:>7.1f} MB")
+    decoded = [json.loads(output) for output in outputs.values()]
+    print(f"{size:>7} docs same JSON: {all(value == decoded[0] for value in decoded)}")
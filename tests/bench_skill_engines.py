@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import ResumeProcessor, NERProcessor
+from services.SkillMatcher import SkillMatcher
+
+parser = argparse.ArgumentParser(description="Skill matching throughput, spaCy PhraseMatcher vs Aho-Corasick SkillMatcher")
+parser.add_argument("corpus", help="Directory with resumes")
+parser.add_argument("--repeat", type=int, default=5, help="Passes over the corpus per engine")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_skill_engines")
+
+files = [os.path.join(args.corpus, f) for f in sorted(os.listdir(args.corpus))]
+texts = [record["text"] for record in ResumeProcessor(logger).extract_bulk(files) if record["text"]]
+if not texts:
+    sys.exit("No readable resumes found")
+
+ner_processor = NERProcessor(logger, skill_engine="phrase")
+texts = [ner_processor.preprocess_text(text) for text in texts]
+
+start = time.perf_counter()
+skill_matcher = SkillMatcher(ner_processor.NERArrays)
+print(f"SkillMatcher compiled in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+engines = [
+    # Both engines on the taxonomy patterns, before canonicalization
+    ("phrase", ner_processor.phrase_match_skills),
+    ("aho", skill_matcher.extract),
+]
+
+mismatches = sum(engines[0][1](text) != engines[1][1](text) for text in texts)
+megabytes = sum(len(text) for text in texts) / 1e6
+print(f"{len(texts)} resumes, {megabytes:.2f} MB of text, {mismatches} with different skills")
+
+for name, extract in engines:
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in texts:
+            extract(text)
+    seconds = time.perf_counter() - start
+    print(f"{name:<8} {args.repeat * len(texts) / seconds:>10.1f} resumes/s {args.repeat * megabytes / seconds:>8.2f} MB/s")
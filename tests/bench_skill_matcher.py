@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+from spacy.matcher import PhraseMatcher
+
+# Appending the path to services
+project_root = os.getcwd()
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import ResumeProcessor, NERProcessor
+
+parser = argparse.ArgumentParser(description="Per-resume skill matching latency, matcher rebuilt per call vs compiled once")
+parser.add_argument("corpus", help="Directory with resumes")
+parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per implementation")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("bench_skill_matcher")
+
+files = [os.path.join(args.corpus, f) for f in sorted(os.listdir(args.corpus))]
+texts = [record["text"] for record in ResumeProcessor(logger).extract_bulk(files) if record["text"]]
+if not texts:
+    sys.exit("No readable resumes found")
+
+ner_processor = NERProcessor(logger)
+nlp = ner_processor.nlp
+texts = [ner_processor.preprocess_text(text) for text in texts]
+
+
+def rebuilt_per_call(text):
+    # The previous implementation: new matcher, patterns re-tokenized, full custom pipeline on text.lower()
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    for category, skills in ner_processor.NERArrays.items():
+        matcher.add(category, [nlp.make_doc(skill) for skill in skills])
+    doc = nlp(text.lower())
+    matched_skills = {}
+    for match_id, start, end in matcher(doc):
+        category = nlp.vocab.strings[match_id]
+        skill = doc[start:end].text.strip().lower()
+        matched_skills.setdefault(category, [])
+        if skill not in matched_skills[category]:
+            matched_skills[category].append(skill)
+    return matched_skills
+
+
+def compiled_once(text):
+    return ner_processor.phrase_match_skills(text)
+
+
+mismatches = sum(rebuilt_per_call(text) != compiled_once(text) for text in texts)
+print(f"{len(texts)} resumes, {mismatches} with different output")
+
+for name, extract in [("rebuilt", rebuilt_per_call), ("compiled", compiled_once)]:
+    latencies = []
+    for _ in range(args.repeat):
+        for text in texts:
+            start = time.perf_counter()
+            extract(text)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    mean = sum(latencies) / len(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+    print(f"{name:<10} {mean * 1000:>8.2f} ms mean {p95 * 1000:>8.2f} ms p95")
@@ -0,0 +1,77 @@
+import os
+import sys
+import logging
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+spacy = pytest.importorskip("spacy")
+from services.DocStore import DocStore
+
+logger = logging.getLogger("test_doc_store")
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    return spacy.blank("en")
+
+
+def add(store, nlp, text):
+    key = store.doc_key(text)
+    store.add(key, nlp.make_doc(text))
+    return key
+
+
+def test_docs_come_back_by_key(tmp_path, nlp):
+    store = DocStore(logger, directory=str(tmp_path), shard_size=2)
+    texts = [f"Resume number {index}" for index in range(5)]
+    keys = [add(store, nlp, text) for text in texts]
+    store.flush()
+
+    assert len(store) == 5
+    for key, text in zip(keys, texts):
+        assert store.get(key, nlp.vocab).text == text
+    assert {key: doc.text for key, doc in store.iter_docs(nlp.vocab)} == dict(zip(keys, texts))
+
+
+def test_flushes_append_shards(tmp_path, nlp):
+    store = DocStore(logger, directory=str(tmp_path), shard_size=10)
+    first = add(store, nlp, "First batch")
+    store.flush()
+    shards = sorted(name for name in os.listdir(tmp_path) if name.endswith(".spacy"))
+    written = {name: os.path.getmtime(tmp_path / name) for name in shards}
+
+    second = add(store, nlp, "Second batch")
+    store.flush()
+
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".spacy")]) == len(shards) + 1
+    # Earlier shards are never rewritten
+    assert {name: os.path.getmtime(tmp_path / name) for name in shards} == written
+    assert store.get(first, nlp.vocab).text == "First batch"
+    assert store.get(second, nlp.vocab).text == "Second batch"
+
+
+def test_stores_sharing_a_directory(tmp_path, nlp):
+    # Two workers storing the same text must not shift the positions of other docs
+    one = DocStore(logger, directory=str(tmp_path))
+    two = DocStore(logger, directory=str(tmp_path))
+
+    shared_one = add(one, nlp, "Shared resume")
+    only_one = add(one, nlp, "Resume of worker one")
+    shared_two = add(two, nlp, "Shared resume")
+    only_two = add(two, nlp, "Resume of worker two")
+    one.flush()
+    two.flush()
+    later = add(one, nlp, "Later resume")
+    one.flush()
+
+    assert shared_one == shared_two
+    assert len(two) == 4
+    for store in (one, two):
+        assert store.get(shared_one, nlp.vocab).text == "Shared resume"
+        assert store.get(only_one, nlp.vocab).text == "Resume of worker one"
+        assert store.get(only_two, nlp.vocab).text == "Resume of worker two"
+        assert store.get(later, nlp.vocab).text == "Later resume"
@@ -0,0 +1,119 @@
+import io
+import os
+import sys
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+docx = pytest.importorskip("docx")
+from docx.oxml import parse_xml
+
+import services.DocxReader as docx_reader_module
+from services.DocxReader import DocxReader
+
+TEXT_BOX = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent>'
+    '<mc:Choice Requires="wps"><w:drawing><w:txbxContent>'
+    '<w:p><w:r><w:t>Certified Kubernetes Administrator</w:t></w:r></w:p>'
+    '</w:txbxContent></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>Certified Kubernetes Administrator</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></w:pict></mc:Fallback>'
+    '</mc:AlternateContent></w:r>'
+)
+
+
+def save(document):
+    buffer = io.BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_paragraphs_and_breaks():
+    document = docx.Document()
+    document.add_paragraph("John Doe")
+    document.add_paragraph("")
+    paragraph = document.add_paragraph("Python")
+    paragraph.add_run().add_tab()
+    paragraph.add_run("Django")
+    paragraph.add_run().add_break()
+    paragraph.add_run("Flask")
+
+    assert DocxReader().read(save(document)) == "John Doe\nPython\tDjango\nFlask"
+
+
+def test_table_rows_are_lines():
+    document = docx.Document()
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text, table.cell(0, 1).text = "Company", "Years"
+    table.cell(1, 0).text, table.cell(1, 1).text = "Acme", "2019-2023"
+    table.cell(1, 0).add_paragraph("Bangalore")
+
+    assert DocxReader().read(save(document)) == "Company\tYears\nAcme Bangalore\t2019-2023"
+    assert DocxReader(cell_separator=" | ").read(save(document)) == "Company | Years\nAcme Bangalore | 2019-2023"
+
+
+def test_nested_tables():
+    document = docx.Document()
+    outer = document.add_table(rows=1, cols=2)
+    outer.cell(0, 0).text = "Skills"
+    inner = outer.cell(0, 1).add_table(rows=2, cols=1)
+    inner.cell(0, 0).text = "Python"
+    inner.cell(1, 0).text = "Go"
+    document.add_paragraph("After the table")
+
+    assert DocxReader().read(save(document)) == "Skills\tPython Go\nAfter the table"
+
+
+def test_text_boxes_are_read_once():
+    document = docx.Document()
+    paragraph = document.add_paragraph("Certifications")
+    paragraph._p.append(parse_xml(TEXT_BOX))
+
+    lines = DocxReader().read(save(document)).split("\n")
+    assert lines.count("Certified Kubernetes Administrator") == 1
+    assert "Certifications" in lines
+
+
+def test_headers_and_footers_surround_the_body():
+    document = docx.Document()
+    section = document.sections[0]
+    section.header.paragraphs[0].text = "Curriculum Vitae"
+    section.footer.paragraphs[0].text = "Page 1"
+    document.add_paragraph("John Doe")
+
+    assert DocxReader().read(save(document)) == "Curriculum Vitae\nJohn Doe\nPage 1"
+    assert DocxReader(include_headers=False).read(save(document)) == "John Doe"
+
+
+def test_finished_blocks_are_dropped(monkeypatch):
+    # Keep hold of the root of every parsed part to see what is left of it once read
+    roots = []
+    iterparse = docx_reader_module.iterparse
+
+    def spying_iterparse(source, events):
+        for event, element in iterparse(source, events):
+            if not roots:
+                roots.append(element)
+            yield event, element
+
+    monkeypatch.setattr(docx_reader_module, "iterparse", spying_iterparse)
+
+    document = docx.Document()
+    for index in range(200):
+        document.add_paragraph(f"Paragraph {index}")
+        document.add_table(rows=1, cols=1).cell(0, 0).text = f"Cell {index}"
+
+    lines = list(DocxReader(include_headers=False).iter_lines(save(document)))
+    assert len(lines) == 400
+
+    body = roots[0][0]
+    # Only the section properties are left, every paragraph and table was removed once read
+    assert [child.tag.split("}")[1] for child in body] == ["sectPr"]
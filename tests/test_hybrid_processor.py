@@ -0,0 +1,115 @@
+import io
+import os
+import sys
+import logging
+import tempfile
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.HybridProcessor import HybridProcessor
+from services.OCRProcessor import OCRProcessor
+
+logger = logging.getLogger("test_hybrid_processor")
+
+RESUME_PAGE = "John Doe, Senior Software Engineer, Bangalore. Python, Django, PostgreSQL, Docker and Kubernetes."
+
+
+def make_pdf(pages):
+    """
+    Builds a PDF with one page per string, each written with a standard font into its text layer.
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 10 Tf 20 700 Td ({text}) Tj ET" if text else ""
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+class FailingOCR(OCRProcessor):
+    # OCR as it behaves without tesseract: every call fails, the pages asked for are recorded
+    def __init__(self, fail_pages=None):
+        super().__init__(logger, temp_dir=tempfile.gettempdir())
+        self.fail_pages = fail_pages
+        self.calls = []
+
+    def ocr_pdf(self, pdf_path=None, data=None, page_numbers=None):
+        self.calls.append(list(page_numbers))
+        if self.fail_pages is None or set(page_numbers) & set(self.fail_pages):
+            raise RuntimeError("tesseract is not installed")
+        return [{"page": number, "text": f"OCR text of page {number}"} for number in page_numbers]
+
+
+def test_ocr_failure_keeps_the_text_layer():
+    processor = HybridProcessor(logger, ocr_processor=FailingOCR(), pdf_backends=["pypdf2"])
+    text, stats = processor.analyze_pdf(io.BytesIO(make_pdf([RESUME_PAGE, "Page 2"])))
+
+    assert RESUME_PAGE in text
+    assert "Page 2" in text
+    assert stats["ocr_pages"] == [2]
+    assert stats["ocr_failed_pages"] == [2]
+
+
+def test_failing_page_does_not_cost_the_others():
+    ocr = FailingOCR(fail_pages=[2])
+    processor = HybridProcessor(logger, ocr_processor=ocr, pdf_backends=["pypdf2"])
+    text, stats = processor.analyze_pdf(io.BytesIO(make_pdf(["Page 1", "Page 2", "Page 3"])))
+
+    assert ocr.calls == [[1, 2, 3], [1], [2], [3]]
+    assert "OCR text of page 1" in text and "OCR text of page 3" in text
+    assert "Page 2" in text
+    assert stats["ocr_failed_pages"] == [2]
+
+
+def test_scanned_page_among_digital_pages_is_ocrd():
+    # A typed cover page followed by a scanned CV
+    ocr = FailingOCR(fail_pages=[])
+    processor = HybridProcessor(logger, ocr_processor=ocr, pdf_backends=["pypdf2"])
+    text, stats = processor.analyze_pdf(io.BytesIO(make_pdf([RESUME_PAGE, ""])))
+
+    assert stats["ocr_pages"] == [2]
+    assert text == f"{RESUME_PAGE}\nOCR text of page 2"
+
+
+class BlankOCR(FailingOCR):
+    # Blank pages come back from OCR without any word
+    def ocr_pdf(self, pdf_path=None, data=None, page_numbers=None):
+        self.calls.append(list(page_numbers))
+        return [{"page": number, "text": ""} for number in page_numbers]
+
+
+def test_empty_ocr_result_keeps_the_text_layer():
+    processor = HybridProcessor(logger, ocr_processor=BlankOCR(), pdf_backends=["pypdf2"])
+    text, stats = processor.analyze_pdf(io.BytesIO(make_pdf([RESUME_PAGE, "", "Page 3"])))
+
+    assert stats["ocr_pages"] == [2, 3]
+    assert text == f"{RESUME_PAGE}\n\nPage 3"
+
+
+def test_scans_are_ocrd():
+    ocr = FailingOCR(fail_pages=[])
+    processor = HybridProcessor(logger, ocr_processor=ocr, pdf_backends=["pypdf2"])
+    text, stats = processor.analyze_pdf(io.BytesIO(make_pdf(["", ""])))
+
+    assert stats["ocr_pages"] == [1, 2]
+    assert text == "OCR text of page 1\nOCR text of page 2"
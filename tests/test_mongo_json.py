@@ -0,0 +1,49 @@
+import os
+import sys
+import json
+import datetime
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+bson = pytest.importorskip("bson")
+from services import MongoJSON
+
+DOCUMENT = {
+    "_id": bson.ObjectId("65f000000000000000000001"),
+    "saved_at": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    "raw": b"\x00\x01",
+    "skills": ["c#", "node.js"],
+    "name": "Zoë",
+}
+EXPECTED = {
+    "_id": "65f000000000000000000001",
+    "saved_at": "2024-01-02T03:04:05",
+    "raw": "AAE=",
+    "skills": ["c#", "node.js"],
+    "name": "Zoë",
+}
+
+
+def test_dumps():
+    assert json.loads(MongoJSON.dumps({"data": [DOCUMENT]})) == {"data": [EXPECTED]}
+
+
+def test_fallback_matches(monkeypatch):
+    encoded = MongoJSON.dumps(DOCUMENT)
+    monkeypatch.setattr(MongoJSON, "orjson", None)
+    assert json.loads(MongoJSON.dumps(DOCUMENT)) == json.loads(encoded) == EXPECTED
+
+
+def test_unsupported_type():
+    with pytest.raises(TypeError):
+        MongoJSON.dumps({"value": object()})
+
+
+def test_response_renders_bytes():
+    response = MongoJSON.MongoJSONResponse({"data": [DOCUMENT]})
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"data": [EXPECTED]}
@@ -0,0 +1,72 @@
+import os
+import sys
+import logging
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.MongoWriter import MongoWriter, get_client
+
+mongomock = pytest.importorskip("mongomock")
+
+logger = logging.getLogger("test_mongo_writer")
+
+
+class CountingCollection:
+    # Records the size of every insert_many of the wrapped collection
+    def __init__(self, collection):
+        self.collection = collection
+        self.name = collection.name
+        self.chunks = []
+
+    def insert_many(self, documents, ordered=True):
+        self.chunks.append((len(documents), ordered))
+        return self.collection.insert_many(documents, ordered=ordered)
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().resume_db.results
+
+
+def test_writes_unordered_chunks_while_streaming(collection):
+    counting = CountingCollection(collection)
+    writer = MongoWriter(logger, counting, chunk_size=3)
+    for index in range(7):
+        writer.write({"index": index})
+        # A full chunk is inserted right away
+        assert collection.count_documents({}) == index + 1 - (index + 1) % 3
+    report = writer.close()
+
+    assert counting.chunks == [(3, False), (3, False), (1, False)]
+    assert report == {"inserted": 7, "failed": []}
+    assert [document["index"] for document in collection.find()] == list(range(7))
+
+
+def test_failures_are_reported_per_document(collection):
+    collection.insert_one({"_id": "taken"})
+    with MongoWriter(logger, collection, chunk_size=2) as writer:
+        writer.write_many([{"_id": 1}, {"_id": "taken"}, {"_id": 2}, {"_id": 1}, {"_id": 3}])
+
+    assert writer.inserted == 3
+    assert [(failure["index"], failure["code"]) for failure in writer.failed] == [(1, 11000), (3, 11000)]
+    assert collection.count_documents({}) == 4
+
+
+def test_client_is_shared_per_process():
+    # MongoClient connects lazily, no server is needed
+    client = get_client("mongodb://localhost:27017/", max_pool_size=10, timeout_ms=100)
+    assert get_client("mongodb://localhost:27017/", max_pool_size=10, timeout_ms=100) is client
+    assert get_client("mongodb://localhost:27017/", max_pool_size=20, timeout_ms=100) is not client
+    assert client.options.pool_options.max_pool_size == 10
+
+
+def test_client_timeouts_only_bound_connecting():
+    client = get_client("mongodb://localhost:27017/", max_pool_size=10, timeout_ms=200)
+    assert client.options.server_selection_timeout == 0.2
+    assert client.options.pool_options.connect_timeout == 0.2
+    # Slow index builds and large inserts are not cut off
+    assert client.options.pool_options.socket_timeout is None
@@ -0,0 +1,107 @@
+import os
+import sys
+import logging
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+spacy = pytest.importorskip("spacy")
+from services.NERProcessor import NERProcessor
+from services.TextCache import TextCache
+
+logger = logging.getLogger("test_ner_processor")
+
+MODEL_PATH = os.path.join(project_root, "app", "services", "en_tech_resume_ner_model")
+
+RESUMES = [
+    "Full stack developer. Node.JS, Express.JS and Next.JS on AWS, Python and Django.",
+    "Skills: C++, C#, Java; Spring Boot and Ruby on Rails. PostgreSQL, MongoDB and Redis.",
+    "JAVASCRIPT, TYPESCRIPT, REACT.JS and VUE.JS, deployed with Docker and Kubernetes.",
+]
+
+
+def make_processor(single_parse, **kwargs):
+    # Single-parse mode disables pipes of the pipelines it gets, so every processor loads its own
+    return NERProcessor(logger, single_parse=single_parse, nlp=spacy.load(MODEL_PATH), default_nlp=spacy.blank("en"), **kwargs)
+
+
+@pytest.fixture(scope="module")
+def processors():
+    return {"full": make_processor(False), "single": make_processor(True)}
+
+
+@pytest.mark.parametrize("text", RESUMES)
+def test_single_parse_matches_the_same_skills(processors, text):
+    skills = {}
+    for mode, processor in processors.items():
+        _, _, skill_doc = processor.parse(text)
+        skills[mode] = processor.extract_matched_skills(text, doc=skill_doc)
+
+    assert skills["single"] == skills["full"] == processors["full"].extract_matched_skills(text)
+
+
+def test_single_parse_keeps_mixed_case_frameworks(processors):
+    text = RESUMES[0]
+    _, _, skill_doc = processors["single"].parse(text)
+    matched = processors["single"].extract_matched_skills(text, doc=skill_doc)
+
+    assert {"node.js", "express.js", "next.js"} <= set(matched["frameworks"])
+    assert "javascript" not in matched.get("programming_languages", [])
+
+
+def test_bulk_single_parse_matches_the_same_skills(processors):
+    results = {mode: processor.bulk_extract_all_entities(RESUMES) for mode, processor in processors.items()}
+    categories = processors["full"].taxonomy.categories
+
+    def skills(entities):
+        return [{category: found[category] for category in categories if category in found} for found in entities]
+
+    assert skills(results["single"][0]) == skills(results["full"][0])
+    assert results["single"][1] == results["full"][1]
+
+
+@pytest.fixture
+def cached_processor():
+    return make_processor(False, result_cache=TextCache(logger, db_path=None))
+
+
+def test_result_cache_key_follows_the_versions(cached_processor):
+    text = RESUMES[0]
+    key = cached_processor.result_cache_key(text)
+    assert cached_processor.result_cache_key(text) == key
+
+    versions = cached_processor.model_versions
+    cached_processor.model_versions = (versions[0], versions[1] + ".retrained")
+    assert cached_processor.result_cache_key(text) != key
+    cached_processor.model_versions = versions
+
+    taxonomy_version = cached_processor.taxonomy.version
+    cached_processor.taxonomy.version = "0" * 12
+    assert cached_processor.result_cache_key(text) != key
+    cached_processor.taxonomy.version = taxonomy_version
+    assert cached_processor.result_cache_key(text) == key
+
+
+def test_cached_results_equal_fresh_ones(processors, cached_processor):
+    fresh = [processors["full"].extract_all_entities(text) for text in RESUMES]
+
+    assert [cached_processor.extract_all_entities(text) for text in RESUMES] == fresh
+    misses = cached_processor.result_cache.stats()["misses"]
+    assert [cached_processor.extract_all_entities(text) for text in RESUMES] == fresh
+    assert cached_processor.result_cache.stats()["misses"] == misses
+
+
+def test_bulk_cached_results_equal_fresh_ones(processors, cached_processor):
+    fresh_entities, fresh_facets = processors["full"].bulk_extract_all_entities(RESUMES)
+
+    # Part of the batch cached by a single extraction, then all of it
+    cached_processor.extract_all_entities(RESUMES[1])
+    for _ in range(2):
+        entities, facets = cached_processor.bulk_extract_all_entities(RESUMES)
+        assert entities == fresh_entities
+        assert facets == fresh_facets
+    assert cached_processor.result_cache.stats()["memory_hits"] == 1 + len(RESUMES)
+    assert cached_processor.bulk_extract_all_entities(RESUMES)[0] == [processors["full"].extract_all_entities(text) for text in RESUMES]
@@ -0,0 +1,66 @@
+import io
+import os
+import sys
+import struct
+import logging
+import zipfile
+import tempfile
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+docx = pytest.importorskip("docx")
+from PIL import Image
+
+from services.OCRProcessor import OCRProcessor
+
+logger = logging.getLogger("test_ocr_docx")
+
+# Header record of an EMF drawing, PIL identifies it but cannot rasterize it
+EMF = struct.pack("<II4i4i4sIIIHHIII2i2i", 1, 88, 0, 0, 100, 100, 0, 0, 2540, 2540, b" EMF", 0x10000, 88, 1, 1, 0, 0, 0, 0,
+                  1024, 768, 320, 240)
+
+
+def png():
+    buffer = io.BytesIO()
+    Image.new("L", (200, 100), 255).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def scanned_docx(path, with_png=True):
+    # A resume pasted into Word as pictures, no text of its own
+    document = docx.Document()
+    if with_png:
+        document.add_picture(io.BytesIO(png()))
+    document.save(path)
+    with zipfile.ZipFile(path, "a") as zip_ref:
+        zip_ref.writestr("word/media/drawing.emf", EMF)
+    return path
+
+
+class RecordingOCR(OCRProcessor):
+    # Records the images handed to tesseract instead of running it
+    def __init__(self):
+        super().__init__(logger, temp_dir=tempfile.gettempdir())
+        self.ocr_images = []
+
+    def images_to_text(self, images):
+        self.ocr_images.extend(images)
+        return [("Scanned text", 0.0) for _ in images]
+
+
+def test_undecodable_images_are_skipped(tmp_path):
+    ocr = RecordingOCR()
+    text = ocr.docx_to_text(scanned_docx(str(tmp_path / "resume.docx")))
+
+    assert text == "Scanned text"
+    assert [image.format for image in ocr.ocr_images] == ["PNG"]
+
+
+def test_only_undecodable_images(tmp_path):
+    ocr = RecordingOCR()
+    assert ocr.docx_to_text(scanned_docx(str(tmp_path / "resume.docx"), with_png=False)) == ""
+    assert ocr.ocr_images == []
@@ -0,0 +1,91 @@
+import os
+import sys
+import logging
+import tempfile
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from PIL import Image, ImageDraw
+
+from services.OCRProcessor import OCRProcessor
+
+logger = logging.getLogger("test_ocr_profiles")
+
+
+def page_image(number, blank=False):
+    # A white page, with a line of "text" unless it is blank; the page number rides along in info
+    image = Image.new("L", (850, 1100), 255)
+    if not blank:
+        ImageDraw.Draw(image).rectangle((100, 100, 700, 120), fill=0)
+    image.info["page"] = number
+    return image
+
+
+class ScriptedOCR(OCRProcessor):
+    # Renders placeholder pages and returns a fixed (text, confidence) per page and profile
+    def __init__(self, pages, blank_pages=(), **kwargs):
+        kwargs.setdefault("ocr_workers", 1)
+        super().__init__(logger, temp_dir=tempfile.gettempdir(), profile="auto", **kwargs)
+        self.pages = pages
+        self.runs = []
+        self.renders = []
+        self.blank_pages = blank_pages
+
+    def page_count(self, pdf_path=None, data=None):
+        return len(self.pages)
+
+    def render_pages(self, pdf_path=None, data=None, dpi=300, page_numbers=None):
+        self.renders.append(list(page_numbers))
+        return [page_image(number, number in self.blank_pages) for number in page_numbers]
+
+    def image_to_text_with_confidence(self, image, profile_name):
+        number = image.info["page"]
+        self.runs.append((number, profile_name))
+        return self.pages[number - 1][profile_name]
+
+
+def test_blank_pages_are_not_ocrd():
+    ocr = ScriptedOCR([{}], blank_pages=[1])
+    results = ocr.ocr_pdf(data=b"%PDF")
+
+    assert ocr.runs == []
+    assert results[0]["blank"] and results[0]["text"] == "" and results[0]["confidence"] is None
+
+
+def test_pages_without_words_escalate():
+    # The fast profile's threshold can wipe out a faint scan
+    ocr = ScriptedOCR([{"fast": ("", None), "balanced": ("John Doe", 88.0)}])
+    results = ocr.ocr_pdf(data=b"%PDF")
+
+    assert ocr.runs == [(1, "fast"), (1, "balanced")]
+    assert results[0]["text"] == "John Doe" and results[0]["profile"] == "balanced"
+
+
+def test_low_confidence_pages_escalate():
+    ocr = ScriptedOCR([
+        {"fast": ("John Doe", 95.0)},
+        {"fast": ("J0hn", 40.0), "balanced": ("John", 60.0), "accurate": ("John Doe", 90.0)},
+    ])
+    results = ocr.ocr_pdf(data=b"%PDF")
+
+    assert ocr.runs == [(1, "fast"), (2, "fast"), (2, "balanced"), (2, "accurate")]
+    assert [result["text"] for result in results] == ["John Doe", "John Doe"]
+    assert results[1]["profile"] == "accurate"
+
+
+def test_words_lost_by_a_better_profile_keep_the_previous_result():
+    ocr = ScriptedOCR([{"fast": ("J0hn", 40.0), "balanced": ("", None), "accurate": ("", None)}])
+    results = ocr.ocr_pdf(data=b"%PDF")
+
+    assert results[0]["text"] == "J0hn" and results[0]["profile"] == "fast"
+
+
+def test_pages_are_rendered_in_windows():
+    ocr = ScriptedOCR([{"fast": (f"Page {number}", 90.0)} for number in range(1, 8)], ocr_workers=3)
+    results = ocr.ocr_pdf(data=b"%PDF")
+
+    assert ocr.renders == [[1, 2, 3], [4, 5, 6], [7]]
+    assert [result["page"] for result in results] == list(range(1, 8))
+    assert [result["text"] for result in results] == [f"Page {number}" for number in range(1, 8)]
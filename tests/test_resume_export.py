@@ -0,0 +1,45 @@
+import os
+import sys
+import csv
+import json
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services import ResumeExport
+from services.ResumeExport import export
+
+bson = pytest.importorskip("bson")
+
+DOCUMENTS = [
+    {"_id": bson.ObjectId("65f000000000000000000001"), "name": "Asha", "skills": ["python", "c#"], "Location": ["Bangalore"]},
+    {"_id": bson.ObjectId("65f000000000000000000002"), "name": "Ravi, Jr.", "emails": ["ravi@example.com"]},
+]
+
+
+def test_ndjson():
+    lines = b"".join(export(iter(DOCUMENTS), "ndjson")).decode().splitlines()
+    assert [json.loads(line)["_id"] for line in lines] == ["65f000000000000000000001", "65f000000000000000000002"]
+    assert json.loads(lines[0])["skills"] == ["python", "c#"]
+
+
+def test_csv():
+    rows = list(csv.DictReader(b"".join(export(iter(DOCUMENTS), "csv")).decode().splitlines()))
+    assert rows[0]["skills"] == "python; c#" and rows[0]["emails"] == ""
+    assert rows[1]["name"] == "Ravi, Jr."
+    assert b"".join(export(iter([]), "csv")).decode().startswith("_id,name")
+
+
+def test_streams_in_chunks(monkeypatch):
+    monkeypatch.setattr(ResumeExport, "CHUNK_BYTES", 100)
+    documents = ({"name": f"Candidate {index}"} for index in range(50))
+    chunks = list(export(documents, "ndjson"))
+    assert len(chunks) > 1 and all(len(chunk) < 200 for chunk in chunks)
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        export(iter(DOCUMENTS), "xml")
@@ -0,0 +1,130 @@
+import io
+import os
+import sys
+import time
+import logging
+import zipfile
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.ResumeParser import ResumeProcessor
+from services.TextCache import TextCache
+from services.FormatRegistry import sniff_format
+
+logger = logging.getLogger("test_resume_processor")
+
+
+class SlowProcessor(ResumeProcessor):
+    # Plain text resumes, the ones reading "hang" never finish and the ones reading "crash" kill their worker
+    def _extract_from_txt(self, source, cv_path, **options):
+        text = super()._extract_from_txt(source, cv_path, **options)
+        if text == "hang":
+            time.sleep(60)
+        if text == "crash":
+            os._exit(1)
+        return text
+
+
+def test_extract_bulk_keeps_order():
+    items = [(f"{index}.txt", f"Resume {index}".encode()) for index in range(6)]
+    records = ResumeProcessor(logger, workers=2, chunk_size=2).extract_bulk(items)
+
+    assert [record["text"] for record in records] == [f"Resume {index}" for index in range(6)]
+    assert [record["file"] for record in records] == [name for name, _ in items]
+
+
+def test_hung_file_times_out_alone():
+    items = [("hang.txt", b"hang")] + [(f"{index}.txt", f"Resume {index}".encode()) for index in range(6)]
+    processor = SlowProcessor(logger, workers=2, timeout=1)
+
+    start = time.monotonic()
+    records = processor.extract_bulk(items)
+    elapsed = time.monotonic() - start
+
+    assert records[0]["text"] == "" and "Timed out" in records[0]["error"]
+    assert [record["text"] for record in records[1:]] == [f"Resume {index}" for index in range(6)]
+    assert elapsed < 5
+
+
+def test_hung_workers_are_replaced():
+    items = [("a.txt", b"Resume a")] + [(f"{index}.txt", b"hang") for index in range(8)] + [("b.txt", b"Resume b")]
+    processor = SlowProcessor(logger, workers=4, timeout=0.5)
+
+    start = time.monotonic()
+    records = processor.extract_bulk(items)
+    elapsed = time.monotonic() - start
+
+    assert records[0] == {"file": "a.txt", "text": "Resume a", "error": None}
+    assert records[-1] == {"file": "b.txt", "text": "Resume b", "error": None}
+    assert all(record["text"] == "" and "Timed out" in record["error"] for record in records[1:-1])
+    # Eight hung files over four workers is a few rounds of 0.5 s, not a minute each
+    assert elapsed < 10
+
+
+def test_crashed_worker_costs_only_its_file():
+    items = [(f"{index}.txt", f"Resume {index}".encode()) for index in range(10)]
+    items.insert(4, ("crash.txt", b"crash"))
+
+    for timeout in (None, 30):
+        start = time.monotonic()
+        records = SlowProcessor(logger, workers=4, timeout=timeout).extract_bulk(items)
+
+        assert records[4]["text"] == "" and "died" in records[4]["error"]
+        assert [record["text"] for record in records[:4] + records[5:]] == [f"Resume {index}" for index in range(10)]
+        # Reported as soon as the worker dies, not when the deadline passes
+        assert time.monotonic() - start < 15
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_ref:
+        for name, data in members.items():
+            zip_ref.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_extract_bulk_reads_lazily():
+    cache = TextCache(logger, db_path=None)
+    processor = ResumeProcessor(logger, workers=2, cache=cache, max_inflight_bytes=250)
+
+    def members():
+        for index in range(10):
+            # 100 bytes each, so at most two files wait on the pool when the next one is read
+            assert index - cache.stats()["memory_entries"] <= 2
+            yield f"{index}.txt", f"Resume {index}".ljust(100).encode()
+
+    records = processor.extract_bulk(members())
+    assert [record["text"].strip() for record in records] == [f"Resume {index}" for index in range(10)]
+
+
+def test_zip_members_are_selected_by_format():
+    archive = make_zip({
+        "resume.txt": b"Jane Doe, Python developer",
+        "cv.pdf": b"John Doe, Java developer",  # misnamed text file
+        "photo.png": b"\x89PNG\r\n\x1a\n" + bytes(64),
+        "notes.bin": bytes(range(256)),
+        "__MACOSX/._resume.txt": b"Jane Doe",
+    })
+    processor = ResumeProcessor(logger)
+
+    assert [name for name, _ in processor.iter_zip_cvs(archive)] == ["resume.txt", "cv.pdf"]
+    archive.seek(0)
+    assert processor.process_bulk_cvs(archive, zip_file=True) == ["Jane Doe, Python developer", "John Doe, Java developer"]
+
+
+def test_unreadable_member_does_not_abort_the_batch():
+    archive = make_zip({
+        "a.txt": b"Jane Doe, Python developer",
+        "broken.docx": b"PK\x03\x04" + bytes(64),
+        "b.txt": b"John Doe, Java developer",
+    })
+
+    texts = ResumeProcessor(logger).process_bulk_cvs(archive, zip_file=True)
+    assert texts == ["Jane Doe, Python developer", "", "John Doe, Java developer"]
+
+
+def test_pdf_with_trailing_bytes_is_a_pdf():
+    assert sniff_format(b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\n%%EOF\n" + bytes(4096)) == "pdf"
@@ -0,0 +1,140 @@
+import os
+import sys
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.ResumeSearch import ResumeSearch, TTL_INDEX
+from services.SkillAggregator import SkillAggregator
+from services.SkillTaxonomy import SkillTaxonomy
+
+mongomock = pytest.importorskip("mongomock")
+
+TAXONOMY = SimpleNamespace(categories={"programming_languages": ["python", "go"], "frameworks": ["django", "react"]})
+
+RESUMES = [
+    {"name": "Asha", "Location": ["Bangalore"], "education": ["Indian Institute of Technology, Delhi"],
+     "programming_languages": ["python"], "frameworks": ["django"], "entity_sources": []},
+    {"name": "Ravi", "Location": ["Pune"], "education": ["University of Pune"], "programming_languages": ["python", "go"]},
+    {"name": "Meera", "Location": ["Bangalore, India"], "frameworks": ["react"]},
+]
+
+
+logger = logging.getLogger("test_resume_search")
+
+
+@pytest.fixture
+def search():
+    search = ResumeSearch(logger, mongomock.MongoClient().resume_db, TAXONOMY)
+    with search.writer() as writer:
+        writer.write_many(search.document(resume, "batch") for resume in RESUMES)
+        # Same skills in another batch, never returned for "batch"
+        writer.write(search.document({"name": "Other", "programming_languages": ["python"]}, "other"))
+    return search
+
+
+def names(page):
+    return [resume["name"] for resume in page["results"]]
+
+
+def test_search_fields():
+    fields = ResumeSearch(logger, mongomock.MongoClient().resume_db, TAXONOMY).search_fields(RESUMES[0])
+    assert fields == {
+        "skills": ["python", "django"],
+        "skill_categories": ["programming_languages", "frameworks"],
+        "location_terms": ["bangalore"],
+        "education_terms": ["indian", "institute", "of", "technology", "delhi"],
+    }
+
+
+def test_filters(search):
+    assert names(search.query("batch", skills=["Python"])) == ["Asha", "Ravi"]
+    assert names(search.query("batch", skills=["python", "go"])) == ["Ravi"]
+    assert names(search.query("batch", categories=["frameworks"])) == ["Asha", "Meera"]
+    assert names(search.query("batch", locations=["bangalore"])) == ["Asha", "Meera"]
+    assert names(search.query("batch", education=["Technology Delhi"], skills=["django"])) == ["Asha"]
+    assert names(search.query("batch", locations=["Mumbai"])) == []
+
+
+def test_projection_and_paging(search):
+    page = search.query("batch", page=2, page_size=2)
+    assert page["total"] == 3 and names(page) == ["Meera"]
+    assert set(page["results"][0]) <= {"_id", "name", "emails", "phones", "Designation", "Location", "education", "skills"}
+    assert isinstance(page["results"][0]["_id"], str)
+
+
+def test_indexes(search):
+    indexes = search.collection.index_information()
+    assert indexes["batch"]["key"] == [("batch_id", 1), ("_id", 1)]
+    assert indexes["batch_skills"]["key"] == [("batch_id", 1), ("skills", 1), ("_id", 1)]
+    assert {"batch_skill_categories", "batch_location_terms", "batch_education_terms"} <= set(indexes)
+    assert TTL_INDEX not in indexes
+
+
+def test_ttl_index():
+    db = mongomock.MongoClient().resume_db
+    ResumeSearch(logger, db, TAXONOMY, ttl_seconds=3600).ensure_indexes()
+    assert db.resumes.index_information()[TTL_INDEX]["expireAfterSeconds"] == 3600
+    # Unset, e.g. the migration CLI without --ttl-days, the expiry stays
+    ResumeSearch(logger, db, TAXONOMY).ensure_indexes()
+    assert db.resumes.index_information()[TTL_INDEX]["expireAfterSeconds"] == 3600
+
+
+class Taxonomy(SimpleNamespace):
+    def canonicalize(self, matched_skills):
+        return {category: list(dict.fromkeys(skills)) for category, skills in matched_skills.items()}
+
+
+def test_migrate_legacy_collection():
+    db = mongomock.MongoClient().resume_db
+    db.ABCDE12345.insert_many([dict(resume) for resume in RESUMES])
+    search = ResumeSearch(logger, db, Taxonomy(**vars(TAXONOMY)))
+    assert search.legacy_collections() == ["ABCDE12345"]
+
+    report = search.migrate("ABCDE12345")
+    assert report == {"inserted": 3, "skipped": 0, "failed": []}
+    assert names(search.query("ABCDE12345", skills=["python"])) == ["Asha", "Ravi"]
+    assert search.collection.find_one({"name": "Asha"})["saved_at"] is not None
+
+    # Run again, everything is already there, then the legacy collection goes
+    assert search.migrate("ABCDE12345", drop=True) == {"inserted": 0, "skipped": 3, "failed": []}
+    assert search.legacy_collections() == []
+
+
+def test_keyset_pages(search):
+    first = search.query("batch", page_size=2)
+    second = search.query("batch", page_size=2, after=first["next"])
+    assert names(first) + names(second) == ["Asha", "Ravi", "Meera"]
+    assert second["next"] is None
+
+
+def test_iter_documents_reads_in_batches(search):
+    documents = list(search.iter_documents("batch", search.build_filter(locations=["bangalore"]), batch_size=1))
+    assert [document["name"] for document in documents] == ["Asha", "Meera"]
+    after = str(documents[0]["_id"])
+    assert [document["name"] for document in search.iter_documents("batch", after=after, batch_size=2)] == ["Ravi", "Meera"]
+
+
+def test_migrate_canonicalizes_legacy_skills():
+    db = mongomock.MongoClient().resume_db
+    db.ABCDE12345.insert_many([
+        {"name": "Asha", "programming_languages": ["js", "golang"], "databases": ["postgres"]},
+        {"name": "Ravi", "programming_languages": ["javascript"], "databases": ["postgresql"]},
+    ])
+    search = ResumeSearch(logger, db, SkillTaxonomy(logger=logger))
+    search.migrate("ABCDE12345")
+
+    asha = search.collection.find_one({"name": "Asha"})
+    assert asha["programming_languages"] == ["javascript", "go"]
+    assert asha["databases"] == ["postgresql"]
+    assert [resume["name"] for resume in search.iter_documents("ABCDE12345", search.build_filter(skills=["postgresql"]))] == ["Asha", "Ravi"]
+
+    # The facets of the batch are counted from the canonical IDs
+    etag, facets = SkillAggregator(logger, db).load("ABCDE12345")
+    assert facets["programming_languages"] == [{"skill": "javascript", "count": 2}, {"skill": "go", "count": 1}]
+    assert facets["databases"] == [{"skill": "postgresql", "count": 2}]
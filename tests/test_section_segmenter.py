@@ -0,0 +1,66 @@
+import os
+import sys
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.SectionSegmenter import PREAMBLE, segment_sections, section_at
+
+RESUME = """JOHN DOE
+Senior Software Engineer, Bangalore
+john.doe@gmail.com | +91 9876543210
+
+PROFESSIONAL SUMMARY
+Backend engineer with 6 years of Python and Go.
+
+Work Experience:
+Software Engineer at Google, Bangalore 2019 - 2023
+
+E D U C A T I O N
+B.Tech Computer Science, Indian Institute of Technology Delhi, 2019
+
+Skills: Python, Django, React.js, Kubernetes
+
+Projects
+Resume parser with spaCy and FastAPI.
+"""
+
+
+def names(sections):
+    return [section.name for section in sections]
+
+
+def test_headers_in_any_case_and_spacing():
+    sections = segment_sections(RESUME)
+    assert names(sections) == [PREAMBLE, "summary", "experience", "education", "skills", "projects"]
+    assert RESUME[sections[3].start:sections[3].end].startswith("E D U C A T I O N")
+
+
+def test_sections_cover_the_text():
+    sections = segment_sections(RESUME)
+    assert sections[0].start == 0 and sections[-1].end == len(RESUME)
+    assert all(previous.end == section.start for previous, section in zip(sections, sections[1:]))
+
+
+def test_title_followed_by_content():
+    sections = segment_sections(RESUME)
+    skills = RESUME[sections[4].start:sections[4].end]
+    assert skills.startswith("Skills: Python")
+
+
+def test_lines_mentioning_a_title_are_not_headers():
+    text = "Jane Roe\nExperience with Python and education technology products\nSkills and more skills in a long sentence about them"
+    assert names(segment_sections(text)) == [PREAMBLE]
+
+
+def test_no_headers():
+    assert segment_sections("Python developer") == [(PREAMBLE, 0, 16)]
+    assert segment_sections("") == [(PREAMBLE, 0, 0)]
+
+
+def test_section_at():
+    sections = segment_sections(RESUME)
+    assert section_at(sections, 0) == PREAMBLE
+    assert section_at(sections, RESUME.index("Indian Institute")) == "education"
+    assert section_at(sections, len(RESUME)) is None
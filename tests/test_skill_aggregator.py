@@ -0,0 +1,82 @@
+import os
+import sys
+import logging
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.SkillAggregator import SkillAggregator
+
+mongomock = pytest.importorskip("mongomock")
+
+logger = logging.getLogger("test_skill_aggregator")
+
+MATCHED = [
+    {"programming_languages": ["python", "go"], "frameworks": ["node.js"]},
+    {"programming_languages": ["python", "python"]},
+    {"programming_languages": ["go", "java"], "frameworks": ["django"]},
+    {},
+]
+
+
+def test_aggregate_counts_resumes():
+    facets = SkillAggregator.aggregate(MATCHED)
+    # A skill counts once per resume, ties are sorted by name
+    assert facets["programming_languages"] == [
+        {"skill": "go", "count": 2}, {"skill": "python", "count": 2}, {"skill": "java", "count": 1},
+    ]
+    assert facets["frameworks"] == [{"skill": "django", "count": 1}, {"skill": "node.js", "count": 1}]
+
+
+def test_etag_follows_the_content():
+    facets = SkillAggregator.aggregate(MATCHED)
+    etag = SkillAggregator.etag(facets)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert SkillAggregator.etag(SkillAggregator.aggregate(MATCHED)) == etag
+    assert SkillAggregator.etag(SkillAggregator.aggregate(MATCHED[:2])) != etag
+
+
+def test_save_and_load():
+    db = mongomock.MongoClient().resume_db
+    facets = SkillAggregator.aggregate(MATCHED)
+    etag = SkillAggregator(logger, db).save("ABCDE12345", facets)
+
+    # Another worker reads the stored document, with the same ETag
+    assert SkillAggregator(logger, db).load("ABCDE12345") == (etag, facets)
+    assert SkillAggregator(logger, db).load("unknown") is None
+    assert db.skill_facets.count_documents({}) == 1
+
+
+def test_saving_again_replaces_the_facets():
+    db = mongomock.MongoClient().resume_db
+    aggregator = SkillAggregator(logger, db)
+    first = aggregator.save("batch", SkillAggregator.aggregate(MATCHED[:1]))
+    second = aggregator.save("batch", SkillAggregator.aggregate(MATCHED))
+
+    assert first != second
+    assert SkillAggregator(logger, db).load("batch")[0] == second
+    assert db.skill_facets.count_documents({}) == 1
+
+
+def test_memory_keeps_recent_batches():
+    db = mongomock.MongoClient().resume_db
+    aggregator = SkillAggregator(logger, db, memory_batches=2)
+    for batch_id in ("a", "b", "c"):
+        aggregator.save(batch_id, SkillAggregator.aggregate(MATCHED))
+
+    assert list(aggregator._memory) == ["b", "c"]
+    # Evicted batches are read back from MongoDB
+    assert aggregator.load("a") is not None
+    assert list(aggregator._memory) == ["c", "a"]
+
+
+def test_documents_without_etag():
+    db = mongomock.MongoClient().resume_db
+    facets = SkillAggregator.aggregate(MATCHED)
+    db.skill_facets.insert_one({"_id": "old", "facets": facets})
+
+    assert SkillAggregator(logger, db).load("old") == (SkillAggregator.etag(facets), facets)
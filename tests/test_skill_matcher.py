@@ -0,0 +1,79 @@
+import os
+import sys
+import logging
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+spacy = pytest.importorskip("spacy")
+from services.NERProcessor import NERProcessor
+from services.SkillMatcher import SkillMatcher
+
+logger = logging.getLogger("test_skill_matcher")
+
+RESUMES = [
+    "Python, JavaScript and TypeScript developer. Worked with Docker, Kubernetes, Jenkins on AWS and GCP.",
+    "Skills: C++, C#, F#, Java; R programming and MATLAB for analysis (R). Go and Rust in production.",
+    "Built REST APIs with Django, Flask and FastAPI on PostgreSQL, Redis and MongoDB. Node.js, Vue.js, ASP.NET.",
+    "Spring Boot microservices, Ruby on Rails apps, Google Cloud Platform, VS Code, IntelliJ IDEA, MS-SQL.",
+    "python3, python-3, java8, java-8, c++11 and r&d are not skills, but python's and [aws] are.",
+    "Contact: john.doe@python.org | github.com | linkedin.com | x.com",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def pipelines():
+    # Skill matching only needs the custom model's tokenizer, the general model is never run
+    return {
+        "nlp": spacy.load(os.path.join(project_root, "app", "services", "en_tech_resume_ner_model")),
+        "default_nlp": spacy.blank("en"),
+    }
+
+
+@pytest.fixture(scope="module")
+def phrase_processor(pipelines):
+    return NERProcessor(logger, skill_engine="phrase", **pipelines)
+
+
+@pytest.fixture(scope="module")
+def aho_processor(pipelines):
+    return NERProcessor(logger, skill_engine="aho", **pipelines)
+
+
+@pytest.fixture(scope="module")
+def aho_engine(aho_processor):
+    assert isinstance(aho_processor.skill_matcher, SkillMatcher)
+    return aho_processor.skill_matcher
+
+
+@pytest.mark.parametrize("text", RESUMES)
+def test_parity_with_phrase_matcher(phrase_processor, aho_engine, text):
+    assert aho_engine.extract(text) == phrase_processor.phrase_match_skills(text)
+
+
+@pytest.mark.parametrize("text", RESUMES)
+def test_engines_extract_the_same_skills(phrase_processor, aho_processor, text):
+    assert aho_processor.extract_matched_skills(text) == phrase_processor.extract_matched_skills(text)
+
+
+def test_awkward_tokens(aho_engine):
+    matched = aho_engine.extract("C++ and C# with Node.js, R and .NET")
+    assert matched["programming_languages"] == ["c++", "c#", "r"]
+    assert matched["frameworks"] == ["node.js"]
+
+
+def test_offsets_point_into_the_raw_text(aho_engine):
+    text = "Used Spring Boot daily"
+    for category, skill, start, end in aho_engine.matches(text):
+        assert text[start:end].lower() == skill
+
+
+def test_url_like_tokens_are_split(phrase_processor, aho_engine):
+    # spaCy keeps "node.js/express.js" as one URL-like token, the automaton sees both frameworks
+    text = "node.js/express.js"
+    assert phrase_processor.phrase_match_skills(text) == {}
+    assert aho_engine.extract(text)["frameworks"] == ["node.js", "express.js"]
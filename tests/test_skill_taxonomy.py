@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import logging
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.SkillTaxonomy import SkillTaxonomy, build_taxonomy, write_taxonomy
+
+logger = logging.getLogger("test_skill_taxonomy")
+
+NER_ARRAYS = {
+    "programming_languages": ["Python", "JavaScript", "Go"],
+    "frameworks": ["Django", "Node.js"],
+    "tools": ["Python"],
+    "social_links": {"GitHub": ["github.com"]},
+}
+SYNONYMS = {"javascript": ["js", "ecmascript"], "go": ["golang"], "node.js": ["nodejs", "node"]}
+
+
+def test_build_merges_spellings():
+    artifact = build_taxonomy(NER_ARRAYS, SYNONYMS)
+
+    assert artifact["canonical"]["js"] == artifact["canonical"]["JavaScript".lower()] == "javascript"
+    assert artifact["canonical"]["golang"] == "go"
+    # A skill listed under two categories is one skill
+    assert artifact["skills"]["python"]["categories"] == ["programming_languages", "tools"]
+    # Domains of a link become synonyms of its name
+    assert artifact["canonical"]["github.com"] == "github"
+    assert set(artifact["patterns"]["frameworks"]) == {"django", "node.js", "nodejs", "node"}
+
+
+def test_version_follows_the_content():
+    version = build_taxonomy(NER_ARRAYS, SYNONYMS)["version"]
+    assert build_taxonomy(NER_ARRAYS, SYNONYMS)["version"] == version
+    assert build_taxonomy(NER_ARRAYS, {**SYNONYMS, "python": ["py"]})["version"] != version
+
+
+def test_build_rejects_ambiguous_spellings():
+    with pytest.raises(ValueError):
+        build_taxonomy(NER_ARRAYS, {**SYNONYMS, "django": ["node"]})
+    with pytest.raises(ValueError):
+        build_taxonomy(NER_ARRAYS, {"rust": ["rs"]})
+
+
+def test_canonicalize(tmp_path):
+    path = str(tmp_path / "taxonomy.json")
+    write_taxonomy(path, build_taxonomy(NER_ARRAYS, SYNONYMS))
+    taxonomy = SkillTaxonomy(path, logger)
+
+    matched = {"programming_languages": ["js", "javascript", "golang"], "frameworks": ["nodejs"]}
+    assert taxonomy.canonicalize(matched) == {"programming_languages": ["javascript", "go"], "frameworks": ["node.js"]}
+
+
+def touch(path, seconds):
+    # Moves the modification time, writes within one clock tick can share it
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+def test_reload_when_the_artifact_changes(tmp_path):
+    path = str(tmp_path / "taxonomy.json")
+    write_taxonomy(path, build_taxonomy(NER_ARRAYS, SYNONYMS))
+    taxonomy = SkillTaxonomy(path, logger, check_interval=0)
+    first = taxonomy.version
+    assert not taxonomy.reload_if_changed()
+
+    write_taxonomy(path, build_taxonomy(NER_ARRAYS, {**SYNONYMS, "python": ["py"]}))
+    touch(path, 1)
+    assert taxonomy.reload_if_changed()
+    assert taxonomy.version != first
+    assert taxonomy.canonical["py"] == "python"
+
+
+def test_checks_are_throttled(tmp_path):
+    path = str(tmp_path / "taxonomy.json")
+    write_taxonomy(path, build_taxonomy(NER_ARRAYS, SYNONYMS))
+    taxonomy = SkillTaxonomy(path, logger, check_interval=3600)
+
+    write_taxonomy(path, build_taxonomy(NER_ARRAYS, {**SYNONYMS, "python": ["py"]}))
+    touch(path, 1)
+    assert not taxonomy.reload_if_changed()
+    assert "py" not in taxonomy.canonical
+
+
+def test_broken_artifact_keeps_the_previous_version(tmp_path):
+    path = str(tmp_path / "taxonomy.json")
+    write_taxonomy(path, build_taxonomy(NER_ARRAYS, SYNONYMS))
+    taxonomy = SkillTaxonomy(path, logger, check_interval=0)
+    version = taxonomy.version
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"schema": 999}, f)
+    touch(path, 1)
+    assert not taxonomy.reload_if_changed()
+    assert taxonomy.version == version
+    # Not retried until the file changes again
+    assert not taxonomy.reload_if_changed()
+
+
+def test_missing_artifact_is_built_in_memory(tmp_path):
+    taxonomy = SkillTaxonomy(str(tmp_path / "missing.json"), logger)
+    assert taxonomy.version == build_taxonomy()["version"]
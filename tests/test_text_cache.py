@@ -0,0 +1,79 @@
+import os
+import sys
+import logging
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.TextCache import TextCache
+from services.ResumeParser import ResumeProcessor
+
+logger = logging.getLogger("test_text_cache")
+
+
+def test_miss_then_hit(tmp_path):
+    cache = TextCache(logger, db_path=str(tmp_path / "cache.sqlite3"))
+    key = TextCache.make_key(b"resume", "ResumeProcessor", "1")
+
+    assert cache.get(key) is None
+    cache.set(key, "John Doe")
+    assert cache.get(key) == "John Doe"
+
+    stats = cache.stats()
+    assert (stats["misses"], stats["memory_hits"], stats["disk_hits"]) == (1, 1, 0)
+
+
+def test_disk_tier_is_shared(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite3")
+    key = TextCache.make_key(b"resume", "ResumeProcessor", "1")
+    TextCache(logger, db_path=db_path).set(key, "John Doe")
+
+    # A second process opening the same file
+    other = TextCache(logger, db_path=db_path)
+    assert other.get(key) == "John Doe"
+    assert other.stats()["disk_hits"] == 1
+
+
+def test_key_depends_on_preprocess():
+    data = b"%PDF-1.4 resume"
+    plain = ResumeProcessor(logger).cache_key(data)
+    preprocessed = ResumeProcessor(logger, preprocess=True).cache_key(data)
+
+    assert plain != preprocessed
+    assert plain == ResumeProcessor(logger).cache_key(data)
+    assert plain.split(":")[0] == preprocessed.split(":")[0]
+
+
+def test_memory_eviction_is_lru():
+    cache = TextCache(logger, db_path=None, memory_limit=20)
+    cache.set("a", "a" * 8)
+    cache.set("b", "b" * 8)
+    cache.get("a")
+    cache.set("c", "c" * 8)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" * 8
+    assert cache.get("c") == "c" * 8
+
+
+def test_disk_eviction_keeps_budget(tmp_path):
+    cache = TextCache(logger, db_path=str(tmp_path / "cache.sqlite3"), memory_limit=0, disk_limit=100)
+    for index in range(10):
+        cache.set(f"key{index}", str(index) * 20)
+
+    stats = cache.stats()
+    assert stats["disk_size"] <= 100
+    # The running total matches the entries left
+    assert stats["disk_size"] == 20 * stats["disk_entries"]
+    assert cache.get("key9") == "9" * 20
+    assert cache.get("key0") is None
+
+
+def test_replacing_an_entry_updates_the_size(tmp_path):
+    cache = TextCache(logger, db_path=str(tmp_path / "cache.sqlite3"))
+    cache.set("key", "x" * 50)
+    cache.set("key", "x" * 10)
+
+    stats = cache.stats()
+    assert (stats["disk_entries"], stats["disk_size"]) == (1, 10)
@@ -0,0 +1,104 @@
+import os
+import re
+import sys
+import logging
+
+import pytest
+
+# Appending the path to services
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, "app"))
+
+from services.TextChunker import split_chunks
+
+logger = logging.getLogger("test_text_chunker")
+
+TEXTS = [
+    "Senior engineer at Acme Robotics. Built robots; led teams | shipped firmware. " * 40,
+    "word " * 700,
+    "x" * 2500,  # no boundary at all, hard cuts
+    "Short resume. Python developer.",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_every_position_is_owned_once(text):
+    chunks = split_chunks(text, chunk_size=300, overlap=60)
+
+    owners = [0] * len(text)
+    for chunk in chunks:
+        assert chunk.end - chunk.start <= 300
+        assert chunk.start <= chunk.own_start <= chunk.own_end <= chunk.end
+        for position in range(chunk.own_start, chunk.own_end):
+            owners[position] += 1
+    assert owners == [1] * len(text)
+    assert chunks[0].own_start == 0 and chunks[-1].own_end == len(text)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.own_end == chunk.own_start
+        # Neighbours overlap, so an entity near the cut is seen whole by one of them
+        assert chunk.start < previous.end
+
+
+def test_chunks_end_on_sentence_boundaries():
+    text = TEXTS[0]
+    for chunk in split_chunks(text, chunk_size=300, overlap=60)[:-1]:
+        assert re.search(r"[.;|]\s+$", text[chunk.start:chunk.end])
+
+
+def test_overlap_must_leave_room():
+    with pytest.raises(ValueError):
+        split_chunks("text", chunk_size=100, overlap=50)
+
+
+spacy = pytest.importorskip("spacy")
+from services.NERProcessor import NERProcessor
+
+
+class RecordingProcessor(NERProcessor):
+    # Keeps the entities extract_chunked hands to the extractors
+    def extract_entities(self, text, doc=None, ents=None):
+        self.general_ents = list(ents)
+        return super().extract_entities(text, doc=doc, ents=ents)
+
+
+def ruler(patterns):
+    # A deterministic "model", its ner component being an entity ruler
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler", name="ner").add_patterns(patterns)
+    return nlp
+
+
+@pytest.fixture(scope="module")
+def processor():
+    return RecordingProcessor(
+        logger, nlp=ruler([{"label": "DESIGNATION", "pattern": "Senior engineer"}]),
+        default_nlp=ruler([{"label": "ORG", "pattern": "Acme Robotics"}]),
+        chunk_size=300, chunk_overlap=60, chunk_batch_size=2, use_sections=False,
+    )
+
+
+def test_chunked_offsets_point_into_the_whole_text(processor):
+    # The company is on every chunk boundary and in every overlap somewhere along the text
+    text = "Acme Robotics builds robots; " * 120
+    processor.extract_chunked(text)
+
+    positions = [ent.start_char for ent in processor.general_ents]
+    assert len(split_chunks(text, 300, 60)) > 5
+    # Every occurrence once, none twice from the chunks sharing it
+    assert positions == [match.start() for match in re.finditer("Acme Robotics", text)]
+    for ent in processor.general_ents:
+        assert text[ent.start_char:ent.end_char] == ent.text == "Acme Robotics"
+
+
+def test_entity_across_a_cut_is_reported_once(processor):
+    text = "word " * 100
+    first = split_chunks(text, 300, 60)[0]
+    # Put the company across the end of the first chunk, where no boundary moves the cut
+    start = first.end - 5
+    text = text[:start] + "Acme Robotics " + text[start + 15:]
+    chunks = split_chunks(text, 300, 60)
+    assert chunks[0].start < start < chunks[0].end < start + 13
+
+    processor.extract_chunked(text)
+    assert [(ent.start_char, ent.end_char) for ent in processor.general_ents] == [(start, start + 13)]